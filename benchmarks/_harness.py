@@ -0,0 +1,44 @@
+"""
+Minimal timing helpers shared by the Agently SDK benchmarks.
+
+Benchmarks are plain scripts that import agently_sdk from the current
+environment, so run them after `make install` (or with PYTHONPATH=src).
+"""
+
+import time
+from typing import Callable, Iterable, Tuple
+
+
+def measure(func: Callable[[], object], *, number: int = 10_000, repeat: int = 5) -> float:
+    """
+    Time a zero-argument callable.
+
+    Args:
+        func: The callable to time
+        number: Calls per timing run
+        repeat: Number of timing runs; the fastest one is reported
+
+    Returns:
+        The best observed throughput in operations per second
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return number / best
+
+
+def report(title: str, rows: Iterable[Tuple[str, float, float]]) -> None:
+    """
+    Print a before/after comparison table.
+
+    Args:
+        title: Heading for the table
+        rows: Tuples of (case name, ops/sec before, ops/sec after)
+    """
+    print(title)
+    print(f"{'case':<32} {'before ops/s':>14} {'after ops/s':>14} {'speedup':>8}")
+    for name, before, after in rows:
+        print(f"{name:<32} {before:>14,.0f} {after:>14,.0f} {after / before:>7.2f}x")
@@ -0,0 +1,46 @@
+"""
+Call overhead of plugin functions: bare method vs wrapped vs marked in place.
+
+"wrapped" is agently_function(wrap=True), which routes every call through an
+extra wrapper frame; "in place" is the default agently_function, which marks
+the original function and adds no call overhead.
+
+Usage:
+    python benchmarks/bench_call_overhead.py
+"""
+
+from _harness import measure
+
+from agently_sdk.plugins import Plugin, agently_function
+
+
+class CallPlugin(Plugin):
+    name = "call_plugin"
+    description = "Call overhead benchmark"
+
+    def bare(self, x: int) -> int:
+        return x
+
+    @agently_function(wrap=True)
+    def wrapped(self, x: int) -> int:
+        return x
+
+    @agently_function
+    def in_place(self, x: int) -> int:
+        return x
+
+
+def main() -> None:
+    plugin = CallPlugin()
+    number = 500_000
+    bare = measure(lambda: plugin.bare(1), number=number)
+    wrapped = measure(lambda: plugin.wrapped(1), number=number)
+    in_place = measure(lambda: plugin.in_place(1), number=number)
+
+    print("Plugin function calls per second")
+    for name, ops in [("bare method", bare), ("wrapped", wrapped), ("in place", in_place)]:
+        print(f"{name:<32} {ops:>14,.0f} {ops / bare:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Memory per instance and variable read latency: dictionary vs compact storage.
+
+Usage:
+    python benchmarks/bench_memory.py
+"""
+
+import gc
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from _harness import measure
+
+from agently_sdk.plugins import Plugin, PluginVariable
+
+COUNT = 100_000
+
+
+def _variables() -> Dict[str, PluginVariable]:
+    return {
+        f"var_{i}": PluginVariable(description=f"Variable {i}", type=int, default=i)
+        for i in range(8)
+    }
+
+
+RegularPlugin = type("RegularPlugin", (Plugin,), {"name": "r", "description": "d", **_variables()})
+CompactPlugin = type(
+    "CompactPlugin",
+    (Plugin,),
+    {"name": "c", "description": "d", **_variables()},
+    compact=True,
+)
+
+
+def _bytes_per_instance(factory: Callable[[], Any]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances: List[Any] = [factory() for _ in range(COUNT)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Exclude the list holding the instances
+    overhead = instances.__sizeof__()
+    del instances
+    return (after - before - overhead) / COUNT
+
+
+def main() -> None:
+    print(f"Bytes per instance ({COUNT:,} instances, 8 int variables)")
+    print(f"{'case':<32} {'regular':>10} {'compact':>10}")
+    cases = [("defaults only", {}), ("3 overrides", {"var_0": 1, "var_3": 2, "var_7": 3})]
+    for name, kwargs in cases:
+        regular = _bytes_per_instance(lambda: RegularPlugin(**kwargs))
+        compact = _bytes_per_instance(lambda: CompactPlugin(**kwargs))
+        print(f"{name:<32} {regular:>10.1f} {compact:>10.1f}")
+
+    print()
+    print("Variable reads per second")
+    regular_plugin = RegularPlugin(var_3=5)
+    compact_plugin = CompactPlugin(var_3=5)
+    regular = measure(lambda: regular_plugin.var_3, number=200_000)
+    compact = measure(lambda: compact_plugin.var_3, number=200_000)
+    print(f"{'regular':<32} {regular:>14,.0f}")
+    print(f"{'compact':<32} {compact:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Call overhead of plugin function metrics.
+
+"never enabled" is the default state; "disabled" is after metrics have been
+enabled and disabled again, which must restore the original functions and
+match "never enabled"; "enabled" shows the cost of recording each call.
+
+Usage:
+    python benchmarks/bench_metrics.py
+"""
+
+from _harness import measure
+
+from agently_sdk.plugins import Plugin, agently_function
+from agently_sdk.plugins.metrics import disable_metrics, enable_metrics
+
+
+class MetricsPlugin(Plugin):
+    name = "metrics_plugin"
+    description = "Metrics overhead benchmark"
+
+    def bare(self, x: int) -> int:
+        return x
+
+    @agently_function
+    def measured(self, x: int) -> int:
+        return x
+
+
+def main() -> None:
+    plugin = MetricsPlugin()
+    number = 500_000
+    bare = measure(lambda: plugin.bare(1), number=number)
+    never_enabled = measure(lambda: plugin.measured(1), number=number)
+
+    enable_metrics()
+    enabled = measure(lambda: plugin.measured(1), number=number)
+    disable_metrics()
+    disabled = measure(lambda: plugin.measured(1), number=number)
+
+    print("Plugin function calls per second")
+    rows = [
+        ("bare method", bare),
+        ("metrics never enabled", never_enabled),
+        ("metrics disabled", disabled),
+        ("metrics enabled", enabled),
+    ]
+    for name, ops in rows:
+        print(f"{name:<32} {ops:>14,.0f} {ops / bare:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
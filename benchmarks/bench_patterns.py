@@ -0,0 +1,76 @@
+"""
+Cost of pattern validation on adversarial values, per pattern mode.
+
+Each pattern backtracks exponentially in Python's re engine on a value that
+almost matches it. The plain rows time re.match() (only up to a size where
+that finishes in reasonable time); the linear rows time the same pattern in
+linear mode, whose cost grows with the value length only. The safe rows
+show that safe mode rejects these patterns up front.
+
+The last table compares the modes on a benign pattern and value, i.e. the
+overhead paid for the bound in the common case.
+
+Usage:
+    python benchmarks/bench_patterns.py
+"""
+
+import re
+import time
+from typing import Callable
+
+from _harness import measure
+
+from agently_sdk.plugins import VariableValidation
+from agently_sdk.plugins.patterns import LinearPattern, PatternSafetyError
+
+# (pattern, builds an adversarial value of a given size)
+ADVERSARIAL = [
+    (r"^(a+)+$", lambda n: "a" * n + "!"),
+    (r"^(\w+\s?)*$", lambda n: "a" * n + "!"),
+    (r"^(a|aa)+$", lambda n: "a" * n + "!"),
+]
+
+# Largest adversarial value matched with plain re
+PLAIN_LIMIT = 22
+SIZES = [16, 20, 22, 1000, 4096]
+
+
+def _seconds(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def adversarial() -> None:
+    print("Seconds per match of an adversarial value")
+    print(f"{'pattern':<16} {'mode':<8} " + " ".join(f"{f'n={n}':>10}" for n in SIZES))
+    for pattern, build in ADVERSARIAL:
+        plain = re.compile(pattern)
+        linear = LinearPattern(pattern)
+        plain_times = [
+            f"{_seconds(lambda: plain.match(build(n))):>10.4f}" if n <= PLAIN_LIMIT else " " * 10
+            for n in SIZES
+        ]
+        linear_times = [f"{_seconds(lambda: linear.match(build(n))):>10.4f}" for n in SIZES]
+        try:
+            VariableValidation(pattern=pattern, pattern_mode="safe")
+            safe = "accepted"
+        except PatternSafetyError:
+            safe = "rejected when the validation is created"
+        print(f"{pattern:<16} {'plain':<8} " + " ".join(plain_times))
+        print(f"{pattern:<16} {'linear':<8} " + " ".join(linear_times))
+        print(f"{pattern:<16} {'safe':<8} {safe}")
+
+
+def benign() -> None:
+    value = "region-42"
+    print("\nValidations per second of a benign value")
+    for mode in (None, "safe", "linear"):
+        validation = VariableValidation(pattern=r"^[a-z]+-[0-9]+$", pattern_mode=mode)
+        ops = measure(lambda: validation.validate(value), number=100_000)
+        print(f"{str(mode):<8} {ops:>14,.0f}")
+
+
+if __name__ == "__main__":
+    adversarial()
+    benign()
@@ -0,0 +1,71 @@
+"""
+Throughput of CPU-bound plugin functions run inline and in worker processes.
+
+Inline calls share the GIL, so running them from more threads does not help.
+Calls made with executor="process" run in worker processes and scale with
+the pool size up to the number of cores.
+
+Usage:
+    python benchmarks/bench_process.py
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agently_sdk.plugins import Plugin, PluginVariable, agently_function
+from agently_sdk.plugins.process import configure_process_pool, shutdown_process_pool
+
+CALLS = 64
+
+
+def _crunch(rounds: int) -> int:
+    total = 0
+    for i in range(rounds):
+        total = (total + i * i) % 1_000_003
+    return total
+
+
+class CrunchPlugin(Plugin):
+    name = "crunch_plugin"
+    description = "Process pool benchmark"
+
+    rounds = PluginVariable(description="Loop iterations per call", value_type=int, default=200_000)
+
+    @agently_function
+    def inline(self) -> int:
+        return _crunch(self.rounds)
+
+    @agently_function(executor="process")
+    def in_process(self) -> int:
+        return _crunch(self.rounds)
+
+
+def _throughput(func, threads: int) -> float:
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        # Warm up, e.g. start the worker processes
+        list(pool.map(lambda _: func(), range(threads)))
+        start = time.perf_counter()
+        list(pool.map(lambda _: func(), range(CALLS)))
+        return CALLS / (time.perf_counter() - start)
+
+
+def main() -> None:
+    plugin = CrunchPlugin()
+    cores = os.cpu_count() or 1
+    sizes = sorted({1, 2, 4, cores} | {n for n in (8, 16) if n <= cores})
+
+    inline = _throughput(plugin.inline, max(sizes))
+    rows = [(f"inline, {max(sizes)} threads", inline)]
+    for size in sizes:
+        configure_process_pool(max_workers=size)
+        rows.append((f"process pool, {size} workers", _throughput(plugin.in_process, size)))
+    shutdown_process_pool()
+
+    print(f"CPU-bound calls per second ({cores} cores)")
+    for name, ops in rows:
+        print(f"{name:<32} {ops:>14,.1f} {ops / inline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Call overhead of plugin function tracing at different sample rates.
+
+Traces are sampled before the call is described: an unsampled call is not
+timed and creates no CallInfo or span, leaving the instrumentation wrapper
+and the sampling decision as the cost at a sample rate of 0.
+
+Usage:
+    python benchmarks/bench_tracing.py
+"""
+
+from _harness import measure
+
+from agently_sdk.plugins import Plugin, agently_function
+from agently_sdk.plugins.tracing import TraceHook, add_trace_hook, remove_trace_hook
+
+
+class TracingPlugin(Plugin):
+    name = "tracing_plugin"
+    description = "Tracing overhead benchmark"
+
+    @agently_function
+    def traced(self, x: int) -> int:
+        return x
+
+
+def main() -> None:
+    plugin = TracingPlugin()
+    number = 200_000
+    hook = TraceHook()
+    rows = [("tracing off", measure(lambda: plugin.traced(1), number=number))]
+
+    for rate in (0.0, 0.01, 0.1, 1.0):
+        add_trace_hook(hook, sample_rate=rate)
+        rows.append((f"sample rate {rate:g}", measure(lambda: plugin.traced(1), number=number)))
+    remove_trace_hook(hook)
+
+    off = rows[0][1]
+    print("Plugin function calls per second")
+    for name, ops in rows:
+        print(f"{name:<32} {ops:>14,.0f} {ops / off:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
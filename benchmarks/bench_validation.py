@@ -0,0 +1,124 @@
+"""
+Validation throughput of PluginVariable: reference checks vs compiled checkers.
+
+"before" runs the ordered reference implementation (PluginVariable._explain),
+which is what PluginVariable.validate executed before checkers were compiled.
+"after" runs PluginVariable.validate with the compiled checker.
+
+The second table compares VariableValidation rules checked one by one (a
+linear options scan and re.compile on every call, as before rules were
+compiled) with the compiled rules, for growing option sets.
+
+Usage:
+    python benchmarks/bench_validation.py
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from _harness import measure, report
+
+from agently_sdk.plugins import PluginVariable, VariableValidation
+
+
+def _cases() -> List[tuple]:
+    return [
+        ("untyped", PluginVariable(name="v", description="d", default="x"), "hello"),
+        ("typed str", PluginVariable(name="v", description="d", type=str, default="x"), "hello"),
+        (
+            "choices",
+            PluginVariable(
+                name="v", description="d", type=str, choices=["a", "b", "c"], default="a"
+            ),
+            "c",
+        ),
+        (
+            "range",
+            PluginVariable(
+                name="v",
+                description="d",
+                type=int,
+                validation=VariableValidation(range=(0, 100)),
+                default=1,
+            ),
+            50,
+        ),
+        (
+            "validator",
+            PluginVariable(
+                name="v", description="d", type=int, validator=lambda x: x > 0, default=1
+            ),
+            7,
+        ),
+        (
+            "List[int] x100",
+            PluginVariable(name="v", description="d", type=List[int], default=[]),
+            list(range(100)),
+        ),
+        (
+            "Dict[str, int] x100",
+            PluginVariable(name="v", description="d", type=Dict[str, int], default={}),
+            {str(i): i for i in range(100)},
+        ),
+    ]
+
+
+def _uncompiled(validation: VariableValidation, value: Any) -> Tuple[bool, Optional[str]]:
+    """VariableValidation.validate as it was before rules were compiled."""
+    if validation.options is not None and value not in validation.options:
+        return False, validation.error_message or f"Value must be one of: {validation.options}"
+    if validation.range is not None:
+        min_val, max_val = validation.range
+        if min_val is not None and value < min_val:
+            return False, validation.error_message or f"Value must be >= {min_val}"
+        if max_val is not None and value > max_val:
+            return False, validation.error_message or f"Value must be <= {max_val}"
+    if validation.pattern is not None:
+        if not isinstance(value, str):
+            return (
+                False,
+                validation.error_message or "Value must be a string for pattern validation",
+            )
+        pattern = validation.pattern
+        if isinstance(pattern, str):
+            pattern = re.compile(pattern)
+        if not pattern.match(value):
+            return (
+                False,
+                validation.error_message or f"Value must match pattern: {validation.pattern}",
+            )
+    return True, None
+
+
+def _rule_cases() -> List[tuple]:
+    cases = []
+    for size in (10, 1_000, 10_000):
+        options = [f"model-{i}" for i in range(size)]
+        validation = VariableValidation(options=options)
+        # The last option is the slowest one to find by scanning
+        cases.append((f"options x{size}", validation, options[-1]))
+    cases.append(("pattern", VariableValidation(pattern=r"^[a-z]+-[0-9]+$"), "region-42"))
+    cases.append(("range", VariableValidation(range=(0, 100)), 50))
+    return cases
+
+
+def main() -> None:
+    rows = []
+    for name, var, value in _cases():
+        before = measure(lambda: var._explain(value))
+        after = measure(lambda: var.validate(value))
+        rows.append((name, before, after))
+    report("PluginVariable validation throughput", rows)
+
+    print()
+    rows = []
+    for name, validation, value in _rule_cases():
+        number = 200 if "x10000" in name else 10_000
+        before = measure(lambda: _uncompiled(validation, value), number=number)
+        after = measure(lambda: validation.validate(value), number=number)
+        rows.append((name, before, after))
+    report("VariableValidation throughput", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+"""
+Benchmark suite for the SDK hot paths, with a regression baseline.
+
+Every case is timed with the shared harness and reported in operations per
+second. Results can be saved as a JSON baseline, and compare mode fails when
+a case has become slower than the baseline by more than a threshold.
+
+Baselines are only meaningful on the machine they were recorded on, so they
+are not committed: record one before making changes and compare against it
+afterwards. A case missing from the baseline fails the comparison too, so a
+stale baseline cannot leave cases unchecked; CI records a fresh baseline of
+the target branch and passes --allow-new for cases a pull request adds.
+
+Usage:
+    python benchmarks/suite.py                          # run and print
+    python benchmarks/suite.py --save baseline.json     # record a baseline
+    python benchmarks/suite.py --compare baseline.json  # fail on regressions
+    python benchmarks/suite.py --filter validate --quick
+"""
+
+import argparse
+import json
+import platform
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from _harness import measure
+
+from agently_sdk.plugins import Plugin, PluginVariable, VariableValidation, agently_function
+from agently_sdk.styles import StyleBuilder
+
+# (name, setup returning the callable to time, calls per timing run)
+Case = Tuple[str, Callable[[], Callable[[], object]], int]
+
+CASES: List[Case] = []
+
+DEFAULT_THRESHOLD = 0.25
+
+
+def case(name: str, number: int) -> Callable[[Callable[[], Callable[[], object]]], Any]:
+    """Register a benchmark case; the decorated function sets it up and returns the timed call."""
+
+    def register(setup: Callable[[], Callable[[], object]]) -> Callable[[], Callable[[], object]]:
+        CASES.append((name, setup, number))
+        return setup
+
+    return register
+
+
+def _wide_plugin(count: int, compact: bool = False, frozen: bool = False) -> type:
+    namespace: Dict[str, Any] = {"name": "wide_plugin", "description": "Many variables"}
+    for i in range(count):
+        namespace[f"var_{i}"] = PluginVariable(
+            description=f"Variable {i}", value_type=int, default=i
+        )
+    return type("WidePlugin", (Plugin,), namespace, compact=compact, frozen=frozen)
+
+
+WidePlugin = _wide_plugin(50)
+CompactWidePlugin = _wide_plugin(50, compact=True)
+FrozenWidePlugin = _wide_plugin(50, frozen=True)
+WIDE_CONFIG = {f"var_{i}": i + 1 for i in range(50)}
+
+
+class ToolPlugin(Plugin):
+    name = "tool_plugin"
+    description = "Call overhead"
+
+    limit = PluginVariable(description="Limit", value_type=int, default=10)
+
+    @agently_function
+    def in_place(self, x: int) -> int:
+        return x
+
+    @agently_function(wrap=True)
+    def wrapped(self, x: int) -> int:
+        return x
+
+
+@case("plugin_init/defaults", 20_000)
+def _init_defaults() -> Callable[[], object]:
+    return lambda: WidePlugin()
+
+
+@case("plugin_init/50 variables", 5_000)
+def _init_wide() -> Callable[[], object]:
+    return lambda: WidePlugin(**WIDE_CONFIG)
+
+
+@case("plugin_init/50 variables compact", 5_000)
+def _init_wide_compact() -> Callable[[], object]:
+    return lambda: CompactWidePlugin(**WIDE_CONFIG)
+
+
+@case("plugin_init/50 variables frozen", 5_000)
+def _init_wide_frozen() -> Callable[[], object]:
+    return lambda: FrozenWidePlugin(**WIDE_CONFIG)
+
+
+@case("plugin_init/from_configs x1000", 5)
+def _from_configs() -> Callable[[], object]:
+    configs = [{"var_0": i, "var_1": i} for i in range(1000)]
+    return lambda: WidePlugin.from_configs(configs)
+
+
+@case("plugin_init/with_overrides 1 of 50", 100_000)
+def _with_overrides() -> Callable[[], object]:
+    plugin = WidePlugin(**WIDE_CONFIG)
+    return lambda: plugin.with_overrides(var_10=0)
+
+
+@case("validate/str choices", 200_000)
+def _validate_choices() -> Callable[[], object]:
+    var = PluginVariable(
+        name="v", description="d", value_type=str, choices=["a", "b", "c"], default="a"
+    )
+    return lambda: var.validate("c")
+
+
+@case("validate/int range", 200_000)
+def _validate_range() -> Callable[[], object]:
+    var = PluginVariable(
+        name="v",
+        description="d",
+        value_type=int,
+        validation=VariableValidation(range=(0, 100)),
+        default=1,
+    )
+    return lambda: var.validate(50)
+
+
+@case("validate/5000 options", 200_000)
+def _validate_large_options() -> Callable[[], object]:
+    var = PluginVariable(
+        name="v",
+        description="d",
+        value_type=str,
+        choices=[f"region-{i}" for i in range(5000)],
+        default="region-0",
+    )
+    return lambda: var.validate("region-4999")
+
+
+@case("validate/str pattern", 200_000)
+def _validate_pattern() -> Callable[[], object]:
+    var = PluginVariable(
+        name="v",
+        description="d",
+        value_type=str,
+        validation=VariableValidation(pattern=r"^[a-z]+-[0-9]+$"),
+        default="a-1",
+    )
+    return lambda: var.validate("region-42")
+
+
+@case("validate/str pattern linear", 200_000)
+def _validate_linear_pattern() -> Callable[[], object]:
+    var = PluginVariable(
+        name="v",
+        description="d",
+        value_type=str,
+        validation=VariableValidation(pattern=r"^[a-z]+-[0-9]+$", pattern_mode="linear"),
+        default="a-1",
+    )
+    return lambda: var.validate("region-42")
+
+
+@case("validate/str pattern memoized", 200_000)
+def _validate_memoized_pattern() -> Callable[[], object]:
+    var = PluginVariable(
+        name="v",
+        description="d",
+        value_type=str,
+        validation=VariableValidation(pattern=r"^[a-z]+-[0-9]+$"),
+        default="a-1",
+        memo_size=1024,
+    )
+    return lambda: var.validate("region-42")
+
+
+@case("validate/List[int] x10000", 200)
+def _validate_list() -> Callable[[], object]:
+    var = PluginVariable(name="v", description="d", value_type=List[int], default=[])
+    value = list(range(10_000))
+    return lambda: var.validate(value)
+
+
+@case("validate/Dict[str, int] x10000", 200)
+def _validate_dict() -> Callable[[], object]:
+    var = PluginVariable(name="v", description="d", value_type=Dict[str, int], default={})
+    value = {str(i): i for i in range(10_000)}
+    return lambda: var.validate(value)
+
+
+@case("validate/List[Dict[str, int]] x1000", 200)
+def _validate_nested() -> Callable[[], object]:
+    var = PluginVariable(name="v", description="d", value_type=List[Dict[str, int]], default=[])
+    value = [{"a": i, "b": i} for i in range(1000)]
+    return lambda: var.validate(value)
+
+
+@case("validate/Tuple[str, ...] x10000 repeated", 200)
+def _validate_tuple() -> Callable[[], object]:
+    var = PluginVariable(name="v", description="d", value_type=Tuple[str, ...], default=())
+    value = tuple(str(i) for i in range(10_000))
+    return lambda: var.validate(value)
+
+
+@case("descriptor/get", 500_000)
+def _descriptor_get() -> Callable[[], object]:
+    plugin = ToolPlugin(limit=5)
+    return lambda: plugin.limit
+
+
+@case("descriptor/get compact", 500_000)
+def _descriptor_get_compact() -> Callable[[], object]:
+    plugin = CompactWidePlugin(var_10=5)
+    return lambda: plugin.var_10
+
+
+@case("descriptor/get frozen", 500_000)
+def _descriptor_get_frozen() -> Callable[[], object]:
+    plugin = FrozenWidePlugin(var_10=5)
+    return lambda: plugin.var_10
+
+
+@case("descriptor/get default_factory", 500_000)
+def _descriptor_get_factory() -> Callable[[], object]:
+    class TablePlugin(Plugin):
+        name = "table_plugin"
+        description = "Lazy default"
+
+        table = PluginVariable(description="Table", value_type=dict, default_factory=dict)
+
+    plugin = TablePlugin()
+    return lambda: plugin.table
+
+
+@case("descriptor/set", 200_000)
+def _descriptor_set() -> Callable[[], object]:
+    plugin = ToolPlugin()
+
+    def run() -> None:
+        plugin.limit = 7
+
+    return run
+
+
+@case("update/1 of 50 variables", 100_000)
+def _update_one() -> Callable[[], object]:
+    plugin = WidePlugin(**WIDE_CONFIG)
+    values = iter(range(10**9))
+    return lambda: plugin.update(var_10=next(values))
+
+
+@case("function/in place", 500_000)
+def _call_in_place() -> Callable[[], object]:
+    plugin = ToolPlugin()
+    return lambda: plugin.in_place(1)
+
+
+@case("function/wrapped", 500_000)
+def _call_wrapped() -> Callable[[], object]:
+    plugin = ToolPlugin()
+    return lambda: plugin.wrapped(1)
+
+
+@case("schema/tool schema json", 500_000)
+def _tool_schema_json() -> Callable[[], object]:
+    ToolPlugin.get_tool_schema_json()
+    return ToolPlugin.get_tool_schema_json
+
+
+@case("style/chain of 12", 50_000)
+def _style_chain() -> Callable[[], object]:
+    styles = StyleBuilder()
+    return lambda: (
+        styles.red.bg_black.bold.dim.italic.underline.blink.reverse.hidden.strikethrough.green.blue
+    )
+
+
+@case("style/render chain of 12", 200_000)
+def _style_render() -> Callable[[], object]:
+    styles = StyleBuilder()
+    style = styles.red.bg_black.bold.dim.italic.underline.blink.reverse.hidden.strikethrough
+    text = "x" * 200
+    return lambda: style(text)
+
+
+def run(name_filter: Optional[str] = None, quick: bool = False) -> Dict[str, float]:
+    """
+    Run the registered cases.
+
+    Args:
+        name_filter: Only run cases whose name contains this string
+        quick: Run a tenth of the calls per timing run
+
+    Returns:
+        Operations per second keyed by case name
+    """
+    results: Dict[str, float] = {}
+    for name, setup, number in CASES:
+        if name_filter and name_filter not in name:
+            continue
+        if quick:
+            number = max(1, number // 10)
+        results[name] = measure(setup(), number=number)
+        print(f"{name:<40} {results[name]:>14,.0f} ops/s", flush=True)
+    return results
+
+
+def compare(
+    results: Dict[str, float], baseline: Dict[str, float], threshold: float, allow_new: bool = False
+) -> List[str]:
+    """
+    Compare results with a baseline.
+
+    Args:
+        results: Operations per second keyed by case name
+        baseline: Baseline operations per second keyed by case name
+        threshold: Allowed slowdown as a fraction, e.g. 0.25 for 25%
+        allow_new: Report cases missing from the baseline instead of failing them
+
+    Returns:
+        The names of the cases that regressed past the threshold or are missing
+        from the baseline
+    """
+    failures = []
+    print()
+    print(f"{'case':<40} {'baseline ops/s':>14} {'ops/s':>14} {'change':>8}")
+    for name, ops in results.items():
+        before = baseline.get(name)
+        if before is None:
+            marker = "" if allow_new else "  MISSING"
+            print(f"{name:<40} {'-':>14} {ops:>14,.0f} {'new':>8}{marker}")
+            if not allow_new:
+                failures.append(name)
+            continue
+        change = ops / before - 1
+        regressed = change < -threshold
+        marker = "  REGRESSION" if regressed else ""
+        print(f"{name:<40} {before:>14,.0f} {ops:>14,.0f} {change:>+8.1%}{marker}")
+        if regressed:
+            failures.append(name)
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare with a baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"allowed slowdown before failing (default {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--allow-new", action="store_true", help="do not fail cases missing from the baseline"
+    )
+    parser.add_argument("--filter", metavar="TEXT", help="only run cases containing TEXT")
+    parser.add_argument("--quick", action="store_true", help="run fewer calls per case")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    results = run(args.filter, args.quick)
+
+    if args.save:
+        data = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if baseline is not None:
+        failures = compare(results, baseline, args.threshold, args.allow_new)
+        missing = [name for name in failures if name not in baseline]
+        if missing:
+            print(f"\n{len(missing)} case(s) missing from the baseline, record it again")
+        if len(failures) > len(missing):
+            print(
+                f"\n{len(failures) - len(missing)} case(s) regressed by more than "
+                f"{args.threshold:.0%}"
+            )
+        if failures:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
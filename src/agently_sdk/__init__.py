@@ -4,18 +4,23 @@ Agently SDK - Official SDK for developing extensions for the Agently framework.
 Currently focused on plugin development, with more capabilities planned for future releases.
 """
 
-# Import plugin-related components for convenience
-from agently_sdk.plugins import (
-    Plugin,
-    PluginVariable,
-    VariableValidation,
-    agently_function,
-    kernel_function,
-)
-
-# Import styles for convenience
+from importlib import import_module
+from typing import Any, List
+
+# Import styles for convenience. It is loaded eagerly because the name refers to the
+# styles object rather than the agently_sdk.styles package, and the package is cheap.
 from agently_sdk.styles import styles
 
+# Plugin-related components, imported on first access so that using only part of
+# the SDK does not pay for loading the plugin system
+_LAZY_ATTRIBUTES = {
+    "Plugin": "agently_sdk.plugins",
+    "PluginVariable": "agently_sdk.plugins",
+    "VariableValidation": "agently_sdk.plugins",
+    "agently_function": "agently_sdk.plugins",
+    "kernel_function": "agently_sdk.plugins",
+}
+
 __all__ = [
     # Plugin components
     "Plugin",
@@ -26,3 +31,18 @@ __all__ = [
     # Styles
     "styles",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import plugin components lazily on first access."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
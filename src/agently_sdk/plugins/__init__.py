@@ -4,8 +4,84 @@ Plugin system for Agently - provides base classes and utilities for creating plu
 This package contains the core components needed to develop plugins for the Agently framework.
 """
 
+from importlib import import_module
+from typing import Any, List
+
 from agently_sdk.plugins.base import Plugin
-from agently_sdk.plugins.decorators import agently_function, kernel_function
+from agently_sdk.plugins.batch import ConfigError, ConfigResult, PluginConfigError
+from agently_sdk.plugins.caching import CachePolicy, CacheStats
+from agently_sdk.plugins.decorators import FunctionKind, agently_function, kernel_function
+from agently_sdk.plugins.execution import get_default_executor, set_default_executor
+from agently_sdk.plugins.frozen import FrozenPluginError
+from agently_sdk.plugins.schema import PluginSchema
+from agently_sdk.plugins.spec import FunctionSpec, ParameterSpec, get_function_spec
 from agently_sdk.plugins.variables import PluginVariable, VariableValidation
 
-__all__ = ["Plugin", "PluginVariable", "VariableValidation", "agently_function", "kernel_function"]
+# Optional features, imported on first access so that defining plugins does not
+# pay for loading them
+_LAZY_ATTRIBUTES = {
+    "FunctionMetrics": "agently_sdk.plugins.metrics",
+    "disable_metrics": "agently_sdk.plugins.metrics",
+    "enable_metrics": "agently_sdk.plugins.metrics",
+    "write_prometheus": "agently_sdk.plugins.metrics",
+    "configure_process_pool": "agently_sdk.plugins.process",
+    "shutdown_process_pool": "agently_sdk.plugins.process",
+    "PluginInfo": "agently_sdk.plugins.registry",
+    "PluginRegistry": "agently_sdk.plugins.registry",
+    "get_registry": "agently_sdk.plugins.registry",
+    "JsonFileSpanExporter": "agently_sdk.plugins.tracing",
+    "Span": "agently_sdk.plugins.tracing",
+    "TraceHook": "agently_sdk.plugins.tracing",
+    "add_trace_hook": "agently_sdk.plugins.tracing",
+    "remove_trace_hook": "agently_sdk.plugins.tracing",
+}
+
+__all__ = [
+    "CachePolicy",
+    "CacheStats",
+    "ConfigError",
+    "ConfigResult",
+    "FrozenPluginError",
+    "FunctionKind",
+    "FunctionMetrics",
+    "FunctionSpec",
+    "JsonFileSpanExporter",
+    "ParameterSpec",
+    "Plugin",
+    "PluginConfigError",
+    "PluginInfo",
+    "PluginRegistry",
+    "PluginSchema",
+    "PluginVariable",
+    "Span",
+    "TraceHook",
+    "VariableValidation",
+    "add_trace_hook",
+    "agently_function",
+    "configure_process_pool",
+    "disable_metrics",
+    "enable_metrics",
+    "get_default_executor",
+    "get_function_spec",
+    "get_registry",
+    "kernel_function",
+    "remove_trace_hook",
+    "set_default_executor",
+    "shutdown_process_pool",
+    "write_prometheus",
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Import optional features lazily on first access."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -0,0 +1,279 @@
+"""
+Compiled runtime checks for type hints.
+
+compile_type_check() turns a type hint into a function that tells whether a
+value matches it. Nested generics are checked recursively: List[Dict[str, int]],
+Optional and Union, Tuple (fixed and variadic), Set and FrozenSet, Literal,
+Mapping and Sequence, and Annotated. Hints that cannot be checked at runtime
+accept any value.
+
+Containers whose items are checked with a plain isinstance() are validated on
+the set of distinct item types, collected without running Python code per
+item, so a homogeneous list costs a single subset test on top. Tuples and frozensets
+that contain only immutable values cannot change after they passed, so the
+checker remembers the last ones it verified and does not check them again.
+Compiled checks are shared per hint, but each checker returned by
+compile_type_check() has a memo of its own, released together with it.
+"""
+
+import abc
+import collections.abc
+import functools
+import threading
+import types
+import typing
+from itertools import repeat
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple, Union
+
+TypeCheck = Callable[[Any], bool]
+
+# Verified tuples and frozensets remembered per checker, i.e. per variable
+VERIFIED_CACHE_SIZE = 16
+
+_SEQUENCES = frozenset(
+    {list, collections.abc.Sequence, collections.abc.MutableSequence, collections.deque}
+)
+_SETS = frozenset({set, frozenset, collections.abc.Set, collections.abc.MutableSet})
+_MAPPINGS = frozenset(
+    {
+        dict,
+        collections.abc.Mapping,
+        collections.abc.MutableMapping,
+        collections.OrderedDict,
+        collections.defaultdict,
+    }
+)
+
+
+class _Node(NamedTuple):
+    """A compiled check for one type hint."""
+
+    check: TypeCheck
+    # The check is exactly isinstance(value, classes) when this is set
+    classes: Optional[Union[type, Tuple[type, ...]]]
+    # Whether a value that passed the check always will, i.e. holds no mutable containers
+    stable: bool
+
+
+def _plain(classes: Union[type, Tuple[type, ...]], stable: bool = True) -> _Node:
+    return _Node(lambda value: isinstance(value, classes), classes, stable)
+
+
+def _by_item_type(classes: Union[type, Tuple[type, ...]]) -> bool:
+    """Whether isinstance() against classes only depends on each item's type."""
+    for cls in classes if isinstance(classes, tuple) else (classes,):
+        if type(cls) not in (type, abc.ABCMeta) or getattr(cls, "_is_protocol", False):
+            return False
+    return True
+
+
+def _items_check(node: Optional[_Node]) -> Callable[[Any], bool]:
+    """Make a check of every item of an iterable against a compiled node."""
+    if node is None:
+        return lambda items: True
+
+    classes = node.classes
+    if classes is not None and _by_item_type(classes):
+        checked = classes
+        exact = frozenset(classes if isinstance(classes, tuple) else (classes,))
+
+        def check_types(items: Any) -> bool:
+            # Containers of exactly the expected types need no per-item Python code
+            seen = set(map(type, items))
+            return seen <= exact or all(issubclass(t, checked) for t in seen)
+
+        return check_types
+
+    if classes is not None:
+        return lambda items: all(map(isinstance, items, repeat(classes)))
+
+    item_check = node.check
+    return lambda items: all(map(item_check, items))
+
+
+def _union(nodes: Tuple[Optional[_Node], ...]) -> Optional[_Node]:
+    if any(node is None for node in nodes):
+        return None
+    options = typing.cast(Tuple[_Node, ...], nodes)
+    stable = all(node.stable for node in options)
+
+    classes: Tuple[type, ...] = ()
+    complex_checks = []
+    for node in options:
+        if node.classes is not None:
+            node_classes = node.classes
+            classes += node_classes if isinstance(node_classes, tuple) else (node_classes,)
+        else:
+            complex_checks.append(node.check)
+    if not complex_checks:
+        return _plain(classes, stable)
+
+    def check(value: Any) -> bool:
+        if classes and isinstance(value, classes):
+            return True
+        return any(option(value) for option in complex_checks)
+
+    return _Node(check, None, stable)
+
+
+def _literal(args: Tuple[Any, ...]) -> _Node:
+    allowed = args
+
+    def check(value: Any) -> bool:
+        # 1 == True, but Literal[1] does not accept True
+        return any(value == arg and type(value) is type(arg) for arg in allowed)
+
+    try:
+        pairs = frozenset((type(arg), arg) for arg in args)
+    except TypeError:
+        return _Node(check, None, True)
+
+    def check_hashable(value: Any) -> bool:
+        try:
+            return (type(value), value) in pairs
+        except TypeError:
+            return check(value)
+
+    return _Node(check_hashable, None, True)
+
+
+def _tuple(args: Tuple[Any, ...]) -> _Node:
+    if len(args) == 2 and args[1] is Ellipsis:
+        item = _compile(args[0])
+        items = _items_check(item)
+        stable = item is None or item.stable
+        return _Node(lambda value: isinstance(value, tuple) and items(value), None, stable)
+
+    if args == ((),):
+        args = ()
+    nodes = [_compile(arg) for arg in args]
+    size = len(nodes)
+    checks = [(i, node.check) for i, node in enumerate(nodes) if node is not None]
+    stable = all(node is None or node.stable for node in nodes)
+
+    def check(value: Any) -> bool:
+        if not isinstance(value, tuple) or len(value) != size:
+            return False
+        return all(item_check(value[i]) for i, item_check in checks)
+
+    return _Node(check, None, stable)
+
+
+def _compile(hint: Any) -> Optional[_Node]:
+    """Compile a type hint, or return None if every value matches it."""
+    if hint is Any or hint is object or isinstance(hint, typing.TypeVar):
+        return None
+    if hint is None or hint is type(None):
+        return _plain(type(None))
+
+    supertype = getattr(hint, "__supertype__", None)
+    if supertype is not None:
+        # typing.NewType
+        return _compile(supertype)
+
+    origin = typing.get_origin(hint)
+    args = typing.get_args(hint)
+
+    if origin is None:
+        if isinstance(hint, type):
+            return _plain(hint, stable=True)
+        return None
+    if origin is typing.Annotated:
+        return _compile(args[0])
+    if origin is typing.Union or origin is types.UnionType:
+        return _union(tuple(_compile(arg) for arg in args))
+    if origin is typing.Literal:
+        return _literal(args)
+    if origin is tuple:
+        return _tuple(args)
+
+    if origin in _SEQUENCES or origin in _SETS:
+        item = _compile(args[0]) if args else None
+        items = _items_check(item)
+        stable = origin is frozenset and (item is None or item.stable)
+        container = origin
+        return _Node(lambda value: isinstance(value, container) and items(value), None, stable)
+
+    if origin in _MAPPINGS:
+        keys = _items_check(_compile(args[0]) if args else None)
+        values = _items_check(_compile(args[1]) if len(args) == 2 else None)
+        mapping = origin
+
+        def check_mapping(value: Any) -> bool:
+            return isinstance(value, mapping) and keys(value) and values(value.values())
+
+        return _Node(check_mapping, None, False)
+
+    if origin is type:
+        target = args[0] if args else None
+        if isinstance(target, type) and target is not object:
+            return _Node(
+                lambda value: isinstance(value, type) and issubclass(value, target), None, True
+            )
+        return _plain(type)
+
+    if isinstance(origin, type):
+        # Other generics, e.g. Iterable[int] or Callable[..., int]: only the container is checked
+        return _plain(origin, stable=False)
+    return None
+
+
+def _remember_verified(check: TypeCheck) -> TypeCheck:
+    """Skip checking tuples and frozensets that already passed."""
+    verified: Dict[int, Any] = {}
+    lock = threading.Lock()
+
+    def cached_check(value: Any) -> bool:
+        # Holding a reference keeps the id from being reused by another object
+        if verified.get(id(value)) is value:
+            return True
+        if not check(value):
+            return False
+        with lock:
+            if len(verified) >= VERIFIED_CACHE_SIZE:
+                del verified[next(iter(verified))]
+            verified[id(value)] = value
+        return True
+
+    return cached_check
+
+
+def _compile_root(hint: Any) -> Optional[Tuple[TypeCheck, bool]]:
+    """Compile a hint into its check and whether values that passed can be remembered."""
+    node = _compile(hint)
+    if node is None:
+        return None
+    origin = typing.get_origin(hint)
+    return node.check, node.stable and origin in (tuple, frozenset)
+
+
+_compile_cached = functools.lru_cache(maxsize=1024)(_compile_root)
+
+
+def compile_type_check(hint: Any) -> Optional[TypeCheck]:
+    """
+    Compile a type hint into a function checking whether a value matches it.
+
+    Compiled checks are cached per hint. Checkers of tuple and frozenset hints
+    remember the values that passed them, so callers should keep the checker
+    (e.g. per variable) rather than compile it again for every value.
+
+    Args:
+        hint: The type hint, e.g. List[Dict[str, int]] or Optional[Tuple[int, ...]]
+
+    Returns:
+        A function returning whether a value matches the hint, or None if any
+        value does (e.g. for Any, or hints that cannot be checked at runtime)
+    """
+    try:
+        compiled = _compile_cached(hint)
+    except TypeError:
+        # Unhashable hints, e.g. Annotated with unhashable metadata
+        compiled = _compile_root(hint)
+    if compiled is None:
+        return None
+    check, immutable = compiled
+    return _remember_verified(check) if immutable else check
+
+
+__all__ = ["TypeCheck", "compile_type_check"]
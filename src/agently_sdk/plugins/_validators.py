@@ -0,0 +1,318 @@
+"""
+Code generation of specialized validators for plugin variables.
+
+Each PluginVariable compiles its constraints into a single checker function
+that contains only the checks that apply to it. The checker returns None for
+valid values and an error message otherwise. Checks run cheapest first; when
+one of them fails, the message is produced by the variable's ordered
+reference implementation so errors stay identical to the documented order.
+
+VariableValidation rules are compiled the same way: string patterns are
+compiled once (for their pattern mode, see plugins.patterns), hashable
+options are indexed in a frozenset, and only the range bounds that are set
+are compared.
+
+A ValidationMemo puts a bounded LRU of values known to be valid in front of
+a checker, so values that are validated over and over (defaults, common
+enum strings) skip the checks.
+"""
+
+import enum
+import functools
+import re
+import threading
+import typing
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from agently_sdk.plugins._typecheck import compile_type_check
+from agently_sdk.plugins.caching import CacheStats
+
+if TYPE_CHECKING:
+    from agently_sdk.plugins.variables import PluginVariable, VariableValidation
+
+Checker = Callable[[Any], Optional[str]]
+
+# A compiled VariableValidation: takes a value, returns (is_valid, error_message)
+Rule = Callable[[Any], Tuple[bool, Optional[str]]]
+
+_VALID = (True, None)
+
+
+def _type_checks(var: "PluginVariable", ns: Dict[str, Any]) -> "tuple[List[str], List[str]]":
+    """
+    Generate the type checks for a variable.
+
+    Returns:
+        A tuple of (constant-time checks, checks that are linear in the value size)
+    """
+    value_type = var.value_type
+    if value_type is None:
+        return [], []
+
+    if not hasattr(value_type, "__origin__"):
+        ns["T"] = value_type
+        return ["not isinstance(value, T)"], []
+
+    try:
+        check_type = compile_type_check(value_type)
+    except Exception:
+        # The reference implementation reports the same error for every value
+        return ["True"], []
+    if check_type is None:
+        return [], []
+
+    ns["check_type"] = check_type
+    origin = typing.get_origin(value_type)
+    # Reject values of the wrong container type before the other constraints
+    cheap = []
+    if isinstance(origin, type):
+        ns["O"] = origin
+        cheap.append("not isinstance(value, O)")
+    return cheap, ["if not check_type(value):", "    {fail}"]
+
+
+def compile_checker(var: "PluginVariable") -> Checker:
+    """
+    Compile a variable's constraints into a specialized checker function.
+
+    Args:
+        var: The variable to compile a checker for
+
+    Returns:
+        A function taking a value and returning None if it is valid, or an
+        error message if it is not.
+    """
+    ns: Dict[str, Any] = {"explain": var._explain, "var": var}
+    fail = "return explain(value)"
+
+    if var.default_value is None and var.default_factory is None:
+        lines = ["def check(value):", "    if value is None:", "        return explain(value)"]
+    else:
+        lines = ["def check(value):", "    if value is None:", "        return None"]
+
+    cheap, linear = _type_checks(var, ns)
+    guarded = [f"if {cond}:\n        {fail}" for cond in cheap]
+
+    if var.validation is not None:
+        ns["validation"] = var.validation
+        guarded.append(f"if not validation.validate(value)[0]:\n        {fail}")
+
+    if var.choices is not None:
+        ns["choices"] = var.choices
+        if var.validation is not None:
+            # Auto-created validation already checks the choices as options
+            guarded.append(
+                f"if validation.options is not choices and value not in choices:\n        {fail}"
+            )
+        else:
+            guarded.append(f"if value not in choices:\n        {fail}")
+
+    guarded.extend(line.format(fail=fail) for line in linear)
+
+    if guarded:
+        lines.append("    try:")
+        for check in guarded:
+            lines.extend("        " + line for line in check.split("\n"))
+        lines.append("    except Exception:")
+        lines.append(f"        {fail}")
+
+    if var.validator is not None:
+        ns["validator"] = var.validator
+        lines.extend(
+            [
+                "    try:",
+                "        valid = validator(value)",
+                "    except Exception as e:",
+                "        return f\"Custom validation error for '{var.name}': {str(e)}\"",
+                "    if not valid:",
+                "        return f\"Variable '{var.name}' failed custom validation: {value}\"",
+            ]
+        )
+
+    lines.append("    return None")
+
+    exec("\n".join(lines), ns)
+    checker: Checker = ns["check"]
+    return checker
+
+
+# Exact types whose values are memoized. They are immutable and, keyed by type as well
+# as value, only equal to values that pass the same checks (unlike e.g. (1,) and (1.0,)).
+MEMO_TYPES = frozenset({str, int, float, bool, bytes, complex})
+
+
+class _Invalid(Exception):
+    """Carries a checker's error out of the memo, so that it is not remembered."""
+
+    def __init__(self, error: str) -> None:
+        super().__init__(error)
+        self.error = error
+
+
+class ValidationMemo:
+    """
+    A bounded LRU of values a checker accepted, with hit statistics.
+
+    Only values of the MEMO_TYPES and enum members are remembered; other
+    values are passed to the checker every time. Invalid values are never
+    remembered.
+
+    Args:
+        checker: The checker to memoize
+        maxsize: Maximum number of valid values remembered
+    """
+
+    def __init__(self, checker: Checker, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+        def accept(value: Any) -> None:
+            error = checker(value)
+            if error is not None:
+                raise _Invalid(error)
+
+        # typed=True keeps 1, 1.0 and True apart
+        known = functools.lru_cache(maxsize=maxsize, typed=True)(accept)
+        self._known = known
+
+        def check(value: Any) -> Optional[str]:
+            if value.__class__ in MEMO_TYPES or isinstance(value, enum.Enum):
+                try:
+                    return known(value)  # type: ignore[func-returns-value]
+                except _Invalid as invalid:
+                    with self._lock:
+                        self._rejected += 1
+                    return invalid.error
+            return checker(value)
+
+        self.check: Checker = check
+
+    def stats(self) -> CacheStats:
+        """Get a snapshot of the memo's statistics."""
+        info = self._known.cache_info()
+        with self._lock:
+            remembered = info.misses - self._rejected
+        return CacheStats(
+            hits=info.hits,
+            misses=info.misses,
+            evictions=max(0, remembered - info.currsize),
+            size=info.currsize,
+        )
+
+    def clear(self) -> None:
+        """Forget every remembered value and reset the statistics."""
+        with self._lock:
+            self._known.cache_clear()
+            self._rejected = 0
+
+
+def _options_checks(validation: "VariableValidation", ns: Dict[str, Any]) -> List[str]:
+    """Generate the options check of a validation rule."""
+    # The rule checks a copy, so changes to the list only apply after recompile()
+    options = tuple(validation.options or ())
+    ns["options"] = options
+    fail = 'return False, validation.error_message or f"Value must be one of: {validation.options}"'
+
+    hashable = []
+    unhashable = []
+    for option in options:
+        try:
+            hash(option)
+        except TypeError:
+            unhashable.append(option)
+        else:
+            hashable.append(option)
+
+    if not hashable:
+        return ["    if value not in options:", f"        {fail}"]
+
+    ns["index"] = frozenset(hashable)
+    ns["rest"] = tuple(unhashable)
+    # Unhashable values can only be found by comparing them with every option
+    found = "value in index or value in rest" if unhashable else "value in index"
+    return [
+        "    try:",
+        f"        found = {found}",
+        "    except TypeError:",
+        "        found = value in options",
+        "    if not found:",
+        f"        {fail}",
+    ]
+
+
+def compile_validation(validation: "VariableValidation") -> Rule:
+    """
+    Compile a VariableValidation into a specialized rule function.
+
+    Args:
+        validation: The validation rules to compile
+
+    Returns:
+        A function taking a value and returning (is_valid, error_message), with
+        the same results as the rules checked one by one
+    """
+    ns: Dict[str, Any] = {"validation": validation, "VALID": _VALID}
+    error_message = validation.error_message
+    lines = ["def rule(value):"]
+
+    if validation.options is not None:
+        lines.extend(_options_checks(validation, ns))
+
+    if validation.range is not None:
+        low, high = validation.range
+        if low is not None:
+            ns["low"] = low
+            ns["low_error"] = (False, error_message or f"Value must be >= {low}")
+            lines.extend(["    if value < low:", "        return low_error"])
+        if high is not None:
+            ns["high"] = high
+            ns["high_error"] = (False, error_message or f"Value must be <= {high}")
+            lines.extend(["    if value > high:", "        return high_error"])
+
+    if validation.pattern is not None:
+        pattern = validation.pattern
+        mode = validation.pattern_mode
+        max_length = validation.max_length
+        if mode is None:
+            ns["match"] = (re.compile(pattern) if isinstance(pattern, str) else pattern).match
+        else:
+            # Only loaded when a bounded pattern mode is used
+            from agently_sdk.plugins.patterns import DEFAULT_MAX_LENGTH, compile_pattern
+
+            ns["match"] = compile_pattern(pattern, mode)
+            if max_length is None:
+                max_length = DEFAULT_MAX_LENGTH
+        ns["type_error"] = (
+            False,
+            error_message or "Value must be a string for pattern validation",
+        )
+        ns["pattern_error"] = (False, error_message or f"Value must match pattern: {pattern}")
+        lines.extend(["    if not isinstance(value, str):", "        return type_error"])
+
+        if max_length is not None:
+            ns["max_length"] = max_length
+            ns["length_error"] = (
+                False,
+                error_message
+                or f"Value must be at most {max_length} characters for pattern validation",
+            )
+            lines.extend(["    if len(value) > max_length:", "        return length_error"])
+
+        lines.extend(["    if not match(value):", "        return pattern_error"])
+
+    lines.append("    return VALID")
+
+    exec("\n".join(lines), ns)
+    rule: Rule = ns["rule"]
+    return rule
+
+
+__all__ = [
+    "MEMO_TYPES",
+    "Checker",
+    "Rule",
+    "ValidationMemo",
+    "compile_checker",
+    "compile_validation",
+]
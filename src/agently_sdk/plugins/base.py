@@ -2,13 +2,168 @@
 Base Plugin class for Agently plugins.
 """
 
-import inspect
-from typing import Any, Callable, Dict
+import abc
+import json
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
 
+from agently_sdk.plugins.batch import (
+    ConfigError,
+    ConfigResult,
+    PluginConfigError,
+    iter_plugin_configs,
+)
+from agently_sdk.plugins.caching import CacheStats, clear_cache, get_cache_stats
+from agently_sdk.plugins.execution import DEFAULT_MAX_BUFFERED, invoke_function, stream_function
+from agently_sdk.plugins.frozen import frozen_namespace, install_frozen_variables
+from agently_sdk.plugins.instrumentation import instrument_class, is_active, maybe_instrument
+from agently_sdk.plugins.overrides import derive_plugin
+from agently_sdk.plugins.schema import PluginSchema, build_schema
+from agently_sdk.plugins.spec import FunctionSpec, get_function_spec
+from agently_sdk.plugins.storage import compact_slots, compact_values, install_compact_layout
+from agently_sdk.plugins.tool_schema import cached_schema_json
+from agently_sdk.plugins.updates import (
+    UpdateListener,
+    add_update_listener,
+    apply_update,
+    notify_update_listeners,
+    remove_update_listener,
+    values_snapshot,
+)
 from agently_sdk.plugins.variables import PluginVariable  # Adjust import path as needed
 
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
 
-class Plugin:
+    from agently_sdk.plugins.metrics import FunctionMetrics
+
+P = TypeVar("P", bound="Plugin")
+
+# Class attributes that do not affect the schema: the schema itself and the
+# bookkeeping ABCMeta sets up when a class is created
+_UNTRACKED_ATTRIBUTES = frozenset({"_plugin_schema", "_abc_impl", "__abstractmethods__"})
+
+
+def _has_default_factory(value: Any) -> bool:
+    """Whether a class attribute is a variable with a lazily computed default."""
+    return isinstance(value, PluginVariable) and value.default_factory is not None
+
+
+class PluginMeta(abc.ABCMeta):
+    """
+    Metaclass for Agently plugins.
+
+    Keeps each class's cached PluginSchema in sync with the class: setting or
+    deleting a class attribute after the class has been created invalidates the
+    schema of that class and of every subclass inheriting from it. It derives
+    from ABCMeta, so plugins can also be abstract base classes.
+
+    It also accepts the ``compact`` class keyword, which gives the class a
+    slot-based storage layout for its variable values (see plugins.storage),
+    and the ``frozen`` class keyword, which stores the values as plain
+    instance attributes that cannot be changed (see plugins.frozen).
+    """
+
+    # Storage layout of a plugin class, declared with their defaults on Plugin
+    _compact_layout: Optional[Dict[str, int]]
+    _frozen: bool
+
+    def __new__(
+        mcls,
+        name: str,
+        bases: Tuple[type, ...],
+        namespace: Dict[str, Any],
+        compact: Optional[bool] = None,
+        frozen: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> "PluginMeta":
+        inherited = any(getattr(base, "_compact_layout", None) is not None for base in bases)
+        if compact is False and inherited:
+            raise TypeError(f"{name} cannot disable the compact storage of its base class")
+
+        frozen_base = any(getattr(base, "_frozen", False) for base in bases)
+        if frozen is False and frozen_base:
+            raise TypeError(f"{name} cannot unfreeze its frozen base class")
+        if (frozen or frozen_base) and (compact or inherited):
+            raise TypeError(f"{name} cannot be both frozen and compact")
+
+        if frozen or frozen_base:
+            namespace = frozen_namespace(namespace, frozen_base)
+            namespace["_frozen"] = True
+
+        if compact or inherited:
+            namespace = dict(namespace)
+            slots = namespace.get("__slots__", ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            namespace["__slots__"] = tuple(slots) + compact_slots(bases)
+            namespace["_compact_layout"] = {}
+            if not inherited:
+                namespace["_values"] = compact_values
+
+        if any(_has_default_factory(value) for value in namespace.values()):
+            from agently_sdk.plugins.defaults import lazy_default_namespace
+
+            namespace = lazy_default_namespace(namespace)
+        return super().__new__(mcls, name, bases, namespace, **kwargs)
+
+    def __setattr__(cls, name: str, value: Any) -> None:
+        value = maybe_instrument(name, value)
+        if _has_default_factory(value):
+            from agently_sdk.plugins.defaults import LazyDefaultVariable
+
+            value = LazyDefaultVariable(value)
+        super().__setattr__(name, value)
+        if name not in _UNTRACKED_ATTRIBUTES:
+            cls._invalidate_schema()
+
+    def __delattr__(cls, name: str) -> None:
+        super().__delattr__(name)
+        if name not in _UNTRACKED_ATTRIBUTES:
+            cls._invalidate_schema()
+
+    def _invalidate_schema(cls) -> None:
+        """Drop the cached schema of this class and all of its subclasses."""
+        eager = []
+        pending: List[PluginMeta] = [cls]
+        while pending:
+            klass = pending.pop()
+            type.__setattr__(klass, "_plugin_schema", None)
+            if klass._compact_layout is not None or klass._frozen:
+                eager.append(klass)
+            pending.extend(cast(List[PluginMeta], klass.__subclasses__()))
+
+        # Compact and frozen layouts hold the variable descriptors, so they cannot wait
+        for klass in eager:
+            klass._refresh_schema()
+
+    def _refresh_schema(cls) -> PluginSchema:
+        """Rebuild and cache the schema (and compact layout) of this class."""
+        schema = build_schema(cls)
+        type.__setattr__(cls, "_plugin_schema", schema)
+        if cls._compact_layout is not None:
+            install_compact_layout(cls, schema)
+        elif cls._frozen:
+            install_frozen_variables(cls, schema)
+        return schema
+
+
+class Plugin(metaclass=PluginMeta):
     """
     Base class for all Agently plugins.
 
@@ -49,6 +204,33 @@ class Plugin:
     name: str
     description: str
 
+    # Executor used by ainvoke() for blocking functions; None uses the SDK default
+    blocking_executor: ClassVar[Optional["Executor"]] = None
+
+    # Chunks astream() lets a generator function produce ahead of the consumer
+    stream_max_buffered: ClassVar[int] = DEFAULT_MAX_BUFFERED
+
+    # Instances keep their values in the _values slot. Subclasses also get an
+    # instance __dict__ unless they use compact storage, which replaces _values
+    __slots__ = ("_values",)
+
+    # Cached PluginSchema for the class, see get_plugin_schema()
+    _plugin_schema: Optional[PluginSchema] = None
+
+    # Variable name -> tuple index for compact plugins, None otherwise
+    _compact_layout: Optional[Dict[str, int]] = None
+    _default_store: Tuple[Any, ...] = ()
+
+    # Whether variable values are frozen instance attributes
+    _frozen: ClassVar[bool] = False
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Build the schema for each new Plugin subclass up front."""
+        super().__init_subclass__(**kwargs)
+        if is_active():
+            instrument_class(cls)
+        cls._refresh_schema()
+
     def __init__(self, **kwargs: Any) -> None:
         """
         Initialize the plugin with configuration variables.
@@ -56,23 +238,19 @@ class Plugin:
         Args:
             **kwargs: Configuration values for plugin variables.
         """
-        # Initialize the _values dictionary
-        self._values: Dict[str, Any] = {}
-
-        # Get all class attributes that are PluginVariables
-        variables = {}
-        for name, attr in inspect.getmembers(self.__class__):
-            if isinstance(attr, PluginVariable):
-                # Set the name if not already set
-                if attr.name is None:
-                    attr.name = name
-                variables[name] = attr
+        values: Dict[str, Any] = {}
+        schema = self.__class__._plugin_schema or self.get_plugin_schema()
+        variables = schema.variables
 
         # Validate and set variables from kwargs
         for name, value in kwargs.items():
-            if name in variables:
-                # This will validate and set the value through the descriptor
-                setattr(self, name, value)
+            var = variables.get(name)
+            if var is not None:
+                # Validate with the variable's compiled checker and store the value
+                error = (var._checker or var.checker)(value)
+                if error is not None:
+                    raise ValueError(error)
+                values[schema.names[name]] = value
             elif hasattr(self, name):
                 # For non-PluginVariable attributes
                 setattr(self, name, value)
@@ -80,10 +258,264 @@ class Plugin:
                 raise ValueError(f"Unknown variable: {name}")
 
         # Check for required variables (those without defaults)
-        for name, var in variables.items():
-            if name not in self._values and var.default_value is None:
+        for name in schema.required:
+            if schema.names[name] not in values:
                 raise ValueError(f"Required variable not provided: {name}")
 
+        # Store the validated values
+        self._values = values
+
+    def update(self, **changes: Any) -> Dict[str, Any]:
+        """
+        Change several variables of this plugin at once, atomically.
+
+        Only values that differ from the current ones are validated. If they are
+        all valid, they replace the current values in a single step, so readers
+        on other threads (see get_values()) see either all of the changes or
+        none of them. The update listeners of the class are then called with
+        the changed values (see add_update_listener()).
+
+        Args:
+            **changes: New values keyed by variable name
+
+        Returns:
+            Dict[str, Any]: The values that actually changed, keyed by variable name
+
+        Raises:
+            ValueError: If a variable is unknown or a new value is invalid; nothing is
+                changed in that case
+            FrozenPluginError: If the plugin class is frozen
+        """
+        schema = self.__class__._plugin_schema or self.get_plugin_schema()
+        changed = apply_update(self, schema, changes)
+        if changed:
+            notify_update_listeners(self, changed)
+        return changed
+
+    def with_overrides(self: P, **overrides: Any) -> P:
+        """
+        Create a copy of this plugin with some variables overridden.
+
+        Only the overridden values are validated. The copy shares this plugin's
+        values instead of copying them, so deriving costs O(number of overrides),
+        which makes per-request specialization of a configured plugin cheap.
+        Setting a variable on the copy does not affect this plugin.
+
+        The copy sees this plugin's values as they are when it is derived: later
+        changes to this plugin, by assignment or update(), do not reach it.
+        Other instance attributes are shared as with a shallow copy; __init__ is
+        not run again. Compact plugins copy their value tuple once instead, and
+        frozen plugins their instance attributes.
+
+        Args:
+            **overrides: New values keyed by variable name
+
+        Returns:
+            The derived plugin instance
+
+        Raises:
+            ValueError: If a variable is unknown or a value is invalid
+        """
+        schema = self.__class__._plugin_schema or self.get_plugin_schema()
+        return derive_plugin(self, schema, overrides)
+
+    def get_values(self) -> Dict[str, Any]:
+        """
+        Get the values of all of this plugin's variables from one consistent snapshot.
+
+        Returns:
+            Dict[str, Any]: The values keyed by variable name, including defaults
+        """
+        return values_snapshot(self, self.__class__._plugin_schema or self.get_plugin_schema())
+
+    @classmethod
+    def add_update_listener(cls, listener: UpdateListener) -> None:
+        """
+        Call a listener whenever update() changes an instance of this class or a subclass.
+
+        Args:
+            listener: Called with the plugin and its changed values, keyed by variable name
+        """
+        add_update_listener(cls, listener)
+
+    @classmethod
+    def remove_update_listener(cls, listener: UpdateListener) -> None:
+        """
+        Stop calling a listener added with add_update_listener().
+
+        Args:
+            listener: The listener to remove
+        """
+        remove_update_listener(cls, listener)
+
+    async def ainvoke(self, name: str, **kwargs: Any) -> Any:
+        """
+        Invoke one of this plugin's functions from async code.
+
+        Async functions are awaited directly. Blocking functions run on
+        blocking_executor (or the SDK default executor) so they do not stall
+        the event loop. Generator functions are drained into a list; use
+        astream() to receive their chunks as they are produced.
+
+        Args:
+            name: The name of the function, as returned by get_kernel_functions()
+            **kwargs: Arguments for the function
+
+        Returns:
+            The function's result
+
+        Raises:
+            ValueError: If the plugin has no function with that name
+        """
+        schema = self.__class__._plugin_schema or self.get_plugin_schema()
+        if name not in schema.functions:
+            raise ValueError(f"Unknown function: {name}")
+
+        return await invoke_function(getattr(self, name), kwargs, self.blocking_executor)
+
+    def astream(self, name: str, **kwargs: Any) -> AsyncIterator[Any]:
+        """
+        Invoke one of this plugin's functions from async code, streaming its result.
+
+        Chunks of generator and async generator functions are delivered as they
+        are produced. A generator runs at most stream_max_buffered chunks ahead
+        of the consumer, and closing the iterator early (or cancelling the task
+        consuming it) closes the generator. Other functions produce their
+        result as a single chunk.
+
+        Example:
+            ```python
+            async with contextlib.aclosing(plugin.astream("tail", path="app.log")) as lines:
+                async for line in lines:
+                    if "ERROR" in line:
+                        break
+            ```
+
+        Args:
+            name: The name of the function, as returned by get_kernel_functions()
+            **kwargs: Arguments for the function
+
+        Returns:
+            AsyncIterator[Any]: The chunks of the function's result
+
+        Raises:
+            ValueError: If the plugin has no function with that name
+        """
+        schema = self.__class__._plugin_schema or self.get_plugin_schema()
+        if name not in schema.functions:
+            raise ValueError(f"Unknown function: {name}")
+
+        return stream_function(
+            getattr(self, name), kwargs, self.blocking_executor, self.stream_max_buffered
+        )
+
+    def get_cache_stats(self) -> Dict[str, CacheStats]:
+        """
+        Get the result cache statistics of this plugin instance.
+
+        Returns:
+            Dict[str, CacheStats]: Statistics keyed by function name, for functions
+            decorated with a cache policy.
+        """
+        schema = self.__class__._plugin_schema or self.get_plugin_schema()
+        result = {}
+        for name, func in schema.functions.items():
+            stats = get_cache_stats(func, self)
+            if stats is not None:
+                result[name] = stats
+        return result
+
+    def clear_caches(self) -> None:
+        """Drop the cached results of all of this plugin instance's functions."""
+        schema = self.__class__._plugin_schema or self.get_plugin_schema()
+        for func in schema.functions.values():
+            clear_cache(func, self)
+
+    @classmethod
+    def get_metrics(cls) -> Dict[str, "FunctionMetrics"]:
+        """
+        Get the call metrics recorded for this plugin's functions.
+
+        Metrics are only recorded while enabled (see plugins.metrics.enable_metrics).
+        They are grouped by plugin name, so classes sharing a name share metrics.
+
+        Returns:
+            Dict[str, FunctionMetrics]: Metrics keyed by function name, for functions
+            called while metrics were enabled.
+        """
+        from agently_sdk.plugins.metrics import get_metrics
+
+        plugin = cls.name if isinstance(getattr(cls, "name", None), str) else cls.__name__
+        return {function: metrics for (_, function), metrics in get_metrics(plugin).items()}
+
+    @classmethod
+    def from_configs(
+        cls: Type[P], configs: Iterable[Mapping[str, Any]], chunk_size: int = 1024
+    ) -> List[P]:
+        """
+        Create one plugin instance per configuration.
+
+        The class schema is resolved once and configurations are validated one
+        variable at a time. Unlike calling the class in a loop, every invalid
+        configuration is reported rather than only the first.
+
+        Args:
+            configs: Keyword arguments for each instance
+            chunk_size: Number of configurations validated together
+
+        Returns:
+            List[Plugin]: The instances, in input order
+
+        Raises:
+            PluginConfigError: If any configuration is invalid, listing every error
+        """
+        plugins: List[P] = []
+        errors: List[ConfigError] = []
+        for result in cls.iter_configs(configs, chunk_size=chunk_size):
+            if result.plugin is not None:
+                plugins.append(result.plugin)
+            errors.extend(result.errors)
+
+        if errors:
+            raise PluginConfigError(errors)
+        return plugins
+
+    @classmethod
+    def iter_configs(
+        cls: Type[P], configs: Iterable[Mapping[str, Any]], chunk_size: int = 1024
+    ) -> Iterator[ConfigResult[P]]:
+        """
+        Lazily create one plugin instance per configuration.
+
+        This is the streaming form of from_configs: configurations are consumed
+        chunk_size at a time and a ConfigResult is yielded for each one, holding
+        either the instance or the errors found in that configuration.
+
+        Args:
+            configs: Keyword arguments for each instance
+            chunk_size: Number of configurations validated together
+
+        Yields:
+            ConfigResult: One result per configuration, in input order
+        """
+        return iter_plugin_configs(cls, configs, chunk_size)
+
+    @classmethod
+    def get_plugin_schema(cls) -> PluginSchema:
+        """
+        Get the schema describing this plugin class.
+
+        The schema is computed once when the class is created and rebuilt
+        lazily if the class (or one of its bases) is modified afterwards.
+
+        Returns:
+            PluginSchema: The variables, functions and required variables of the class.
+        """
+        schema = cls._plugin_schema
+        if schema is None:
+            schema = cls._refresh_schema()
+        return schema
+
     @classmethod
     def get_kernel_functions(cls) -> Dict[str, Callable]:
         """
@@ -98,44 +530,66 @@ class Plugin:
         Returns:
             Dict[str, Callable]: A dictionary mapping function names to function objects.
         """
-        result: dict[str, Callable[..., Any]] = {}
+        return dict(cls.get_plugin_schema().functions)
+
+    @classmethod
+    def get_function_specs(cls) -> Dict[str, FunctionSpec]:
+        """
+        Get the FunctionSpec of every kernel function in this class.
 
-        for name, func in inspect.getmembers(cls):
-            # Skip private methods
-            if name.startswith("_"):
-                continue
+        Specs hold each function's signature, resolved type hints, defaults and
+        docstring descriptions. They are built once per function and cached.
 
-            # Skip non-functions
-            if not inspect.isfunction(func):
-                continue
+        Returns:
+            Dict[str, FunctionSpec]: A dictionary mapping function names to their specs.
+        """
+        functions = cls.get_plugin_schema().functions
+        return {name: get_function_spec(func) for name, func in functions.items()}
 
-            # Check if this method has been decorated with @kernel_function or @agently_function
-            is_kernel_func = hasattr(func, "_is_kernel_function") and func._is_kernel_function
-            is_agently_func = hasattr(func, "_is_agently_function") and func._is_agently_function
-            is_sk_kernel_func = hasattr(func, "__kernel_function__") and func.__kernel_function__
+    @classmethod
+    def get_tool_schema_json(cls) -> bytes:
+        """
+        Get the function-calling schemas of this plugin's functions as JSON.
 
-            if is_kernel_func or is_agently_func or is_sk_kernel_func:
-                result[name] = func
+        The JSON is generated once from the functions' type hints and docstrings
+        and cached until the class changes.
 
-        return result
+        Returns:
+            bytes: A UTF-8 encoded JSON list of tool schemas.
+        """
+        return cached_schema_json(cls, cls.get_plugin_schema())[0]
 
     @classmethod
-    def get_plugin_variables(cls) -> Dict[str, "PluginVariable"]:
+    def get_tool_schemas(cls) -> List[Dict[str, Any]]:
         """
-        Get all PluginVariable instances defined in this class.
+        Get the function-calling schemas of this plugin's functions.
+
+        Each schema has the OpenAI / Semantic Kernel tool format:
+        {"type": "function", "function": {"name", "description", "parameters"}},
+        named "<plugin name>-<function name>".
 
         Returns:
-            Dict[str, PluginVariable]: A dictionary mapping variable names to PluginVariable objects.
+            List[Dict[str, Any]]: A fresh copy of the tool schemas, safe to modify.
         """
-        result = {}
+        return cast(List[Dict[str, Any]], json.loads(cls.get_tool_schema_json()))
+
+    @classmethod
+    def get_variables_schema(cls) -> Dict[str, Any]:
+        """
+        Get a JSON Schema object describing this plugin's configuration variables.
 
-        for name, value in inspect.getmembers(cls):
-            # Skip private attributes and methods
-            if name.startswith("_"):
-                continue
+        Returns:
+            Dict[str, Any]: An object schema with one property per public variable.
+        """
+        variables = cached_schema_json(cls, cls.get_plugin_schema())[1]
+        return cast(Dict[str, Any], json.loads(variables))
 
-            # Check if this is a PluginVariable
-            if isinstance(value, PluginVariable):
-                result[name] = value
+    @classmethod
+    def get_plugin_variables(cls) -> Dict[str, "PluginVariable"]:
+        """
+        Get all PluginVariable instances defined in this class.
 
-        return result
+        Returns:
+            Dict[str, PluginVariable]: A dictionary mapping variable names to PluginVariable objects.
+        """
+        return dict(cls.get_plugin_schema().public_variables)
@@ -0,0 +1,189 @@
+"""
+Bulk instantiation of Agently plugins from many configurations.
+
+Configurations are validated column by column: every value of one variable is
+checked across a chunk of configurations before moving on to the next
+variable, so each variable's checker is resolved once per chunk rather than
+once per instance.
+"""
+
+from dataclasses import dataclass
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+if TYPE_CHECKING:
+    from agently_sdk.plugins.base import Plugin
+
+P = TypeVar("P", bound="Plugin")
+
+
+@dataclass(frozen=True)
+class ConfigError:
+    """
+    A single problem found in one configuration of a batch.
+
+    Attributes:
+        index: Position of the configuration in the input
+        variable: The offending key, or None if the error concerns the whole configuration
+        message: The error message, as raised by Plugin.__init__
+    """
+
+    index: int
+    variable: Optional[str]
+    message: str
+
+    def __str__(self) -> str:
+        return f"config[{self.index}]: {self.message}"
+
+
+@dataclass(frozen=True)
+class ConfigResult(Generic[P]):
+    """
+    The outcome of instantiating a plugin from one configuration.
+
+    Attributes:
+        index: Position of the configuration in the input
+        plugin: The plugin instance, or None if the configuration is invalid
+        errors: Every problem found in the configuration
+    """
+
+    index: int
+    plugin: Optional[P]
+    errors: Tuple[ConfigError, ...] = ()
+
+    @property
+    def ok(self) -> bool:
+        """Whether the plugin was created successfully."""
+        return not self.errors
+
+
+class PluginConfigError(ValueError):
+    """
+    Raised by Plugin.from_configs when one or more configurations are invalid.
+
+    Attributes:
+        errors: Every problem found, in input order
+    """
+
+    def __init__(self, errors: List[ConfigError]):
+        self.errors = errors
+        shown = "; ".join(str(error) for error in errors[:5])
+        more = f" (and {len(errors) - 5} more)" if len(errors) > 5 else ""
+        super().__init__(f"{len(errors)} invalid plugin configuration(s): {shown}{more}")
+
+
+def _validate_chunk(
+    plugin_class: Type["Plugin"], offset: int, chunk: List[Mapping[str, Any]]
+) -> Iterator[Tuple[int, Dict[str, Any], Dict[str, Any], List[ConfigError]]]:
+    """
+    Validate a chunk of configurations one variable at a time.
+
+    Yields:
+        Tuples of (index, validated values, other attributes, errors) per configuration
+    """
+    schema = plugin_class.get_plugin_schema()
+    variables = schema.variables
+
+    values: List[Dict[str, Any]] = [{} for _ in chunk]
+    extras: List[Dict[str, Any]] = [{} for _ in chunk]
+    errors: List[List[ConfigError]] = [[] for _ in chunk]
+
+    # Keys that are not plugin variables are set as plain attributes, as in __init__
+    for i, config in enumerate(chunk):
+        for key in config:
+            if key in variables:
+                continue
+            if hasattr(plugin_class, key):
+                extras[i][key] = config[key]
+            else:
+                errors[i].append(ConfigError(offset + i, key, f"Unknown variable: {key}"))
+
+    required = set(schema.required)
+    for attr, var in variables.items():
+        check = var.checker
+        key = schema.names[attr]
+        is_required = attr in required
+        for i, config in enumerate(chunk):
+            if attr in config:
+                value = config[attr]
+                error = check(value)
+                if error is None:
+                    values[i][key] = value
+                else:
+                    errors[i].append(ConfigError(offset + i, attr, error))
+            elif is_required:
+                errors[i].append(
+                    ConfigError(offset + i, attr, f"Required variable not provided: {attr}")
+                )
+
+    for i in range(len(chunk)):
+        yield offset + i, values[i], extras[i], errors[i]
+
+
+def iter_plugin_configs(
+    plugin_class: Type[P], configs: Iterable[Mapping[str, Any]], chunk_size: int = 1024
+) -> Iterator[ConfigResult[P]]:
+    """
+    Instantiate a plugin class for each configuration, streaming the results.
+
+    At most chunk_size configurations are held in memory at a time. Classes that
+    override __init__ are constructed through it with the validated configuration;
+    otherwise instances are created directly from the validated values.
+
+    Args:
+        plugin_class: The Plugin subclass to instantiate
+        configs: Keyword arguments for each instance
+        chunk_size: Number of configurations validated together
+
+    Yields:
+        ConfigResult: One result per configuration, in input order
+    """
+    from agently_sdk.plugins.base import Plugin
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    direct = plugin_class.__init__ is Plugin.__init__
+    iterator = iter(configs)
+    offset = 0
+
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+
+        for index, values, extras, errors in _validate_chunk(plugin_class, offset, chunk):
+            if errors:
+                yield ConfigResult(index, None, tuple(errors))
+                continue
+
+            if direct:
+                plugin = plugin_class.__new__(plugin_class)
+                plugin._values = values
+                for key, value in extras.items():
+                    setattr(plugin, key, value)
+            else:
+                try:
+                    plugin = plugin_class(**chunk[index - offset])
+                except ValueError as e:
+                    yield ConfigResult(index, None, (ConfigError(index, None, str(e)),))
+                    continue
+            yield ConfigResult(index, plugin)
+
+        offset += len(chunk)
+
+
+__all__ = ["ConfigError", "ConfigResult", "PluginConfigError", "iter_plugin_configs"]
@@ -0,0 +1,363 @@
+"""
+Result caching for Agently plugin functions.
+
+Functions decorated with ``@agently_function(cache=CachePolicy(...))`` memoize
+their results per plugin instance, keyed on the normalized bound arguments.
+Caches use LRU eviction with optional TTL expiry and are dropped together with
+the plugin instance they belong to. Changing the plugin's configuration, by
+assigning a variable or with update(), clears its caches.
+
+Example:
+    ```python
+    class LookupPlugin(Plugin):
+        name = "lookup"
+        description = "Looks things up"
+
+        @agently_function(cache=CachePolicy(maxsize=256, ttl=60))
+        def country_code(self, country: str) -> str:
+            ...
+
+    plugin = LookupPlugin()
+    plugin.country_code("France")
+    plugin.get_cache_stats()["country_code"].hits
+    ```
+"""
+
+import functools
+import inspect
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from agently_sdk.plugins.decorators import FunctionKind
+
+# Marks a cache miss
+_MISSING = object()
+
+# The result caches of each plugin instance, keyed by id, so that a change to
+# the instance's configuration can clear them
+owner_caches: Dict[int, List["ResultCache"]] = {}
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    How a plugin function caches its results.
+
+    Attributes:
+        maxsize: Maximum number of results kept per plugin instance
+        ttl: Seconds a result stays valid, or None to keep results until evicted
+    """
+
+    maxsize: int = 128
+    ttl: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if self.ttl is not None and self.ttl <= 0:
+            raise ValueError("ttl must be positive")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    Statistics for one function's cache on one plugin instance.
+
+    Attributes:
+        hits: Calls answered from the cache
+        misses: Calls that ran the function
+        evictions: Results dropped because the cache was full
+        expirations: Results dropped because their ttl had passed
+        size: Number of results currently cached
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResultCache:
+    """
+    A thread-safe LRU cache with optional TTL expiry.
+
+    The lock is only held while the cache itself is read or updated, never
+    while the cached function runs.
+    """
+
+    def __init__(self, policy: CachePolicy, clock: Callable[[], float] = time.monotonic):
+        self.policy = policy
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Look up a cached result.
+
+        Args:
+            key: The normalized call arguments
+
+        Returns:
+            The cached result, or the module's missing marker on a miss
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > self._clock():
+                    self._data.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._data[key]
+                self._expirations += 1
+            self._misses += 1
+            return _MISSING
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store a result, evicting the least recently used one if the cache is full.
+
+        Args:
+            key: The normalized call arguments
+            value: The result to cache
+        """
+        ttl = self.policy.ttl
+        expires_at = self._clock() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.policy.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def stats(self) -> CacheStats:
+        """Get a snapshot of this cache's statistics."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                size=len(self._data),
+            )
+
+    def clear(self) -> None:
+        """Drop all cached results, keeping the statistics."""
+        with self._lock:
+            self._data.clear()
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    Turn an argument value into a hashable key.
+
+    Common unhashable containers get hashable equivalents. Every value is tagged
+    with its type, so equal values of different types such as 1, 1.0 and True
+    get different keys, also inside containers.
+    """
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_freeze(item) for item in value))
+    if isinstance(value, dict):
+        return (dict, frozenset((_freeze(key), _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return (type(value), frozenset(_freeze(item) for item in value))
+    return (type(value), value)
+
+
+class CachedFunction:
+    """
+    Per-owner result caches for one plugin function.
+
+    The owner is the plugin instance for methods; plain functions share a single
+    cache. Caches are released when their owner is garbage collected.
+    """
+
+    def __init__(self, func: Callable[..., Any], policy: CachePolicy):
+        self.func = func
+        self.policy = policy
+        self.signature = inspect.signature(func)
+        params = list(self.signature.parameters)
+        self.is_method = bool(params) and params[0] == "self"
+        self._caches: Dict[int, ResultCache] = {}
+        self._lock = threading.Lock()
+
+    def cache_for(self, owner: Any, create: bool = True) -> Optional[ResultCache]:
+        """
+        Get the cache belonging to an owner.
+
+        Args:
+            owner: The plugin instance, or None for plain functions
+            create: Whether to create the cache if it does not exist yet
+
+        Returns:
+            The owner's cache, or None if it has none and create is False
+        """
+        key = id(owner)
+        cache = self._caches.get(key)
+        if cache is None and create:
+            with self._lock:
+                cache = self._caches.get(key)
+                if cache is None:
+                    cache = ResultCache(self.policy)
+                    self._caches[key] = cache
+                    if owner is not None:
+                        weakref.finalize(owner, self._caches.pop, key, None)
+                        if key not in owner_caches:
+                            weakref.finalize(owner, owner_caches.pop, key, None)
+                        owner_caches.setdefault(key, []).append(cache)
+        return cache
+
+    def key(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[Any, Optional[Hashable]]:
+        """
+        Normalize call arguments into an owner and a cache key.
+
+        Returns:
+            A tuple of (owner, key); the key is None if the arguments cannot be hashed
+        """
+        bound = self.signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+        owner = None
+        if self.is_method:
+            arguments = dict(arguments)
+            owner = arguments.pop("self")
+
+        key = tuple((name, _freeze(value)) for name, value in arguments.items())
+        try:
+            hash(key)
+        except TypeError:
+            return owner, None
+        return owner, key
+
+
+def make_cached(
+    f: Callable[..., Any], kind: FunctionKind, policy: CachePolicy
+) -> Callable[..., Any]:
+    """
+    Wrap a plugin function so its results are cached according to a policy.
+
+    Args:
+        f: The function to wrap
+        kind: The kind of the function
+        policy: The cache policy
+
+    Returns:
+        The caching wrapper, with the same kind as f
+
+    Raises:
+        TypeError: If f is a generator function, whose results cannot be cached
+    """
+    if kind in (FunctionKind.GENERATOR, FunctionKind.ASYNC_GENERATOR):
+        raise TypeError(f"Cannot cache results of generator function {f.__name__}")
+
+    cached = CachedFunction(f, policy)
+    wrapper: Callable[..., Any]
+
+    if kind is FunctionKind.ASYNC:
+
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            owner, key = cached.key(args, kwargs)
+            if key is None:
+                return await f(*args, **kwargs)
+
+            cache = cached.cache_for(owner)
+            assert cache is not None
+            value = cache.get(key)
+            if value is _MISSING:
+                # The cache lock is not held while awaiting
+                value = await f(*args, **kwargs)
+                cache.put(key, value)
+            return value
+
+    else:
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            owner, key = cached.key(args, kwargs)
+            if key is None:
+                return f(*args, **kwargs)
+
+            cache = cached.cache_for(owner)
+            assert cache is not None
+            value = cache.get(key)
+            if value is _MISSING:
+                value = f(*args, **kwargs)
+                cache.put(key, value)
+            return value
+
+    functools.update_wrapper(wrapper, f)
+    wrapper._cached_function = cached  # type: ignore
+    return wrapper
+
+
+def get_cache_stats(func: Callable[..., Any], owner: Any = None) -> Optional[CacheStats]:
+    """
+    Get the cache statistics of a cached plugin function.
+
+    Args:
+        func: The cached function
+        owner: The plugin instance the function belongs to, or None for plain functions
+
+    Returns:
+        The statistics, or None if the function is not cached
+    """
+    cached = getattr(func, "_cached_function", None)
+    if cached is None:
+        return None
+    cache = cached.cache_for(owner, create=False)
+    return cache.stats() if cache is not None else CacheStats()
+
+
+def clear_owner_caches(owner: Any) -> None:
+    """
+    Drop the cached results of every cached function of a plugin instance.
+
+    Called when the instance's configuration changes, since cached results may
+    depend on it.
+
+    Args:
+        owner: The plugin instance
+    """
+    for cache in owner_caches.get(id(owner), ()):
+        cache.clear()
+
+
+def clear_cache(func: Callable[..., Any], owner: Any = None) -> None:
+    """
+    Drop the cached results of a cached plugin function.
+
+    Args:
+        func: The cached function
+        owner: The plugin instance the function belongs to, or None for plain functions
+    """
+    cached = getattr(func, "_cached_function", None)
+    if cached is not None:
+        cache = cached.cache_for(owner, create=False)
+        if cache is not None:
+            cache.clear()
+
+
+__all__ = [
+    "CachePolicy",
+    "CacheStats",
+    "ResultCache",
+    "clear_cache",
+    "clear_owner_caches",
+    "get_cache_stats",
+    "make_cached",
+]
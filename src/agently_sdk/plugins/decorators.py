@@ -6,24 +6,148 @@ This module provides decorators for use in Agently plugins.
 
 import functools
 import inspect
-from typing import Any, Callable, Optional, TypeVar, Union, cast, overload
+from enum import Enum
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Generator,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+    overload,
+)
+
+if TYPE_CHECKING:
+    from agently_sdk.plugins.caching import CachePolicy
+
+
+@functools.lru_cache(maxsize=None)
+def _load_semantic_kernel() -> Tuple[Optional[Callable[..., Any]], bool]:
+    """
+    Import semantic_kernel's kernel_function on first use.
+
+    semantic_kernel is slow to import, so it is only loaded once a function is
+    actually decorated rather than when the SDK is imported.
 
-# Import the original kernel_function from semantic_kernel
-try:
-    from semantic_kernel.functions import kernel_function as sk_kernel_function
+    Returns:
+        A tuple of (kernel_function or None if semantic_kernel is not installed,
+        whether it accepts an input_description argument)
+    """
+    try:
+        from semantic_kernel.functions import kernel_function as sk_kernel_function
+    except ImportError:
+        # Fallback implementation if semantic_kernel is not installed
+        return None, False
 
     # Check what parameters sk_kernel_function accepts
     sk_params = inspect.signature(sk_kernel_function).parameters
-    SK_ACCEPTS_INPUT_DESC = "input_description" in sk_params
-except ImportError:
-    # Fallback implementation if semantic_kernel is not installed
-    sk_kernel_function = None  # type: ignore
-    SK_ACCEPTS_INPUT_DESC = False
+    return sk_kernel_function, "input_description" in sk_params
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve the semantic_kernel module attributes kept for backward compatibility."""
+    if name == "sk_kernel_function":
+        return _load_semantic_kernel()[0]
+    if name == "SK_ACCEPTS_INPUT_DESC":
+        return _load_semantic_kernel()[1]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 F = TypeVar("F", bound=Callable[..., Any])
 DecoratorFunc = Callable[[F], F]
 
 
+class FunctionKind(str, Enum):
+    """How a plugin function produces its result."""
+
+    SYNC = "sync"
+    ASYNC = "async"
+    GENERATOR = "generator"
+    ASYNC_GENERATOR = "async_generator"
+
+
+def function_kind(func: Callable[..., Any]) -> FunctionKind:
+    """
+    Get the kind of a plugin function.
+
+    Functions decorated with @agently_function carry their kind as metadata;
+    for other callables it is determined by inspection.
+
+    Args:
+        func: The function (or bound method) to check
+
+    Returns:
+        FunctionKind: The kind of the function
+    """
+    kind = getattr(func, "_function_kind", None)
+    if kind is not None:
+        return cast(FunctionKind, kind)
+    if inspect.isasyncgenfunction(func):
+        return FunctionKind.ASYNC_GENERATOR
+    if inspect.iscoroutinefunction(func):
+        return FunctionKind.ASYNC
+    if inspect.isgeneratorfunction(func):
+        return FunctionKind.GENERATOR
+    return FunctionKind.SYNC
+
+
+def _make_wrapper(f: Callable[..., Any], kind: FunctionKind) -> Callable[..., Any]:
+    """Create a wrapper around f that has the same kind as f."""
+    wrapper: Callable[..., Any]
+
+    # Keep coroutine functions and generators recognizable as such
+    if kind is FunctionKind.ASYNC:
+
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return await f(*args, **kwargs)
+
+    elif kind is FunctionKind.ASYNC_GENERATOR:
+
+        async def wrapper(*args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+            agen = f(*args, **kwargs)
+            try:
+                async for item in agen:
+                    yield item
+            finally:
+                await agen.aclose()
+
+    elif kind is FunctionKind.GENERATOR:
+
+        def wrapper(*args: Any, **kwargs: Any) -> Generator[Any, Any, Any]:
+            return (yield from f(*args, **kwargs))
+
+    else:
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return f(*args, **kwargs)
+
+    functools.update_wrapper(wrapper, f)
+    return wrapper
+
+
+def _mark(
+    func: Callable[..., Any],
+    kind: FunctionKind,
+    description: Optional[str],
+    name: Optional[str],
+    input_description: Optional[str],
+) -> None:
+    """Attach the metadata our Plugin class uses to find and describe functions."""
+    func._is_kernel_function = True  # type: ignore
+    func._is_agently_function = True  # type: ignore
+    func._description = description  # type: ignore
+    func._name = name  # type: ignore
+    func._input_description = input_description  # type: ignore
+    func._function_kind = kind  # type: ignore
+
+    # Add the __kernel_function__ attribute for compatibility with Semantic Kernel
+    setattr(func, "__kernel_function__", True)
+
+
 @overload
 def agently_function(func: F) -> F: ...
 
@@ -35,6 +159,9 @@ def agently_function(
     description: Optional[str] = None,
     name: Optional[str] = None,
     input_description: Optional[str] = None,
+    wrap: bool = False,
+    cache: Optional["CachePolicy"] = None,
+    executor: Optional[str] = None,
 ) -> DecoratorFunc: ...
 
 
@@ -44,6 +171,9 @@ def agently_function(
     description: Optional[str] = None,
     name: Optional[str] = None,
     input_description: Optional[str] = None,
+    wrap: bool = False,
+    cache: Optional["CachePolicy"] = None,
+    executor: Optional[str] = None,
 ) -> Union[F, DecoratorFunc]:
     """
     Decorator for functions that should be exposed as Agently functions.
@@ -61,11 +191,24 @@ def agently_function(
     @agently_function(description="My function")
     def my_func(): ...
 
+    By default the function is marked in place and returned as is, so calling
+    it costs nothing extra. Pass wrap=True to mark a separate wrapper instead,
+    e.g. when the same function object is exposed with different metadata.
+
+    Pass cache=CachePolicy(...) to memoize results per plugin instance, keyed on
+    the call arguments (see plugins.caching).
+
+    Pass executor="process" to run a CPU-bound sync function in a pool of
+    worker processes (see plugins.process).
+
     Args:
         func: The function to decorate (when used without arguments)
         description: The description of the function
         name: The name of the function (defaults to the function name)
         input_description: The description of the input parameter
+        wrap: Mark a wrapper around the function instead of the function itself
+        cache: Cache the function's results according to this policy
+        executor: Run the function on this executor; only "process" is supported
 
     Returns:
         The decorated function
@@ -73,22 +216,29 @@ def agently_function(
 
     def apply_our_decorator(f: F) -> F:
         """Apply our decorator logic to ensure compatibility with our Plugin class."""
+        kind = function_kind(f)
+        target: Callable[..., Any] = f
+        if executor is not None:
+            from agently_sdk.plugins.process import make_process_function
 
-        @functools.wraps(f)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            return f(*args, **kwargs)
+            target = make_process_function(f, kind, executor)
+        if cache is not None:
+            from agently_sdk.plugins.caching import make_cached
+
+            target = make_cached(target, kind, cache)
+        elif wrap and target is f:
+            target = _make_wrapper(f, kind)
 
-        # Ensure our Plugin class can find this function
-        wrapper._is_kernel_function = True  # type: ignore
-        wrapper._is_agently_function = True  # type: ignore
-        wrapper._description = description  # type: ignore
-        wrapper._name = name  # type: ignore
-        wrapper._input_description = input_description  # type: ignore
+        try:
+            _mark(target, kind, description, name, input_description)
+        except (AttributeError, TypeError):
+            # Callables that do not accept attributes (e.g. builtins) have to be wrapped
+            target = _make_wrapper(f, kind)
+            _mark(target, kind, description, name, input_description)
 
-        # Add the __kernel_function__ attribute for compatibility with Semantic Kernel
-        setattr(wrapper, "__kernel_function__", True)
+        return cast(F, target)
 
-        return cast(F, wrapper)
+    sk_kernel_function, sk_accepts_input_desc = _load_semantic_kernel()
 
     # If semantic_kernel is available, use its decorator first
     if sk_kernel_function is not None:
@@ -103,10 +253,10 @@ def agently_function(
             # First apply the SK decorator with arguments
             # Only pass parameters that SK accepts
             sk_kwargs: dict[str, Optional[str]] = {"description": description, "name": name}
-            if SK_ACCEPTS_INPUT_DESC and input_description is not None:
+            if sk_accepts_input_desc and input_description is not None:
                 sk_kwargs["input_description"] = input_description
 
-            sk_decorated = sk_kernel_function(**sk_kwargs)(inner_func)  # type: ignore
+            sk_decorated = sk_kernel_function(**sk_kwargs)(inner_func)
             # Then apply our compatibility layer
             return apply_our_decorator(cast(F, sk_decorated))
 
@@ -128,4 +278,4 @@ def agently_function(
 kernel_function = agently_function
 
 
-__all__ = ["agently_function", "kernel_function"]
+__all__ = ["FunctionKind", "agently_function", "function_kind", "kernel_function"]
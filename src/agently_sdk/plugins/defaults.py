@@ -0,0 +1,178 @@
+"""
+Lazily computed default values of plugin variables.
+
+A variable declared with ``default_factory`` has no default until one of its
+plugins reads it without a configured value. The factory is then called, its
+result validated like any configured value and kept for the variable's
+``default_scope``:
+
+- ``"process"``: one value for every plugin in the process
+- ``"class"``: one value per plugin class, so subclasses compute their own
+- ``"instance"``: one value per plugin instance
+
+Example:
+    ```python
+    class GeoPlugin(Plugin):
+        name = "geo"
+        description = "Looks up countries"
+
+        countries = PluginVariable(
+            description="Country names by ISO code",
+            default_factory=load_country_table,
+        )
+    ```
+
+Each value is computed once: threads reading the default at the same time
+wait for the first one's factory call instead of calling it again. A factory
+that raises or returns an invalid value is called again on the next read.
+"""
+
+import threading
+import weakref
+from typing import Any, Callable, Dict, MutableMapping, Optional, Type
+
+from agently_sdk.plugins.variables import PluginVariable
+
+# Lifetimes a default_factory value can be kept for
+DEFAULT_SCOPES = frozenset({"process", "class", "instance"})
+
+_UNSET = object()
+
+
+class LazyDefault:
+    """
+    The default of one variable, computed by its factory on first read.
+
+    Values are kept per scope key: None for the process scope, the plugin class
+    or the plugin instance otherwise. Class and instance keys are weakly held,
+    so caching a default does not keep a plugin alive.
+    """
+
+    __slots__ = ("variable", "factory", "scope", "_value", "_values", "_lock", "_pending")
+
+    def __init__(self, variable: PluginVariable, factory: Callable[[], Any], scope: str):
+        self.variable = variable
+        self.factory = factory
+        self.scope = scope
+        self._value: Any = _UNSET
+        self._values: MutableMapping[Any, Any] = weakref.WeakKeyDictionary()
+        self._lock = threading.RLock()
+        self._pending: set = set()
+
+    def _key(self, plugin: Any) -> Any:
+        scope = self.scope
+        if scope == "process":
+            return None
+        return type(plugin) if scope == "class" else plugin
+
+    def get(self, plugin: Any) -> Any:
+        """
+        Get the default value for a plugin, computing it on first use.
+
+        Args:
+            plugin: The plugin instance the variable is read from
+
+        Returns:
+            The default value
+
+        Raises:
+            ValueError: If the factory returns an invalid value
+            RuntimeError: If the factory reads the default it is computing
+        """
+        key = self._key(plugin)
+        value = self._value if key is None else self._values.get(key, _UNSET)
+        if value is not _UNSET:
+            return value
+
+        with self._lock:
+            value = self._value if key is None else self._values.get(key, _UNSET)
+            if value is not _UNSET:
+                return value
+            # The lock is reentrant, so a factory reading its own default gets here
+            if key in self._pending:
+                raise RuntimeError(
+                    f"Default factory of variable '{self.variable.name}' reads its own default"
+                )
+            self._pending.add(key)
+            try:
+                value = self._create()
+            finally:
+                self._pending.discard(key)
+
+            if key is None:
+                self._value = value
+            else:
+                self._values[key] = value
+        return value
+
+    def _create(self) -> Any:
+        variable = self.variable
+        value = self.factory()
+        if value is None:
+            raise ValueError(f"Default factory of variable '{variable.name}' returned None")
+        error = (variable._checker or variable.checker)(value)
+        if error is not None:
+            raise ValueError(error)
+        return value
+
+    def reset(self) -> None:
+        """Forget the computed values, so the factory runs again on the next reads."""
+        with self._lock:
+            self._value = _UNSET
+            self._values.clear()
+
+
+class LazyDefaultVariable:
+    """
+    Class-level descriptor for a variable with a default_factory.
+
+    Regular plugins get it in place of the PluginVariable, so only variables
+    with a factory pay for the check on read. Accessed from the class it
+    returns the wrapped PluginVariable, so reflection and
+    get_plugin_variables() see the same objects as for other variables.
+    """
+
+    __slots__ = ("variable",)
+
+    def __init__(self, variable: PluginVariable):
+        self.variable = variable
+
+    def __get__(self, obj: Any, objtype: Optional[Type] = None) -> Any:
+        variable = self.variable
+        if obj is None:
+            return variable
+        value = variable.__get__(obj, objtype)
+        if value is None and variable._lazy_default is not None:
+            return variable._lazy_default.get(obj)
+        return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        self.variable.__set__(obj, value)
+
+
+def lazy_default_namespace(namespace: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Wrap the variables with a factory in the namespace of a class being created.
+
+    Args:
+        namespace: The namespace of the class being created
+
+    Returns:
+        The namespace to create the class with
+    """
+    return {
+        name: (
+            LazyDefaultVariable(value)
+            if isinstance(value, PluginVariable) and value.default_factory is not None
+            else value
+        )
+        for name, value in namespace.items()
+    }
+
+
+__all__ = [
+    "DEFAULT_SCOPES",
+    "LazyDefault",
+    "LazyDefaultVariable",
+    "lazy_default_namespace",
+]
@@ -0,0 +1,262 @@
+"""
+Execution of plugin functions from asynchronous hosts.
+
+Async plugin functions are awaited directly on the event loop. Blocking ones
+are run on a thread pool so they never stall the loop; the pool can be
+configured process-wide with set_default_executor() or per plugin class
+through Plugin.blocking_executor.
+
+stream_function() delivers the chunks of generator functions as they are
+produced, buffering at most a fixed number ahead of the consumer.
+"""
+
+import contextvars
+import functools
+import threading
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+from agently_sdk.plugins.decorators import FunctionKind, function_kind
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+_default_executor: Optional["Executor"] = None
+
+# Chunks a streamed generator may produce ahead of its consumer
+DEFAULT_MAX_BUFFERED = 16
+
+# Messages from a streamed generator to its consumer
+_CHUNK = 0
+_DONE = 1
+_ERROR = 2
+
+
+def set_default_executor(executor: Optional["Executor"]) -> None:
+    """
+    Set the executor used to run blocking plugin functions.
+
+    Args:
+        executor: The executor to use, or None for the event loop's default executor
+    """
+    global _default_executor
+    _default_executor = executor
+
+
+def get_default_executor() -> Optional["Executor"]:
+    """
+    Get the executor used to run blocking plugin functions.
+
+    Returns:
+        The configured executor, or None if the event loop's default executor is used
+    """
+    return _default_executor
+
+
+async def run_blocking(
+    func: Callable[..., Any], kwargs: Dict[str, Any], executor: Optional["Executor"] = None
+) -> Any:
+    """
+    Run a blocking callable on an executor without blocking the event loop.
+
+    Context variables of the calling task are visible inside the callable.
+
+    Args:
+        func: The callable to run
+        kwargs: Keyword arguments for the callable
+        executor: The executor to use; defaults to the SDK default executor
+
+    Returns:
+        The callable's return value
+    """
+    # Imported here so plugin processes that never run async code don't load asyncio
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, **kwargs)
+    return await loop.run_in_executor(executor or _default_executor, call)
+
+
+async def invoke_function(
+    func: Callable[..., Any], kwargs: Dict[str, Any], executor: Optional["Executor"] = None
+) -> Any:
+    """
+    Call a plugin function of any kind and return its complete result.
+
+    Coroutine functions are awaited, async generators are drained into a list,
+    and sync functions and generators run on the executor (generators are
+    drained into a list there as well).
+
+    Args:
+        func: The function or bound method to call
+        kwargs: Keyword arguments for the function
+        executor: The executor for blocking functions; defaults to the SDK default executor
+
+    Returns:
+        The function's result
+    """
+    kind = function_kind(func)
+
+    if kind is FunctionKind.ASYNC:
+        return await func(**kwargs)
+
+    if kind is FunctionKind.ASYNC_GENERATOR:
+        return [item async for item in func(**kwargs)]
+
+    if kind is FunctionKind.GENERATOR:
+        return await run_blocking(lambda: list(func(**kwargs)), {}, executor)
+
+    return await run_blocking(func, kwargs, executor)
+
+
+def _finish(queue: Any) -> Callable[[Any], None]:
+    """Make a done callback telling the consumer how a stream's producer ended."""
+
+    def done(future: Any) -> None:
+        error = None if future.cancelled() else future.exception()
+        queue.put_nowait((_DONE, None) if error is None else (_ERROR, error))
+
+    return done
+
+
+async def _stream_async(
+    func: Callable[..., Any], kwargs: Dict[str, Any], max_buffered: int
+) -> AsyncIterator[Any]:
+    """Stream an async generator through a task that runs ahead of the consumer."""
+    import asyncio
+
+    queue: "asyncio.Queue[Tuple[int, Any]]" = asyncio.Queue()
+    slots = asyncio.Semaphore(max_buffered)
+
+    async def produce() -> None:
+        agen = func(**kwargs)
+        try:
+            while True:
+                await slots.acquire()
+                try:
+                    chunk = await agen.__anext__()
+                except StopAsyncIteration:
+                    return
+                queue.put_nowait((_CHUNK, chunk))
+        finally:
+            await agen.aclose()
+
+    task = asyncio.create_task(produce())
+    task.add_done_callback(_finish(queue))
+    try:
+        while True:
+            message, value = await queue.get()
+            if message == _DONE:
+                return
+            if message == _ERROR:
+                raise value
+            slots.release()
+            yield value
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def _stream_blocking(
+    func: Callable[..., Any],
+    kwargs: Dict[str, Any],
+    executor: Optional["Executor"],
+    max_buffered: int,
+) -> AsyncIterator[Any]:
+    """Stream a sync generator iterated on an executor thread."""
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    queue: "asyncio.Queue[Tuple[int, Any]]" = asyncio.Queue()
+    slots = threading.Semaphore(max_buffered)
+    stop = threading.Event()
+
+    def produce() -> None:
+        gen = func(**kwargs)
+        try:
+            while True:
+                # Blocks while max_buffered chunks are waiting for the consumer
+                slots.acquire()
+                if stop.is_set():
+                    return
+                try:
+                    chunk = next(gen)
+                except StopIteration:
+                    return
+                loop.call_soon_threadsafe(queue.put_nowait, (_CHUNK, chunk))
+        finally:
+            gen.close()
+
+    producer = asyncio.ensure_future(run_blocking(produce, {}, executor))
+    producer.add_done_callback(_finish(queue))
+    try:
+        while True:
+            message, value = await queue.get()
+            if message == _DONE:
+                return
+            if message == _ERROR:
+                raise value
+            slots.release()
+            yield value
+    finally:
+        stop.set()
+        slots.release()
+        # The generator is closed on its thread once it yields or returns
+        await asyncio.gather(producer, return_exceptions=True)
+
+
+async def _stream_result(
+    func: Callable[..., Any], kwargs: Dict[str, Any], executor: Optional["Executor"]
+) -> AsyncIterator[Any]:
+    yield await invoke_function(func, kwargs, executor)
+
+
+def stream_function(
+    func: Callable[..., Any],
+    kwargs: Dict[str, Any],
+    executor: Optional["Executor"] = None,
+    max_buffered: int = DEFAULT_MAX_BUFFERED,
+) -> AsyncIterator[Any]:
+    """
+    Call a plugin function of any kind and iterate over its result as chunks.
+
+    Generators and async generators are advanced ahead of the consumer until
+    max_buffered chunks are waiting, then paused until the consumer catches up.
+    Sync generators are iterated on the executor. Other functions produce
+    their result as a single chunk.
+
+    Closing the iterator early (with aclose(), or by cancelling the consuming
+    task) closes the generator; a sync generator is closed as soon as the
+    chunk it is producing is done.
+
+    Args:
+        func: The function or bound method to call
+        kwargs: Keyword arguments for the function
+        executor: The executor for blocking functions; defaults to the SDK default executor
+        max_buffered: Maximum number of chunks produced but not yet consumed
+
+    Returns:
+        An async iterator over the chunks of the function's result
+
+    Raises:
+        ValueError: If max_buffered is less than 1
+    """
+    if max_buffered < 1:
+        raise ValueError("max_buffered must be at least 1")
+    kind = function_kind(func)
+
+    if kind is FunctionKind.ASYNC_GENERATOR:
+        return _stream_async(func, kwargs, max_buffered)
+    if kind is FunctionKind.GENERATOR:
+        return _stream_blocking(func, kwargs, executor, max_buffered)
+    return _stream_result(func, kwargs, executor)
+
+
+__all__ = [
+    "DEFAULT_MAX_BUFFERED",
+    "get_default_executor",
+    "invoke_function",
+    "run_blocking",
+    "set_default_executor",
+    "stream_function",
+]
@@ -0,0 +1,165 @@
+"""
+Frozen plugins, whose configuration cannot change after construction.
+
+Plugins declared with ``frozen=True`` store each validated variable value
+(defaults included) as a plain instance attribute when they are created.
+The class-level descriptors of a frozen plugin do not intercept instance
+reads, so reading a variable is an ordinary attribute load.
+
+Assigning or deleting a variable, and update(), raise FrozenPluginError.
+with_overrides() is the way to get a plugin with a different configuration.
+
+Example:
+    ```python
+    class RouterPlugin(Plugin, frozen=True):
+        name = "router"
+        description = "Routes requests"
+
+        region = PluginVariable(description="Region to route to", default="us")
+
+    plugin = RouterPlugin(region="eu")
+    plugin.region  # plain attribute load
+    eu_west = plugin.with_overrides(region="eu-west")
+    ```
+
+Subclasses of a frozen plugin are always frozen. Frozen plugins cannot use
+compact storage.
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Optional, Type
+
+from agently_sdk.plugins.variables import PluginVariable
+
+if TYPE_CHECKING:
+    from agently_sdk.plugins.schema import PluginSchema
+
+
+class FrozenPluginError(AttributeError):
+    """Raised when the configuration of a frozen plugin is changed in place."""
+
+
+class FrozenVariable:
+    """
+    Class-level descriptor for a variable of a frozen plugin.
+
+    It has no __set__, so the value stored in the instance __dict__ takes
+    precedence on reads. Accessed from the class it returns the wrapped
+    PluginVariable, so reflection and get_plugin_variables() see the same
+    objects as for regular plugins.
+    """
+
+    __slots__ = ("variable", "attr")
+
+    def __init__(self, variable: PluginVariable, attr: str):
+        self.variable = variable
+        self.attr = attr
+
+    def __get__(self, obj: Any, objtype: Optional[Type] = None) -> Any:
+        if obj is None:
+            return self.variable
+        # Default not computed yet, or instance created before the variable was added
+        lazy = self.variable._lazy_default
+        if lazy is None:
+            return self.variable.default_value
+        value = lazy.get(obj)
+        obj.__dict__[self.attr] = value
+        return value
+
+
+def frozen_error(plugin: Any, name: Optional[str] = None) -> FrozenPluginError:
+    """
+    Build the error for an attempt to change a frozen plugin's configuration.
+
+    Args:
+        plugin: The frozen plugin instance
+        name: The variable that was to be changed, if a single one
+
+    Returns:
+        The error to raise
+    """
+    target = f"variable '{name}' of " if name is not None else ""
+    return FrozenPluginError(
+        f"Cannot change {target}frozen plugin {type(plugin).__name__}; "
+        "use with_overrides() to create a reconfigured copy"
+    )
+
+
+def _frozen_setattr(self: Any, name: str, value: Any) -> None:
+    if name in type(self)._frozen_attributes:
+        raise frozen_error(self, name)
+    object.__setattr__(self, name, value)
+
+
+def _frozen_delattr(self: Any, name: str) -> None:
+    if name in type(self)._frozen_attributes:
+        raise frozen_error(self, name)
+    object.__delattr__(self, name)
+
+
+def _get_values(self: Any) -> Dict[str, Any]:
+    """Variable values keyed by storage name, read from the instance attributes."""
+    cls = type(self)
+    schema = cls._plugin_schema or cls.get_plugin_schema()
+    attributes = self.__dict__
+    return {key: attributes[attr] for attr, key in schema.names.items() if attr in attributes}
+
+
+def _set_values(self: Any, values: Dict[str, Any]) -> None:
+    """Materialize every variable's value, default or given, as an instance attribute."""
+    cls = type(self)
+    schema = cls._plugin_schema or cls.get_plugin_schema()
+    names = schema.names
+    attributes = self.__dict__
+    for attr, var in schema.variables.items():
+        value = values.get(names[attr], var.default_value)
+        if value is not None or var._lazy_default is None:
+            attributes[attr] = value
+        # Defaults from a default_factory are materialized when first read
+
+
+# Installed as ``_values`` on frozen plugins so code written against the
+# dictionary storage keeps working. Only construction sets it.
+frozen_values = property(_get_values, _set_values)
+
+
+def frozen_namespace(namespace: Dict[str, Any], inherited: bool) -> Dict[str, Any]:
+    """
+    Add the members of a frozen plugin class to its namespace.
+
+    Args:
+        namespace: The namespace of the class being created
+        inherited: Whether a base class is already frozen
+
+    Returns:
+        The namespace to create the class with
+    """
+    namespace = dict(namespace)
+    namespace["_frozen_attributes"] = frozenset()
+    if not inherited:
+        namespace["_values"] = frozen_values
+        namespace.setdefault("__setattr__", _frozen_setattr)
+        namespace.setdefault("__delattr__", _frozen_delattr)
+    return namespace
+
+
+def install_frozen_variables(cls: type, schema: "PluginSchema") -> None:
+    """
+    Replace the variable descriptors of a frozen plugin class.
+
+    Args:
+        cls: The frozen plugin class
+        schema: The class schema
+    """
+    for attr, var in schema.variables.items():
+        type.__setattr__(cls, attr, FrozenVariable(var, attr))
+    type.__setattr__(cls, "_frozen_attributes", frozenset(schema.variables))
+
+
+__all__ = [
+    "FrozenPluginError",
+    "FrozenVariable",
+    "frozen_error",
+    "frozen_namespace",
+    "frozen_values",
+    "install_frozen_variables",
+]
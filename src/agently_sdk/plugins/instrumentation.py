@@ -0,0 +1,364 @@
+"""
+Call instrumentation for Agently plugin functions.
+
+Observers (such as the metrics recorder) are notified when plugin functions
+start and finish. While no observer is registered, plugin classes hold their
+functions exactly as decorated, so instrumentation costs nothing. Registering
+the first observer swaps every plugin function for an instrumented wrapper,
+and removing the last one restores the original functions.
+
+Observers cannot break the calls they observe: an exception raised by an
+observer is logged and the observer is skipped for that call.
+"""
+
+import contextvars
+import functools
+import logging
+import threading
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from agently_sdk.plugins.decorators import FunctionKind, function_kind
+from agently_sdk.plugins.schema import is_kernel_function
+
+
+class CallInfo(NamedTuple):
+    """
+    Describes one plugin function call to observers.
+
+    Attributes:
+        plugin: The name of the plugin the function belongs to
+        function: The name of the function
+        kind: The kind of the function
+        args: Positional arguments, excluding the plugin instance
+        kwargs: Keyword arguments
+    """
+
+    plugin: str
+    function: str
+    kind: FunctionKind
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+
+
+class CallObserver:
+    """
+    Base class for objects notified about plugin function calls.
+
+    start() is called before the function runs and may return any state,
+    which is passed back to end() together with the call duration in seconds
+    and the exception raised, if any.
+
+    observes() is asked first and can opt out of individual calls cheaply:
+    start() and end() are not called for the call, and if every observer opts
+    out, the call is not timed and no CallInfo is created.
+
+    An observer that opts out of a call can also leave out the calls nested in
+    it, as tracing does for traces that are not sampled: while a sync or async
+    call it opted out of runs, the context variable of skip_context holds the
+    given value, which observes() can check.
+    """
+
+    skip_context: "Optional[Tuple[contextvars.ContextVar[Any], Any]]" = None
+
+    def observes(self) -> bool:
+        return True
+
+    def start(self, call: CallInfo) -> Any:
+        return None
+
+    def end(
+        self, call: CallInfo, state: Any, duration: float, error: Optional[BaseException]
+    ) -> None:
+        pass
+
+
+_observers: Tuple[CallObserver, ...] = ()
+_lock = threading.RLock()
+
+logger = logging.getLogger(__name__)
+
+
+def _plugin_name(obj: Any) -> str:
+    name = getattr(type(obj), "name", None)
+    return name if isinstance(name, str) else type(obj).__name__
+
+
+_Marks = List[Tuple["contextvars.ContextVar[Any]", "contextvars.Token[Any]"]]
+
+
+def _start(
+    observers: Tuple[CallObserver, ...],
+    function: str,
+    kind: FunctionKind,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+) -> Tuple[Optional[CallInfo], List[Tuple[CallObserver, Any]], Optional[_Marks]]:
+    observing = []
+    marks: Optional[_Marks] = None
+    for observer in observers:
+        try:
+            if observer.observes():
+                observing.append(observer)
+                continue
+        except Exception:
+            logger.exception("Call observer %r failed in observes()", observer)
+            continue
+        skip = observer.skip_context
+        # Generators run interleaved with their caller, so they cannot mark the context
+        if skip is not None and kind in (FunctionKind.SYNC, FunctionKind.ASYNC):
+            var, value = skip
+            if var.get() is not value:
+                marks = marks or []
+                marks.append((var, var.set(value)))
+    if not observing:
+        return None, [], marks
+
+    call = CallInfo(_plugin_name(args[0]) if args else "", function, kind, args[1:], kwargs)
+    states = []
+    for observer in observing:
+        try:
+            states.append((observer, observer.start(call)))
+        except Exception:
+            logger.exception("Call observer %r failed in start()", observer)
+    return call, states, marks
+
+
+def _end(
+    call: Optional[CallInfo],
+    states: List[Tuple[CallObserver, Any]],
+    started: float,
+    error: Optional[BaseException],
+) -> None:
+    duration = time.perf_counter() - started
+    for observer, state in states:
+        try:
+            observer.end(call, state, duration, error)  # type: ignore[arg-type]
+        except Exception:
+            # The call's own result or exception takes precedence
+            logger.exception("Call observer %r failed in end()", observer)
+
+
+def _unmark(marks: _Marks) -> None:
+    for var, token in reversed(marks):
+        try:
+            var.reset(token)
+        except ValueError:
+            # Ended in a different context than it started in
+            pass
+
+
+def instrument(func: Callable[..., Any], name: str) -> Callable[..., Any]:
+    """
+    Create an instrumented wrapper around a plugin function.
+
+    The wrapper has the same kind as the function and notifies the registered
+    observers around every call. For generators the call lasts until the
+    generator is exhausted or closed.
+
+    Args:
+        func: The plugin function
+        name: The attribute name of the function
+
+    Returns:
+        The instrumented wrapper
+    """
+    kind = function_kind(func)
+    wrapper: Callable[..., Any]
+
+    if kind is FunctionKind.ASYNC:
+
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            call, states, marks = _start(_observers, name, kind, args, kwargs)
+            try:
+                if not states:
+                    return await func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    result = await func(*args, **kwargs)
+                except BaseException as e:
+                    _end(call, states, started, e)
+                    raise
+                _end(call, states, started, None)
+                return result
+            finally:
+                if marks is not None:
+                    _unmark(marks)
+
+    elif kind is FunctionKind.ASYNC_GENERATOR:
+
+        async def wrapper(*args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+            call, states, _ = _start(_observers, name, kind, args, kwargs)
+            started = time.perf_counter()
+            error: Optional[BaseException] = None
+            agen = func(*args, **kwargs)
+            try:
+                async for item in agen:
+                    yield item
+            except GeneratorExit:
+                raise
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                await agen.aclose()
+                _end(call, states, started, error)
+
+    elif kind is FunctionKind.GENERATOR:
+
+        def wrapper(*args: Any, **kwargs: Any) -> Generator[Any, Any, Any]:
+            call, states, _ = _start(_observers, name, kind, args, kwargs)
+            if not states:
+                return (yield from func(*args, **kwargs))
+            started = time.perf_counter()
+            error: Optional[BaseException] = None
+            try:
+                return (yield from func(*args, **kwargs))
+            except GeneratorExit:
+                raise
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                _end(call, states, started, error)
+
+    else:
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            call, states, marks = _start(_observers, name, kind, args, kwargs)
+            try:
+                if not states:
+                    return func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                except BaseException as e:
+                    _end(call, states, started, e)
+                    raise
+                _end(call, states, started, None)
+                return result
+            finally:
+                if marks is not None:
+                    _unmark(marks)
+
+    functools.update_wrapper(wrapper, func)
+    wrapper._instrumented_original = func  # type: ignore
+    return wrapper
+
+
+def maybe_instrument(name: str, value: Any) -> Any:
+    """
+    Instrument a value being assigned to a plugin class, if instrumentation is active.
+
+    Args:
+        name: The attribute name
+        value: The attribute value
+
+    Returns:
+        The value, or an instrumented wrapper if it is a kernel function
+    """
+    if (
+        _observers
+        and not name.startswith("_")
+        and is_kernel_function(value)
+        and not hasattr(value, "_instrumented_original")
+    ):
+        return instrument(value, name)
+    return value
+
+
+def instrument_class(cls: type) -> None:
+    """Swap the kernel functions defined on a plugin class for instrumented wrappers."""
+    for name, value in list(cls.__dict__.items()):
+        wrapped = maybe_instrument(name, value)
+        if wrapped is not value:
+            type.__setattr__(cls, name, wrapped)
+
+
+def _uninstrument_class(cls: type) -> None:
+    """Restore the original functions of a plugin class."""
+    for name, value in list(cls.__dict__.items()):
+        original = getattr(value, "_instrumented_original", None)
+        if original is not None:
+            type.__setattr__(cls, name, original)
+
+
+def _plugin_classes() -> List[type]:
+    from agently_sdk.plugins.base import Plugin
+
+    classes = []
+    pending: List[type] = [Plugin]
+    while pending:
+        cls = pending.pop()
+        classes.append(cls)
+        pending.extend(cls.__subclasses__())
+    return classes
+
+
+def _set_observers(observers: Tuple[CallObserver, ...]) -> None:
+    global _observers
+    was_active = bool(_observers)
+    _observers = observers
+    if was_active == bool(observers):
+        return
+
+    classes = _plugin_classes()
+    for cls in classes:
+        if observers:
+            instrument_class(cls)
+        else:
+            _uninstrument_class(cls)
+
+    # Schemas hold the functions, so they have to see the swap
+    classes[0]._invalidate_schema()  # type: ignore[attr-defined]
+
+
+def add_observer(observer: CallObserver) -> None:
+    """
+    Register an observer for plugin function calls.
+
+    Args:
+        observer: The observer to notify
+    """
+    with _lock:
+        if observer not in _observers:
+            _set_observers(_observers + (observer,))
+
+
+def remove_observer(observer: CallObserver) -> None:
+    """
+    Unregister an observer for plugin function calls.
+
+    Args:
+        observer: The observer to stop notifying
+    """
+    with _lock:
+        if observer in _observers:
+            _set_observers(tuple(o for o in _observers if o is not observer))
+
+
+def is_active() -> bool:
+    """Whether any observer is registered."""
+    return bool(_observers)
+
+
+__all__ = [
+    "CallInfo",
+    "CallObserver",
+    "add_observer",
+    "instrument",
+    "instrument_class",
+    "is_active",
+    "maybe_instrument",
+    "remove_observer",
+]
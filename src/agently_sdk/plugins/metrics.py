@@ -0,0 +1,310 @@
+"""
+Call metrics for Agently plugin functions.
+
+While enabled, every plugin function call is counted per plugin and function,
+together with the errors it raised and a latency histogram. Metrics are off by
+default; until enable_metrics() is called plugin functions run exactly as
+decorated (see plugins.instrumentation).
+
+Example:
+    ```python
+    from agently_sdk.plugins.metrics import enable_metrics, write_prometheus
+
+    enable_metrics()
+    plugin.greet("World")
+
+    HelloPlugin.get_metrics()["greet"].p95
+    write_prometheus("/var/lib/node_exporter/agently.prom")
+    ```
+"""
+
+import bisect
+import os
+import threading
+from dataclasses import dataclass
+from typing import IO, Any, Dict, List, Optional, Tuple, Union
+
+from agently_sdk.plugins.instrumentation import (
+    CallInfo,
+    CallObserver,
+    add_observer,
+    remove_observer,
+)
+
+# Upper bounds of the latency histogram buckets in seconds: 100µs doubling up to ~13s
+BUCKETS: Tuple[float, ...] = tuple(0.0001 * 2**i for i in range(18))
+
+
+@dataclass(frozen=True)
+class FunctionMetrics:
+    """
+    A snapshot of the metrics recorded for one plugin function.
+
+    Attributes:
+        plugin: The plugin name
+        function: The function name
+        calls: Number of completed calls
+        errors: Number of calls that raised an exception
+        total_seconds: Total time spent in the function
+        bucket_counts: Calls per latency bucket (see BUCKETS), plus one for slower calls
+    """
+
+    plugin: str
+    function: str
+    calls: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    bucket_counts: Tuple[int, ...] = (0,) * (len(BUCKETS) + 1)
+
+    @property
+    def mean(self) -> float:
+        """Mean call duration in seconds."""
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+    @property
+    def p50(self) -> float:
+        """Estimated median call duration in seconds."""
+        return self.quantile(0.5)
+
+    @property
+    def p95(self) -> float:
+        """Estimated 95th percentile call duration in seconds."""
+        return self.quantile(0.95)
+
+    @property
+    def p99(self) -> float:
+        """Estimated 99th percentile call duration in seconds."""
+        return self.quantile(0.99)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a call duration quantile from the histogram.
+
+        Durations are assumed to be spread evenly within each bucket, as
+        Prometheus' histogram_quantile() does. Quantiles falling into the
+        overflow bucket are reported as the largest bucket bound.
+
+        Args:
+            q: The quantile, between 0 and 1
+
+        Returns:
+            The estimated duration in seconds, or 0.0 if nothing was recorded
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if not self.calls:
+            return 0.0
+
+        rank = q * self.calls
+        seen = 0
+        for index, count in enumerate(self.bucket_counts):
+            if count and seen + count >= rank:
+                if index == len(BUCKETS):
+                    return BUCKETS[-1]
+                lower = BUCKETS[index - 1] if index else 0.0
+                upper = BUCKETS[index]
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return BUCKETS[-1]
+
+
+class _Recorder:
+    """Mutable counters for one plugin function."""
+
+    __slots__ = ("lock", "calls", "errors", "total", "counts")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.counts = [0] * (len(BUCKETS) + 1)
+
+    def record(self, duration: float, failed: bool) -> None:
+        index = bisect.bisect_left(BUCKETS, duration)
+        with self.lock:
+            self.calls += 1
+            self.errors += failed
+            self.total += duration
+            self.counts[index] += 1
+
+    def snapshot(self, plugin: str, function: str) -> FunctionMetrics:
+        with self.lock:
+            return FunctionMetrics(
+                plugin=plugin,
+                function=function,
+                calls=self.calls,
+                errors=self.errors,
+                total_seconds=self.total,
+                bucket_counts=tuple(self.counts),
+            )
+
+
+class MetricsObserver(CallObserver):
+    """Call observer recording counts, errors and latencies per plugin function."""
+
+    def __init__(self) -> None:
+        self._recorders: Dict[Tuple[str, str], _Recorder] = {}
+        self._lock = threading.Lock()
+
+    def end(
+        self, call: CallInfo, state: Any, duration: float, error: Optional[BaseException]
+    ) -> None:
+        key = (call.plugin, call.function)
+        recorder = self._recorders.get(key)
+        if recorder is None:
+            with self._lock:
+                recorder = self._recorders.setdefault(key, _Recorder())
+        # Cancellation and similar control flow exceptions are not errors
+        recorder.record(duration, isinstance(error, Exception))
+
+    def snapshot(self) -> Dict[Tuple[str, str], FunctionMetrics]:
+        """Get the metrics of every function called so far, keyed by (plugin, function)."""
+        with self._lock:
+            items = list(self._recorders.items())
+        return {key: recorder.snapshot(*key) for key, recorder in sorted(items)}
+
+    def reset(self) -> None:
+        """Drop all recorded metrics."""
+        with self._lock:
+            self._recorders.clear()
+
+
+_observer = MetricsObserver()
+_enabled = False
+
+
+def enable_metrics() -> None:
+    """Start recording plugin function metrics."""
+    global _enabled
+    add_observer(_observer)
+    _enabled = True
+
+
+def disable_metrics() -> None:
+    """
+    Stop recording plugin function metrics.
+
+    Plugin functions are restored to exactly the objects they were before
+    metrics were enabled. Metrics recorded so far are kept.
+    """
+    global _enabled
+    remove_observer(_observer)
+    _enabled = False
+
+
+def metrics_enabled() -> bool:
+    """Whether plugin function metrics are being recorded."""
+    return _enabled
+
+
+def reset_metrics() -> None:
+    """Drop all recorded plugin function metrics."""
+    _observer.reset()
+
+
+def get_metrics(plugin: Optional[str] = None) -> Dict[Tuple[str, str], FunctionMetrics]:
+    """
+    Get the recorded plugin function metrics.
+
+    Args:
+        plugin: Only include functions of the plugin with this name
+
+    Returns:
+        Metrics keyed by (plugin name, function name)
+    """
+    metrics = _observer.snapshot()
+    if plugin is None:
+        return metrics
+    return {key: value for key, value in metrics.items() if key[0] == plugin}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_bound(bound: float) -> str:
+    return repr(round(bound, 6))
+
+
+def format_prometheus(metrics: Optional[Dict[Tuple[str, str], FunctionMetrics]] = None) -> str:
+    """
+    Render plugin function metrics in the Prometheus text exposition format.
+
+    Args:
+        metrics: The metrics to render, defaults to everything recorded
+
+    Returns:
+        The metrics as Prometheus text
+    """
+    if metrics is None:
+        metrics = get_metrics()
+
+    calls = [
+        "# HELP agently_plugin_calls_total Plugin function calls.",
+        "# TYPE agently_plugin_calls_total counter",
+    ]
+    errors = [
+        "# HELP agently_plugin_errors_total Plugin function calls that raised an exception.",
+        "# TYPE agently_plugin_errors_total counter",
+    ]
+    durations = [
+        "# HELP agently_plugin_call_duration_seconds Plugin function call duration.",
+        "# TYPE agently_plugin_call_duration_seconds histogram",
+    ]
+
+    for (plugin, function), item in metrics.items():
+        labels = f'plugin="{_escape(plugin)}",function="{_escape(function)}"'
+        calls.append(f"agently_plugin_calls_total{{{labels}}} {item.calls}")
+        errors.append(f"agently_plugin_errors_total{{{labels}}} {item.errors}")
+
+        cumulative = 0
+        bounds: List[str] = [_format_bound(bound) for bound in BUCKETS] + ["+Inf"]
+        for bound, count in zip(bounds, item.bucket_counts):
+            cumulative += count
+            durations.append(
+                f'agently_plugin_call_duration_seconds_bucket{{{labels},le="{bound}"}} '
+                f"{cumulative}"
+            )
+        durations.append(
+            f"agently_plugin_call_duration_seconds_sum{{{labels}}} {item.total_seconds!r}"
+        )
+        durations.append(f"agently_plugin_call_duration_seconds_count{{{labels}}} {item.calls}")
+
+    return "\n".join(calls + errors + durations) + "\n"
+
+
+def write_prometheus(target: Union[str, "os.PathLike[str]", IO[str]]) -> None:
+    """
+    Write the recorded plugin function metrics in the Prometheus text format.
+
+    Files are replaced atomically, so collectors such as the node_exporter
+    textfile collector never read a partially written file.
+
+    Args:
+        target: A file path, or an open text file to write to
+    """
+    text = format_prometheus()
+    if hasattr(target, "write"):
+        target.write(text)  # type: ignore[union-attr]
+        return
+
+    path = os.fspath(target)  # type: ignore[arg-type]
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+__all__ = [
+    "BUCKETS",
+    "FunctionMetrics",
+    "MetricsObserver",
+    "disable_metrics",
+    "enable_metrics",
+    "format_prometheus",
+    "get_metrics",
+    "metrics_enabled",
+    "reset_metrics",
+    "write_prometheus",
+]
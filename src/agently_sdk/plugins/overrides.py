@@ -0,0 +1,181 @@
+"""
+Derived plugin instances that share their parent's values.
+
+Plugin.with_overrides() creates a copy of a plugin instance with a few
+variables changed. Only the overridden values are validated and stored: the
+derived instance keeps them in an OverlayValues mapping that falls back to
+the parent's values, so deriving costs O(number of overrides) no matter how
+many variables the plugin has.
+
+The shared values are a snapshot taken at derivation: the parent's own values
+become the base of an overlay too, so later changes to the parent (setting a
+variable or update()) go to its own layer and never reach derived instances.
+
+Example:
+    ```python
+    base = SearchPlugin(endpoint="https://search.internal", limit=10)
+
+    async def handle(request):
+        plugin = base.with_overrides(limit=request.tenant.limit)
+        return await plugin.ainvoke("search", query=request.query)
+    ```
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Mapping, Tuple, TypeVar, cast
+
+if TYPE_CHECKING:
+    from agently_sdk.plugins.schema import PluginSchema
+
+P = TypeVar("P")
+
+
+class OverlayValues(Mapping[str, Any]):
+    """
+    Variable values of a derived plugin: its own values over a shared base mapping.
+
+    The mapping holds all values, own and base. Setting a value only changes
+    the own values; the base is shared between instances and never written.
+    Pickling and flatten() produce a plain dict of all values.
+
+    Attributes:
+        own: The values set on this instance
+        base: The values shared with the plugin it was derived from
+    """
+
+    __slots__ = ("own", "base")
+
+    def __init__(self, own: Dict[str, Any], base: Mapping[str, Any]):
+        self.own = own
+        self.base = base
+
+    def get(self, key: str, default: Any = None) -> Any:
+        own = self.own
+        if key in own:
+            return own[key]
+        return self.base.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        own = self.own
+        if key in own:
+            return own[key]
+        return self.base[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.own[key] = value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.own or key in self.base
+
+    def __iter__(self) -> Iterator[str]:
+        own = self.own
+        yield from own
+        for key in self.base:
+            if key not in own:
+                yield key
+
+    def __len__(self) -> int:
+        own = self.own
+        return len(own) + sum(1 for key in self.base if key not in own)
+
+    def __repr__(self) -> str:
+        return f"OverlayValues({self.own!r}, base={self.base!r})"
+
+    def flatten(self) -> Dict[str, Any]:
+        """Get all values, base and own, as a plain dict."""
+        values = dict(self.base)
+        values.update(self.own)
+        return values
+
+    def updated(self, changes: Dict[str, Any]) -> "OverlayValues":
+        """Get a new overlay over the same base with some values changed."""
+        own = dict(self.own)
+        own.update(changes)
+        return OverlayValues(own, self.base)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return dict, (self.flatten(),)
+
+
+def overlay(values: Mapping[str, Any], changes: Dict[str, Any]) -> OverlayValues:
+    """
+    Layer changed values over a plugin's values without copying them.
+
+    Overlays are never nested: overriding an overlay copies its own values
+    and shares its base.
+
+    Args:
+        values: The values of the parent plugin
+        changes: The new values, keyed by storage name
+
+    Returns:
+        The values of the derived plugin
+    """
+    if isinstance(values, OverlayValues):
+        return values.updated(changes)
+    return OverlayValues(changes, values)
+
+
+def derive_plugin(plugin: P, schema: "PluginSchema", overrides: Dict[str, Any]) -> P:
+    """
+    Create a copy of a plugin instance with some variables overridden.
+
+    The copy skips __init__: other instance attributes are shared with the
+    parent like a shallow copy, and only the overridden values are validated.
+
+    Args:
+        plugin: The parent plugin instance
+        schema: The plugin class schema
+        overrides: New values keyed by variable name
+
+    Returns:
+        The derived plugin instance
+
+    Raises:
+        ValueError: If a variable is unknown or a value is invalid
+    """
+    variables = schema.variables
+    names = schema.names
+    changes: Dict[str, Any] = {}
+    for name, value in overrides.items():
+        var = variables.get(name)
+        if var is None:
+            raise ValueError(f"Unknown variable: {name}")
+        error = (var._checker or var.checker)(value)
+        if error is not None:
+            raise ValueError(error)
+        changes[names[name]] = value
+
+    parent: Any = plugin
+    cls: Any = type(parent)
+    derived = cls.__new__(cls)
+    parent_dict = getattr(parent, "__dict__", None)
+    if parent_dict:
+        derived.__dict__.update(parent_dict)
+
+    if cls._frozen:
+        # Frozen values are instance attributes, already copied with the parent's
+        attributes = derived.__dict__
+        for name, value in overrides.items():
+            attributes[name] = value
+    elif cls._compact_layout is not None:
+        # Compact values live in one tuple, replacing a few entries copies it once
+        store = list(parent._store)
+        defaults = cls._default_store
+        store.extend(defaults[len(store) :])
+        layout = cls._compact_layout
+        for key, value in changes.items():
+            store[layout[key]] = value
+        derived._store = tuple(store)
+    else:
+        values = parent._values if hasattr(parent, "_values") else {}
+        if not isinstance(values, OverlayValues):
+            # Share the parent's values as they are now: from here on the parent
+            # writes to a layer of its own, like the derived instance
+            values = OverlayValues({}, values)
+            parent._values = values
+        # Even without overrides, writes to the derived instance must not reach the parent
+        derived._values = values.updated(changes)
+    return cast(P, derived)
+
+
+__all__ = ["OverlayValues", "derive_plugin", "overlay"]
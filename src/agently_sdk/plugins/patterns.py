@@ -0,0 +1,588 @@
+"""
+Bounded-cost matching of validation patterns.
+
+Python's re module backtracks, so a pattern such as ``(a+)+$`` takes time
+exponential in the length of a value that almost matches it. Patterns of a
+VariableValidation can opt into one of two bounded modes:
+
+- "safe" rejects patterns with constructs that backtrack exponentially and
+  keeps matching with re. Rejected are repeats of a group that contains a
+  variable repeat able to match the characters the next iteration starts
+  with (``(a+)+``, ``(\\w+\\s?)*``), repeated alternatives that can start
+  with the same character (``(a|ab)*``), and backreferences.
+- "linear" matches with a finite automaton, so the cost is linear in the
+  length of the value for every pattern it accepts. It supports the regular
+  subset of the syntax: literals, character classes, ".", groups,
+  alternation, repeats and the anchors ``^ $ \\A \\Z \\b \\B``, with the
+  flags IGNORECASE, MULTILINE, DOTALL, VERBOSE and ASCII. Backreferences,
+  lookarounds, conditionals, atomic groups and possessive repeats are
+  rejected.
+
+Both modes refuse values longer than a maximum length, which also bounds
+the polynomial cost that remains in "safe" mode (e.g. for ``\\w+\\w+$``).
+
+Example:
+    ```python
+    from agently_sdk.plugins.patterns import LinearPattern, check_pattern
+
+    check_pattern(r"^[a-z]+(-[a-z]+)*$")  # passes
+    check_pattern(r"^(a+)+$")  # raises PatternSafetyError
+
+    LinearPattern(r"^(a+)+$").match("a" * 10_000 + "!")  # False, in linear time
+    ```
+"""
+
+import re
+from re import _compiler  # type: ignore[attr-defined]
+from re import _parser  # type: ignore[attr-defined]
+from re import _constants as sre  # type: ignore[attr-defined]
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
+
+# Pattern modes accepted by VariableValidation(pattern_mode=...)
+PATTERN_MODES = frozenset({"safe", "linear"})
+
+# Longest value matched against a pattern in the bounded modes, unless configured
+DEFAULT_MAX_LENGTH = 4096
+
+# Largest automaton a linear pattern may compile to, after expanding counted repeats
+MAX_PROGRAM_SIZE = 10_000
+
+# Automaton transitions a linear pattern remembers
+TRANSITION_CACHE_SIZE = 4096
+
+CharTest = Callable[[str], bool]
+
+_REPEATS = (sre.MAX_REPEAT, sre.MIN_REPEAT, sre.POSSESSIVE_REPEAT)
+_CHARACTERS = (sre.LITERAL, sre.NOT_LITERAL, sre.ANY, sre.IN)
+
+# Characters besides those of the pattern used to tell whether two character sets overlap
+_SAMPLES = "".join(chr(code) for code in range(256)) + "Δж٣ K中"
+
+_ASCII_SPACE = frozenset(" \t\n\r\f\v")
+
+# Whether \B matches the empty string, which changed between Python versions
+_EMPTY_NON_BOUNDARY = re.search(r"\B", "") is not None
+
+# Automaton instructions, stored as [opcode, argument, argument]
+_CHAR = 0
+_SPLIT = 1
+_JUMP = 2
+_ASSERT = 3
+_MATCH = 4
+
+
+class PatternSafetyError(ValueError):
+    """Raised when a pattern cannot be matched at a bounded cost in the requested mode."""
+
+
+def _ascii_word(ch: str) -> bool:
+    return ch.isascii() and (ch.isalnum() or ch == "_")
+
+
+def _unicode_word(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _category(category: Any, flags: int) -> CharTest:
+    """Make the test for a character category such as \\d or \\W."""
+    ascii_only = flags & re.ASCII
+    test: CharTest
+    if category in (sre.CATEGORY_DIGIT, sre.CATEGORY_NOT_DIGIT):
+        test = (lambda ch: "0" <= ch <= "9") if ascii_only else str.isdecimal
+    elif category in (sre.CATEGORY_SPACE, sre.CATEGORY_NOT_SPACE):
+        test = _ASCII_SPACE.__contains__ if ascii_only else str.isspace
+    elif category in (sre.CATEGORY_WORD, sre.CATEGORY_NOT_WORD):
+        test = _ascii_word if ascii_only else _unicode_word
+    else:
+        raise PatternSafetyError(f"Unsupported character category: {category}")
+
+    if category in (sre.CATEGORY_NOT_DIGIT, sre.CATEGORY_NOT_SPACE, sre.CATEGORY_NOT_WORD):
+        positive = test
+        return lambda ch: not positive(ch)
+    return test
+
+
+def _class_test(items: Sequence[Tuple[Any, Any]], flags: int) -> CharTest:
+    """Make the test for a character class such as [^a-z\\d]."""
+    negate = False
+    chars = set()
+    ranges = []
+    categories = []
+    for op, av in items:
+        if op == sre.NEGATE:
+            negate = True
+        elif op == sre.LITERAL:
+            chars.add(chr(av))
+        elif op == sre.RANGE:
+            ranges.append((chr(av[0]), chr(av[1])))
+        elif op == sre.CATEGORY:
+            categories.append(_category(av, flags))
+        else:
+            raise PatternSafetyError(f"Unsupported character class item: {op}")
+
+    members = frozenset(chars)
+
+    def test(ch: str) -> bool:
+        found = (
+            ch in members
+            or any(low <= ch <= high for low, high in ranges)
+            or any(category(ch) for category in categories)
+        )
+        return found != negate
+
+    return test
+
+
+def _char_test(op: Any, av: Any, flags: int) -> CharTest:
+    """Make the test for an item of a pattern that matches a single character."""
+    if flags & re.IGNORECASE and op != sre.ANY:
+        return _folded_test(op, av, flags)
+
+    if op == sre.LITERAL:
+        return chr(av).__eq__
+    if op == sre.NOT_LITERAL:
+        return chr(av).__ne__
+    if op == sre.ANY:
+        return (lambda ch: True) if flags & re.DOTALL else "\n".__ne__
+    return _class_test(av, flags)
+
+
+def _folded_test(op: Any, av: Any, flags: int) -> CharTest:
+    """
+    Make the test for a single character item under IGNORECASE.
+
+    re folds the character before testing it against a literal or class and
+    only then applies a negation, with case mappings of its own, so the item
+    is compiled by re itself to match exactly the characters re matches.
+    """
+    state = _parser.State()
+    state.flags = flags
+    compiled = _compiler.compile(_parser.SubPattern(state, [(op, av)]), flags)
+    fullmatch = compiled.fullmatch
+    return lambda ch: fullmatch(ch) is not None
+
+
+def _group_flags(flags: int, av: Tuple[Any, int, int, Any]) -> int:
+    """Flags inside a group, e.g. (?i:...)."""
+    _, add_flags, del_flags, _ = av
+    return (flags | add_flags) & ~del_flags
+
+
+def _parse(pattern: Union[str, "re.Pattern[str]"], flags: int) -> Tuple[Any, int, str]:
+    """Parse a pattern into sre items, its effective flags and its source."""
+    if isinstance(pattern, re.Pattern):
+        flags |= pattern.flags
+        pattern = pattern.pattern
+    if not isinstance(pattern, str):
+        raise TypeError("Bounded pattern modes only support str patterns")
+    parsed = _parser.parse(pattern, flags)
+    return parsed, parsed.state.flags, pattern
+
+
+class _Analysis:
+    """Static detection of constructs that backtrack exponentially."""
+
+    def __init__(self, source: str, flags: int) -> None:
+        self.source = source
+        self.flags = flags
+        self.alphabet = _SAMPLES + "".join(sorted(set(source) - set(_SAMPLES)))
+
+    def nullable(self, items: Sequence[Tuple[Any, Any]]) -> bool:
+        """Whether a sequence of items can match the empty string."""
+        for op, av in items:
+            if op in _CHARACTERS:
+                return False
+            if op == sre.SUBPATTERN and not self.nullable(av[3]):
+                return False
+            if op == sre.ATOMIC_GROUP and not self.nullable(av):
+                return False
+            if op == sre.BRANCH and not any(self.nullable(alt) for alt in av[1]):
+                return False
+            if op in _REPEATS and av[0] > 0 and not self.nullable(av[2]):
+                return False
+        return True
+
+    def first(self, items: Sequence[Tuple[Any, Any]], flags: int) -> FrozenSet[str]:
+        """The characters a sequence of items can start with, among the alphabet."""
+        chars: FrozenSet[str] = frozenset()
+        for op, av in items:
+            if op in _CHARACTERS:
+                test = _char_test(op, av, flags)
+                return chars | frozenset(filter(test, self.alphabet))
+            if op == sre.SUBPATTERN:
+                chars |= self.first(av[3], _group_flags(flags, av))
+            elif op == sre.ATOMIC_GROUP:
+                chars |= self.first(av, flags)
+            elif op == sre.BRANCH:
+                for alt in av[1]:
+                    chars |= self.first(alt, flags)
+            elif op in _REPEATS and av[1] > 0:
+                chars |= self.first(av[2], flags)
+            if not self.nullable([(op, av)]):
+                break
+        return chars
+
+    def reject(self, reason: str) -> PatternSafetyError:
+        return PatternSafetyError(
+            f"Pattern {self.source!r} can backtrack catastrophically: {reason}"
+        )
+
+    def check(
+        self,
+        items: Sequence[Tuple[Any, Any]],
+        flags: int,
+        follow: FrozenSet[str],
+        repeated: bool,
+    ) -> None:
+        """
+        Check a sequence of items.
+
+        Args:
+            items: The items to check
+            flags: The flags in effect
+            follow: The characters that can come right after the sequence
+            repeated: Whether the sequence is inside a repeat that can run more than once
+        """
+        for index, (op, av) in enumerate(items):
+            rest = items[index + 1 :]
+            after = self.first(rest, flags)
+            if self.nullable(rest):
+                after |= follow
+
+            if op in (sre.GROUPREF, sre.GROUPREF_EXISTS):
+                raise self.reject("backreferences are not allowed")
+            if op == sre.SUBPATTERN:
+                self.check(av[3], _group_flags(flags, av), after, repeated)
+            elif op == sre.ATOMIC_GROUP:
+                # The group never gives back what it matched, so the repeat it is in cannot split it
+                self.check(av, flags, after, False)
+            elif op in (sre.ASSERT, sre.ASSERT_NOT):
+                self.check(av[1], flags, frozenset(), False)
+            elif op == sre.BRANCH:
+                alternatives = av[1]
+                if repeated:
+                    # The parser factors out common prefixes, so (a|aa)* arrives as (a(|a))*
+                    alternative_starts = [
+                        self.first(alt, flags) | (after if self.nullable(alt) else frozenset())
+                        for alt in alternatives
+                    ]
+                    for i, chars in enumerate(alternative_starts):
+                        if any(chars & other for other in alternative_starts[i + 1 :]):
+                            raise self.reject(
+                                "a repeated alternation has alternatives that start alike"
+                            )
+                for alt in alternatives:
+                    self.check(alt, flags, after, repeated)
+            elif op in _REPEATS:
+                low, high, body = av
+                starts = self.first(body, flags)
+                if repeated and op != sre.POSSESSIVE_REPEAT and high != low and starts & after:
+                    raise self.reject("a repeat inside a repeated group can match what follows it")
+                if high > 1:
+                    # The end of one iteration can be followed by the start of the next
+                    self.check(body, flags, starts | after, True)
+                else:
+                    self.check(body, flags, after, repeated)
+
+
+def check_pattern(pattern: Union[str, "re.Pattern[str]"], flags: int = 0) -> None:
+    """
+    Check that a pattern cannot backtrack catastrophically.
+
+    The check is conservative: it may reject patterns that happen to run fast,
+    but the patterns it accepts need at most polynomial time in the value length.
+
+    Args:
+        pattern: The regular expression, as a string or compiled pattern
+        flags: re flags for string patterns
+
+    Raises:
+        PatternSafetyError: If the pattern contains a construct that backtracks exponentially
+        re.error: If the pattern is not a valid regular expression
+    """
+    parsed, flags, source = _parse(pattern, flags)
+    _Analysis(source, flags).check(list(parsed), flags, frozenset(), False)
+
+
+class _Compiler:
+    """Translation of sre items into automaton instructions."""
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.program: List[List[Any]] = []
+        # Zero-width assertions, tested once per position of the value
+        self.tests: List[Callable[[str, int], bool]] = []
+        self.test_keys: Dict[Tuple[Any, ...], int] = {}
+
+    def emit(self, op: int, a: Any = None, b: Any = None) -> List[Any]:
+        if len(self.program) >= MAX_PROGRAM_SIZE:
+            raise PatternSafetyError(f"Pattern {self.source!r} is too large for linear matching")
+        instruction = [op, a, b]
+        self.program.append(instruction)
+        return instruction
+
+    def unsupported(self, construct: str) -> PatternSafetyError:
+        return PatternSafetyError(
+            f"Pattern {self.source!r} uses {construct}, which linear matching does not support"
+        )
+
+    def sequence(self, items: Sequence[Tuple[Any, Any]], flags: int) -> None:
+        for op, av in items:
+            self.item(op, av, flags)
+
+    def item(self, op: Any, av: Any, flags: int) -> None:
+        if op in _CHARACTERS:
+            self.emit(_CHAR, _char_test(op, av, flags))
+        elif op == sre.SUBPATTERN:
+            self.sequence(av[3], _group_flags(flags, av))
+        elif op == sre.BRANCH:
+            self.branch(av[1], flags)
+        elif op in (sre.MAX_REPEAT, sre.MIN_REPEAT):
+            self.repeat(av, flags)
+        elif op == sre.AT:
+            self.emit(_ASSERT, self.assertion(av, flags))
+        elif op in (sre.GROUPREF, sre.GROUPREF_EXISTS):
+            raise self.unsupported("backreferences")
+        elif op in (sre.ASSERT, sre.ASSERT_NOT):
+            raise self.unsupported("lookarounds")
+        elif op in (sre.ATOMIC_GROUP, sre.POSSESSIVE_REPEAT):
+            raise self.unsupported("atomic groups or possessive repeats")
+        else:
+            raise self.unsupported(str(op))
+
+    def branch(self, alternatives: Sequence[Any], flags: int) -> None:
+        exits = []
+        for alt in alternatives[:-1]:
+            split = self.emit(_SPLIT, len(self.program) + 1)
+            self.sequence(alt, flags)
+            exits.append(self.emit(_JUMP))
+            split[2] = len(self.program)
+        self.sequence(alternatives[-1], flags)
+        for jump in exits:
+            jump[1] = len(self.program)
+
+    def repeat(self, av: Tuple[int, int, Any], flags: int) -> None:
+        low, high, body = av
+        for _ in range(low):
+            self.sequence(body, flags)
+        if high == sre.MAXREPEAT:
+            start = len(self.program)
+            split = self.emit(_SPLIT, start + 1)
+            self.sequence(body, flags)
+            self.emit(_JUMP, start)
+            split[2] = len(self.program)
+            return
+        splits = []
+        for _ in range(high - low):
+            splits.append(self.emit(_SPLIT, len(self.program) + 1))
+            self.sequence(body, flags)
+        for split in splits:
+            split[2] = len(self.program)
+
+    def assertion(self, at: Any, flags: int) -> int:
+        """Register a zero-width assertion and return its index."""
+        multiline = bool(flags & re.MULTILINE)
+        word = _ascii_word if flags & re.ASCII else _unicode_word
+        test: Callable[[str, int], bool]
+        if at == sre.AT_BEGINNING_STRING or (at == sre.AT_BEGINNING and not multiline):
+            key: Tuple[Any, ...] = ("start",)
+            test = lambda s, i: i == 0  # noqa: E731
+        elif at == sre.AT_BEGINNING:
+            key = ("line start",)
+            test = lambda s, i: i == 0 or s[i - 1] == "\n"  # noqa: E731
+        elif at == sre.AT_END_STRING:
+            key = ("end",)
+            test = lambda s, i: i == len(s)  # noqa: E731
+        elif at == sre.AT_END and not multiline:
+            key = ("end or final newline",)
+            test = lambda s, i: i == len(s) or (i == len(s) - 1 and s[i] == "\n")  # noqa: E731
+        elif at == sre.AT_END:
+            key = ("line end",)
+            test = lambda s, i: i == len(s) or s[i] == "\n"  # noqa: E731
+        elif at in (sre.AT_BOUNDARY, sre.AT_NON_BOUNDARY):
+            boundary: bool = at == sre.AT_BOUNDARY
+            key = ("boundary", boundary, word)
+
+            def test(s: str, i: int) -> bool:
+                if not s:
+                    return not boundary and _EMPTY_NON_BOUNDARY
+                before = i > 0 and word(s[i - 1])
+                after = i < len(s) and word(s[i])
+                return (before != after) == boundary
+
+        else:
+            raise self.unsupported(str(at))
+
+        index = self.test_keys.get(key)
+        if index is None:
+            index = self.test_keys[key] = len(self.tests)
+            self.tests.append(test)
+        return index
+
+
+# A set of automaton positions waiting for a character, and whether a match was reached
+_State = Tuple[FrozenSet[int], bool]
+
+# Transition whose result depends on the assertions around the position it leads to
+_CONTEXTUAL: _State = (frozenset(), False)
+
+
+class LinearPattern:
+    """
+    A pattern matched in time linear in the length of the value.
+
+    The pattern is compiled to a nondeterministic automaton that is simulated
+    over the value, tracking every way the pattern can continue at once
+    instead of trying them one after the other. Transitions between sets of
+    automaton positions are cached, so values with a repeating structure
+    cost little more than a dictionary lookup per character.
+
+    Like re.match(), match() looks for a match at the start of the value.
+
+    Args:
+        pattern: The regular expression, as a string or compiled pattern
+        flags: re flags for string patterns
+
+    Raises:
+        PatternSafetyError: If the pattern uses syntax outside the supported subset
+        re.error: If the pattern is not a valid regular expression
+    """
+
+    def __init__(self, pattern: Union[str, "re.Pattern[str]"], flags: int = 0) -> None:
+        parsed, self.flags, self.pattern = _parse(pattern, flags)
+        compiler = _Compiler(self.pattern)
+        compiler.sequence(list(parsed), self.flags)
+        compiler.emit(_MATCH)
+        self._program = [tuple(instruction) for instruction in compiler.program]
+        self._tests = tuple(compiler.tests)
+        self._starts: Dict[Tuple[bool, ...], _State] = {}
+        self._transitions: Dict[Tuple[Any, ...], _State] = {}
+
+    def __repr__(self) -> str:
+        return f"LinearPattern({self.pattern!r})"
+
+    def _context(self, value: str, index: int) -> Tuple[bool, ...]:
+        return tuple(test(value, index) for test in self._tests)
+
+    def _closure(self, positions: Any, context: Optional[Tuple[bool, ...]]) -> Optional[_State]:
+        """
+        Follow the instructions that consume no character from some positions.
+
+        Returns None if an assertion was reached while no context was given.
+        """
+        program = self._program
+        stack = list(positions)
+        seen = set()
+        waiting = []
+        matched = False
+        while stack:
+            pc = stack.pop()
+            if pc in seen:
+                continue
+            seen.add(pc)
+            op, a, b = program[pc]
+            if op == _CHAR:
+                waiting.append(pc)
+            elif op == _SPLIT:
+                stack.append(b)
+                stack.append(a)
+            elif op == _JUMP:
+                stack.append(a)
+            elif op == _ASSERT:
+                if context is None:
+                    return None
+                if context[a]:
+                    stack.append(pc + 1)
+            else:
+                matched = True
+        return frozenset(waiting), matched
+
+    def _step(
+        self, positions: FrozenSet[int], ch: str, context: Optional[Tuple[bool, ...]]
+    ) -> Optional[_State]:
+        program = self._program
+        advanced = [pc + 1 for pc in positions if program[pc][1](ch)]
+        return self._closure(advanced, context)
+
+    def _remember(self, key: Tuple[Any, ...], state: _State) -> None:
+        transitions = self._transitions
+        if len(transitions) >= TRANSITION_CACHE_SIZE:
+            transitions.clear()
+        transitions[key] = state
+
+    def match(self, value: str) -> bool:
+        """
+        Check whether the start of a value matches the pattern.
+
+        Args:
+            value: The string to match
+
+        Returns:
+            Whether a prefix of the value (possibly all of it) matches the pattern
+        """
+        context = self._context(value, 0)
+        state = self._starts.get(context)
+        if state is None:
+            state = self._starts[context] = self._closure((0,), context)  # type: ignore[assignment]
+        positions, matched = state  # type: ignore[misc]
+
+        transitions = self._transitions
+        last = len(value) - 1
+        for index, ch in enumerate(value, 1):
+            if matched:
+                return True
+            if not positions:
+                return False
+            key = (positions, ch)
+            state = transitions.get(key)
+            if state is None:
+                state = self._step(positions, ch, None) or _CONTEXTUAL
+                self._remember(key, state)
+            if state is _CONTEXTUAL:
+                # Past the first character, assertions only depend on the characters
+                # around the position and on whether it is the last one
+                following = value[index] if index <= last else None
+                context_key = (positions, ch, following, index == last)
+                state = transitions.get(context_key)
+                if state is None:
+                    state = self._step(positions, ch, self._context(value, index))
+                    self._remember(context_key, state)  # type: ignore[arg-type]
+            positions, matched = state  # type: ignore[misc]
+        return matched
+
+
+def compile_pattern(
+    pattern: Union[str, "re.Pattern[str]"], mode: Optional[str] = None
+) -> Callable[[str], Any]:
+    """
+    Compile a validation pattern for a pattern mode.
+
+    Args:
+        pattern: The regular expression, as a string or compiled pattern
+        mode: None for plain re matching, or one of PATTERN_MODES
+
+    Returns:
+        A function taking a string and returning a truthy value if its start matches
+
+    Raises:
+        ValueError: If the mode is unknown
+        PatternSafetyError: If the pattern cannot be matched at a bounded cost in the mode
+    """
+    if mode is None:
+        return (re.compile(pattern) if isinstance(pattern, str) else pattern).match
+    if mode == "safe":
+        check_pattern(pattern)
+        return (re.compile(pattern) if isinstance(pattern, str) else pattern).match
+    if mode == "linear":
+        return LinearPattern(pattern).match
+    raise ValueError(f"Unknown pattern mode: {mode!r}, expected one of {sorted(PATTERN_MODES)}")
+
+
+__all__ = [
+    "DEFAULT_MAX_LENGTH",
+    "PATTERN_MODES",
+    "LinearPattern",
+    "PatternSafetyError",
+    "check_pattern",
+    "compile_pattern",
+]
@@ -0,0 +1,273 @@
+"""
+Process-pool execution for CPU-bound plugin functions.
+
+Functions decorated with ``@agently_function(executor="process")`` run in a
+shared pool of worker processes, so pure Python number crunching does not
+hold the GIL of the process hosting the agents.
+
+The plugin instance is not pickled. Each call sends the plugin class (by
+reference) and its validated variable values; a worker rebuilds the instance
+from those values once and keeps it for later calls with the same
+configuration. Plugin classes and functions must therefore be importable by
+the workers, i.e. defined at module level.
+
+Only the variable values travel: a plugin with the default ``__init__`` is
+rebuilt without any other instance attributes, and one with a custom
+``__init__`` gets exactly what that ``__init__`` sets up from the values.
+Attributes assigned to the instance later are not seen by the worker.
+
+Example:
+    ```python
+    from agently_sdk.plugins.process import configure_process_pool
+
+    class ParserPlugin(Plugin):
+        name = "parser"
+        description = "Parses large documents"
+
+        @agently_function(executor="process")
+        def parse(self, text: str) -> dict:
+            ...
+
+    configure_process_pool(max_workers=4, max_calls_per_worker=1000)
+    ```
+"""
+
+import functools
+import importlib
+import inspect
+import pickle
+import threading
+import weakref
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, MutableMapping, Optional, Tuple, Type
+
+from agently_sdk.plugins.decorators import FunctionKind
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+    from agently_sdk.plugins.base import Plugin
+
+# Executor names accepted by agently_function(executor=...)
+EXECUTORS = frozenset({"process"})
+
+# Plugin instances a worker keeps, one per distinct configuration
+WORKER_CACHE_SIZE = 64
+
+_pool: Optional["ProcessPoolExecutor"] = None
+_pool_options: Dict[str, Any] = {}
+_pool_lock = threading.Lock()
+
+# Worker process state
+_worker_plugins: "OrderedDict[Tuple[type, bytes], Plugin]" = OrderedDict()
+
+
+def configure_process_pool(
+    max_workers: Optional[int] = None,
+    max_calls_per_worker: Optional[int] = None,
+    mp_context: Optional[str] = None,
+) -> None:
+    """
+    Configure the worker pool used by process-executed plugin functions.
+
+    A running pool is shut down (after finishing its pending calls) and
+    replaced on the next call.
+
+    Args:
+        max_workers: Number of worker processes, defaults to the number of CPUs
+        max_calls_per_worker: Replace a worker after it has handled this many calls;
+            the pool then starts workers with "spawn" unless mp_context is given
+        mp_context: The multiprocessing start method ("spawn", "forkserver" or "fork")
+
+    Raises:
+        ValueError: If max_workers or max_calls_per_worker is not a positive integer,
+            mp_context is not a start method available on this platform, or
+            max_calls_per_worker is combined with the "fork" start method
+    """
+    import multiprocessing
+
+    global _pool_options
+    _check_count("max_workers", max_workers)
+    _check_count("max_calls_per_worker", max_calls_per_worker)
+    if mp_context is not None:
+        methods = multiprocessing.get_all_start_methods()
+        if mp_context not in methods:
+            raise ValueError(
+                f"Unknown start method {mp_context!r}, expected one of {', '.join(methods)}"
+            )
+        if mp_context == "fork" and max_calls_per_worker is not None:
+            # ProcessPoolExecutor cannot replace workers of a forking pool
+            raise ValueError("max_calls_per_worker cannot be used with the 'fork' start method")
+
+    shutdown_process_pool()
+    with _pool_lock:
+        _pool_options = {
+            "max_workers": max_workers,
+            "max_calls_per_worker": max_calls_per_worker,
+            "mp_context": mp_context,
+        }
+
+
+def _check_count(name: str, value: Optional[int]) -> None:
+    if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 1):
+        raise ValueError(f"{name} must be a positive integer, got {value!r}")
+
+
+def get_process_pool() -> "ProcessPoolExecutor":
+    """Get the worker pool, starting it on first use."""
+    global _pool
+    pool = _pool
+    if pool is not None:
+        return pool
+
+    with _pool_lock:
+        if _pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            method = _pool_options.get("mp_context")
+            _pool = ProcessPoolExecutor(
+                max_workers=_pool_options.get("max_workers"),
+                mp_context=multiprocessing.get_context(method) if method else None,
+                max_tasks_per_child=_pool_options.get("max_calls_per_worker"),
+            )
+        return _pool
+
+
+def shutdown_process_pool(wait: bool = True) -> None:
+    """
+    Shut down the worker pool. It is restarted on the next call.
+
+    Args:
+        wait: Wait for pending calls to finish
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
+
+def _build_plugin(cls: Type["Plugin"], values: Dict[str, Any]) -> "Plugin":
+    """Rebuild a plugin instance from its validated values."""
+    from agently_sdk.plugins.base import Plugin
+
+    if cls.__init__ is Plugin.__init__:
+        # The values were validated when the original instance was configured
+        plugin = cls.__new__(cls)
+        plugin._values = dict(values)
+        return plugin
+
+    schema = cls.get_plugin_schema()
+    attributes = {key: attr for attr, key in schema.names.items()}
+    kwargs = {attributes.get(key, key): value for key, value in values.items()}
+    return cls(**kwargs)
+
+
+def _worker_plugin(cls: Type["Plugin"], config: bytes) -> "Plugin":
+    key = (cls, config)
+    plugin = _worker_plugins.get(key)
+    if plugin is None:
+        plugin = _build_plugin(cls, pickle.loads(config))
+        _worker_plugins[key] = plugin
+        if len(_worker_plugins) > WORKER_CACHE_SIZE:
+            _worker_plugins.popitem(last=False)
+    else:
+        _worker_plugins.move_to_end(key)
+    return plugin
+
+
+def _resolve(module: str, qualname: str) -> Any:
+    obj: Any = importlib.import_module(module)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+def _find_attribute(cls: type, f: Callable[..., Any]) -> Tuple[type, str]:
+    """Find the class and attribute name a process function is stored under."""
+    for klass in cls.__mro__:
+        for attribute, value in vars(klass).items():
+            if getattr(value, "_process_target", None) is f:
+                return klass, attribute
+    raise TypeError(f"{f.__qualname__} is not a function of {cls.__qualname__}")
+
+
+def _run_method(
+    cls: Type["Plugin"],
+    owner: type,
+    attribute: str,
+    config: bytes,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+) -> Any:
+    """Worker entry point for plugin methods."""
+    plugin = _worker_plugin(cls, config)
+    target = vars(owner)[attribute]._process_target
+    return target(plugin, *args, **kwargs)
+
+
+def _run_function(module: str, qualname: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+    """Worker entry point for plain functions."""
+    return _resolve(module, qualname)._process_target(*args, **kwargs)
+
+
+def make_process_function(
+    f: Callable[..., Any], kind: FunctionKind, executor: str
+) -> Callable[..., Any]:
+    """
+    Wrap a plugin function so that it runs in the worker pool.
+
+    Args:
+        f: The function to wrap
+        kind: The kind of the function
+        executor: The executor name, currently only "process"
+
+    Returns:
+        A sync wrapper that submits the call to the pool and waits for the result
+
+    Raises:
+        ValueError: If the executor name is unknown
+        TypeError: If f is not a sync function
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor: {executor}")
+    if kind is not FunctionKind.SYNC:
+        raise TypeError(f"Only sync functions can run in a process pool: {f.__name__}")
+
+    module = f.__module__
+    qualname = f.__qualname__
+    params = list(inspect.signature(f).parameters)
+    is_method = bool(params) and params[0] == "self"
+    # Where the function is stored, per plugin class: the function's own name can
+    # differ from the attribute (aliases) and subclasses can override it
+    locations: MutableMapping[type, Tuple[type, str]] = weakref.WeakKeyDictionary()
+
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if is_method:
+            plugin = args[0]
+            cls = type(plugin)
+            location = locations.get(cls)
+            if location is None:
+                location = locations[cls] = _find_attribute(cls, f)
+            # Values of derived plugins (see with_overrides) pickle as a plain dict
+            config = pickle.dumps(plugin._values, protocol=pickle.HIGHEST_PROTOCOL)
+            future = get_process_pool().submit(
+                _run_method, cls, *location, config, args[1:], kwargs
+            )
+        else:
+            future = get_process_pool().submit(_run_function, module, qualname, args, kwargs)
+        return future.result()
+
+    functools.update_wrapper(wrapper, f)
+    wrapper._process_target = f  # type: ignore
+    return wrapper
+
+
+__all__ = [
+    "EXECUTORS",
+    "configure_process_pool",
+    "get_process_pool",
+    "make_process_function",
+    "shutdown_process_pool",
+]
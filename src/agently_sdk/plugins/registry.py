@@ -0,0 +1,346 @@
+"""
+Plugin registry backed by package entry points.
+
+Packages make their plugins discoverable by declaring entry points in the
+``agently.plugins`` group, mapping a plugin name to the plugin class:
+
+    ```toml
+    [project.entry-points."agently.plugins"]
+    weather = "weather_plugin.plugin:WeatherPlugin"
+    ```
+
+The registry indexes these entry points without importing anything. A
+plugin's module is imported the first time that plugin is requested with
+get(), and listing plugins reads their name, description and function names
+from the module source instead of importing it.
+
+Example:
+    ```python
+    from agently_sdk.plugins.registry import get_registry
+
+    registry = get_registry()
+    for info in registry.list():
+        print(info.name, info.description, info.functions)
+
+    WeatherPlugin = registry.get("weather")
+    ```
+"""
+
+import ast
+import importlib
+import importlib.machinery
+import sys
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Type
+
+if TYPE_CHECKING:
+    from agently_sdk.plugins.base import Plugin
+
+# Entry point group plugins are registered under
+ENTRY_POINT_GROUP = "agently.plugins"
+
+# Decorators marking plugin functions, as written in plugin sources
+_FUNCTION_DECORATORS = frozenset({"agently_function", "kernel_function"})
+
+
+@dataclass(frozen=True)
+class PluginInfo:
+    """
+    What the registry knows about a plugin without importing it.
+
+    Attributes:
+        name: The name the plugin is registered under
+        target: The plugin class as "module:Class"
+        description: The class's description, if it could be read from the source
+        functions: Names of the class's functions, as read from the source
+        distribution: The name of the distribution declaring the entry point, if any
+    """
+
+    name: str
+    target: str
+    description: Optional[str] = None
+    functions: Tuple[str, ...] = ()
+    distribution: Optional[str] = None
+
+    @property
+    def module(self) -> str:
+        """The module defining the plugin class."""
+        return self.target.partition(":")[0]
+
+    @property
+    def attribute(self) -> str:
+        """The name of the plugin class in its module."""
+        return self.target.partition(":")[2]
+
+
+def find_module_source(module: str) -> Optional[str]:
+    """
+    Locate the source file of a module without importing it or its packages.
+
+    Args:
+        module: The dotted module name
+
+    Returns:
+        The path of the module's .py file, or None if it cannot be found on sys.path
+    """
+    loaded = sys.modules.get(module)
+    if loaded is not None:
+        return getattr(loaded, "__file__", None)
+
+    parts = module.split(".")
+    path: Optional[List[str]] = None
+    spec = None
+    for i in range(len(parts)):
+        spec = importlib.machinery.PathFinder.find_spec(".".join(parts[: i + 1]), path)
+        if spec is None:
+            return None
+        if i < len(parts) - 1:
+            if spec.submodule_search_locations is None:
+                return None
+            path = list(spec.submodule_search_locations)
+
+    origin = spec.origin if spec is not None else None
+    return origin if origin and origin.endswith(".py") else None
+
+
+def _decorator_name(node: ast.expr) -> Optional[str]:
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _read_class(
+    classes: Dict[str, ast.ClassDef], name: str, seen: Tuple[str, ...] = ()
+) -> Tuple[Optional[str], List[str]]:
+    """Read the description and function names of a class and its same-module bases."""
+    node = classes.get(name)
+    if node is None or name in seen:
+        return None, []
+
+    description: Optional[str] = None
+    functions: List[str] = []
+    # Bases defined in the same module contribute first, like inherited members
+    for base in node.bases:
+        if isinstance(base, ast.Name):
+            base_description, base_functions = _read_class(classes, base.id, seen + (name,))
+            description = base_description or description
+            functions.extend(f for f in base_functions if f not in functions)
+
+    for item in node.body:
+        if isinstance(item, ast.Assign):
+            value = item.value
+            for target in item.targets:
+                if (
+                    isinstance(target, ast.Name)
+                    and target.id == "description"
+                    and isinstance(value, ast.Constant)
+                    and isinstance(value.value, str)
+                ):
+                    description = value.value
+        elif isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if any(_decorator_name(d) in _FUNCTION_DECORATORS for d in item.decorator_list):
+                if item.name not in functions:
+                    functions.append(item.name)
+    return description, functions
+
+
+def read_plugin_source(module: str, attribute: str) -> Tuple[Optional[str], Tuple[str, ...]]:
+    """
+    Read a plugin class's description and function names from its source.
+
+    Only literal descriptions and functions decorated in the class (or in base
+    classes from the same module) are found; nothing is imported.
+
+    Args:
+        module: The dotted module name
+        attribute: The class name
+
+    Returns:
+        A tuple of (description or None, function names)
+    """
+    path = find_module_source(module)
+    if path is None:
+        return None, ()
+    try:
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), filename=path)
+    except (OSError, SyntaxError, ValueError):
+        return None, ()
+
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+    description, functions = _read_class(classes, attribute)
+    return description, tuple(functions)
+
+
+class PluginRegistry:
+    """
+    Index of plugin name to plugin class, loading plugin modules on demand.
+
+    Entry points are discovered on first use. Plugins can also be registered
+    explicitly with register().
+    """
+
+    def __init__(self, group: str = ENTRY_POINT_GROUP):
+        self.group = group
+        self._targets: Dict[str, Tuple[str, Optional[str]]] = {}
+        self._info: Dict[str, PluginInfo] = {}
+        self._loaded: Dict[str, Type["Plugin"]] = {}
+        self._discovered = False
+        self._lock = threading.RLock()
+
+    def discover(self) -> None:
+        """(Re)read the entry points of the registry's group. Nothing is imported."""
+        # Loaded here because it is slow to import and only discovery needs it
+        import importlib.metadata
+
+        entry_points = importlib.metadata.entry_points(group=self.group)
+        with self._lock:
+            for entry_point in entry_points:
+                dist = getattr(entry_point, "dist", None)
+                distribution = dist.name if dist is not None else None
+                self._targets.setdefault(entry_point.name, (entry_point.value, distribution))
+            self._discovered = True
+
+    def _ensure_discovered(self) -> None:
+        if not self._discovered:
+            self.discover()
+
+    def register(self, name: str, target: str) -> None:
+        """
+        Register a plugin explicitly.
+
+        Args:
+            name: The name to register the plugin under
+            target: The plugin class as "module:Class"
+
+        Raises:
+            ValueError: If target is not of the form "module:Class"
+        """
+        module, _, attribute = target.partition(":")
+        if not module or not attribute:
+            raise ValueError(f"Plugin target must be 'module:Class', got: {target}")
+        with self._lock:
+            self._targets[name] = (target, None)
+            self._info.pop(name, None)
+            self._loaded.pop(name, None)
+
+    def names(self) -> List[str]:
+        """Get the names of all registered plugins."""
+        self._ensure_discovered()
+        return sorted(self._targets)
+
+    def info(self, name: str) -> PluginInfo:
+        """
+        Get what is known about a plugin without importing it.
+
+        Args:
+            name: The plugin name
+
+        Returns:
+            PluginInfo: The plugin's target, description and function names
+
+        Raises:
+            ValueError: If no plugin is registered under that name
+        """
+        self._ensure_discovered()
+        info = self._info.get(name)
+        if info is not None:
+            return info
+
+        with self._lock:
+            entry = self._targets.get(name)
+            if entry is None:
+                raise ValueError(f"Unknown plugin: {name}")
+            target, distribution = entry
+            module, _, attribute = target.partition(":")
+            description, functions = read_plugin_source(module, attribute)
+            info = PluginInfo(name, target, description, functions, distribution)
+            self._info[name] = info
+            return info
+
+    def list(self) -> List[PluginInfo]:
+        """Get the info of every registered plugin, sorted by name, without importing any."""
+        return [self.info(name) for name in self.names()]
+
+    def get(self, name: str) -> Type["Plugin"]:
+        """
+        Get a plugin class, importing its module on first use.
+
+        Args:
+            name: The plugin name
+
+        Returns:
+            The plugin class
+
+        Raises:
+            ValueError: If no plugin is registered under that name
+            TypeError: If the target is not a Plugin subclass
+        """
+        cls = self._loaded.get(name)
+        if cls is not None:
+            return cls
+
+        self._ensure_discovered()
+        with self._lock:
+            cls = self._loaded.get(name)
+            if cls is not None:
+                return cls
+            entry = self._targets.get(name)
+            if entry is None:
+                raise ValueError(f"Unknown plugin: {name}")
+
+            from agently_sdk.plugins.base import Plugin
+
+            module, _, attribute = entry[0].partition(":")
+            obj = importlib.import_module(module)
+            for part in attribute.split("."):
+                obj = getattr(obj, part)
+            if not (isinstance(obj, type) and issubclass(obj, Plugin)):
+                raise TypeError(f"{entry[0]} is not a Plugin subclass")
+
+            self._loaded[name] = obj
+            return obj
+
+    def is_loaded(self, name: str) -> bool:
+        """Whether a plugin's class has been imported through the registry."""
+        return name in self._loaded
+
+    def __contains__(self, name: object) -> bool:
+        self._ensure_discovered()
+        return name in self._targets
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names())
+
+    def __len__(self) -> int:
+        self._ensure_discovered()
+        return len(self._targets)
+
+
+_registry: Optional[PluginRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> PluginRegistry:
+    """Get the process-wide registry of plugins declared through entry points."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = PluginRegistry()
+    return _registry
+
+
+__all__ = [
+    "ENTRY_POINT_GROUP",
+    "PluginInfo",
+    "PluginRegistry",
+    "find_module_source",
+    "get_registry",
+    "read_plugin_source",
+]
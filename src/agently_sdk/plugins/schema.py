@@ -0,0 +1,107 @@
+"""
+Per-class plugin schema for Agently plugins.
+
+A schema captures everything the SDK needs to know about a Plugin class
+(its variables, kernel functions and required variables) so that instances
+can be created without reflecting over the class every time.
+"""
+
+import inspect
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Tuple
+
+from agently_sdk.plugins.variables import PluginVariable
+
+
+def is_kernel_function(func: Any) -> bool:
+    """
+    Check whether a class member is a kernel function.
+
+    The @kernel_function decorator from semantic_kernel.functions adds
+    an attribute __kernel_function__ to the method. Our @agently_function
+    decorator adds both _is_kernel_function and _is_agently_function
+    attributes, as well as the __kernel_function__ attribute for compatibility.
+
+    Args:
+        func: The class member to check
+
+    Returns:
+        True if the member is a decorated function
+    """
+    if not inspect.isfunction(func):
+        return False
+
+    return bool(
+        getattr(func, "_is_kernel_function", False)
+        or getattr(func, "_is_agently_function", False)
+        or getattr(func, "__kernel_function__", False)
+    )
+
+
+@dataclass(frozen=True)
+class PluginSchema:
+    """
+    Reflection results for a single Plugin class.
+
+    Schemas are built once per class and cached on it. They are invalidated
+    automatically when attributes are set on or deleted from the class (or
+    one of its bases) after it has been created.
+
+    Attributes:
+        variables: All PluginVariable descriptors, keyed by attribute name
+        public_variables: The variables whose attribute names are not private
+        functions: Kernel functions, keyed by attribute name
+        required: Attribute names of variables without a default value
+        names: Mapping of attribute name to the variable's storage name
+    """
+
+    variables: Mapping[str, PluginVariable]
+    public_variables: Mapping[str, PluginVariable]
+    functions: Mapping[str, Callable[..., Any]]
+    required: Tuple[str, ...]
+    names: Mapping[str, str]
+
+
+def build_schema(cls: type) -> PluginSchema:
+    """
+    Reflect over a Plugin class and build its schema.
+
+    Unnamed variables are given the name of the attribute they are bound to.
+
+    Args:
+        cls: The Plugin class to inspect
+
+    Returns:
+        PluginSchema: The schema for the class
+    """
+    variables = {}
+    functions = {}
+
+    for name, attr in inspect.getmembers(cls):
+        if isinstance(attr, PluginVariable):
+            # Set the name if not already set
+            if attr.name is None:
+                attr.name = name
+            variables[name] = attr
+        elif not name.startswith("_") and is_kernel_function(attr):
+            functions[name] = attr
+
+    public_variables = {name: var for name, var in variables.items() if not name.startswith("_")}
+    required = tuple(
+        name
+        for name, var in variables.items()
+        if var.default_value is None and var.default_factory is None
+    )
+    names = {name: var.name or name for name, var in variables.items()}
+
+    return PluginSchema(
+        variables=MappingProxyType(variables),
+        public_variables=MappingProxyType(public_variables),
+        functions=MappingProxyType(functions),
+        required=required,
+        names=MappingProxyType(names),
+    )
+
+
+__all__ = ["PluginSchema", "build_schema", "is_kernel_function"]
@@ -0,0 +1,346 @@
+"""
+Function metadata for Agently plugin functions.
+
+A FunctionSpec describes everything a host needs to expose a plugin function
+as a tool: its name and description, its parameters with resolved type hints,
+defaults and docstring descriptions, and its return type. Specs are built
+once per function and cached on it, so hosts do not have to run
+inspect.signature and typing.get_type_hints on every registration.
+"""
+
+import inspect
+import re
+import typing
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from agently_sdk.plugins.decorators import FunctionKind, function_kind
+
+# Marks parameters without a default value
+MISSING = inspect.Parameter.empty
+
+_GOOGLE_SECTION = re.compile(r"^(\w[\w ]*):\s*$")
+_GOOGLE_PARAM = re.compile(r"^\*{0,2}(\w+)\s*(?:\(([^)]*)\))?\s*:\s*(.*)$")
+_NUMPY_PARAM = re.compile(r"^\*{0,2}(\w+)\s*(?::\s*(.*))?$")
+_PARAM_SECTIONS = {
+    "args",
+    "arguments",
+    "parameters",
+    "params",
+    "keyword args",
+    "keyword arguments",
+    "other parameters",
+}
+_RETURN_SECTIONS = {"returns", "return", "yields", "yield"}
+
+
+@dataclass(frozen=True)
+class ParameterSpec:
+    """
+    Metadata for a single parameter of a plugin function.
+
+    Attributes:
+        name: The parameter name
+        annotation: The resolved type hint, or None if the parameter is not annotated
+        default: The default value, or MISSING if the parameter has none
+        kind: The inspect.Parameter kind of the parameter
+        description: The description from the function's docstring, if any
+    """
+
+    name: str
+    annotation: Any = None
+    default: Any = MISSING
+    kind: inspect._ParameterKind = inspect.Parameter.POSITIONAL_OR_KEYWORD
+    description: Optional[str] = None
+
+    @property
+    def required(self) -> bool:
+        """Whether the parameter must be passed."""
+        return self.default is MISSING and self.kind not in (
+            inspect.Parameter.VAR_POSITIONAL,
+            inspect.Parameter.VAR_KEYWORD,
+        )
+
+
+@dataclass(frozen=True)
+class FunctionSpec:
+    """
+    Metadata for a plugin function, captured once and cached on the function.
+
+    Attributes:
+        name: The name the function is exposed under
+        description: The description given to the decorator, or the docstring summary
+        kind: Whether the function is sync, async or a generator
+        parameters: The function's parameters, excluding self
+        return_annotation: The resolved return type hint, or None if not annotated
+        return_description: The description of the return value from the docstring
+        signature: The function's signature, excluding self
+        docstring: The cleaned docstring
+    """
+
+    name: str
+    description: Optional[str]
+    kind: FunctionKind
+    parameters: Tuple[ParameterSpec, ...]
+    return_annotation: Any = None
+    return_description: Optional[str] = None
+    signature: Optional[inspect.Signature] = field(default=None, compare=False)
+    docstring: Optional[str] = None
+
+    @property
+    def parameter_map(self) -> Mapping[str, ParameterSpec]:
+        """The parameters keyed by name."""
+        return MappingProxyType({param.name: param for param in self.parameters})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert this spec to a dictionary representation.
+
+        Returns:
+            Dict[str, Any]: Dictionary with function metadata.
+        """
+        parameters = []
+        for param in self.parameters:
+            info: Dict[str, Any] = {"name": param.name, "required": param.required}
+            if param.annotation is not None:
+                info["type"] = type_name(param.annotation)
+            if param.default is not MISSING:
+                info["default"] = param.default
+            if param.description is not None:
+                info["description"] = param.description
+            parameters.append(info)
+
+        result: Dict[str, Any] = {
+            "name": self.name,
+            "description": self.description,
+            "kind": self.kind.value,
+            "parameters": parameters,
+        }
+        if self.return_annotation is not None:
+            result["returns"] = type_name(self.return_annotation)
+        if self.return_description is not None:
+            result["return_description"] = self.return_description
+        return result
+
+
+def type_name(annotation: Any) -> str:
+    """
+    Get a readable name for a type hint.
+
+    Args:
+        annotation: The type hint
+
+    Returns:
+        The class name for plain classes, or the typing representation otherwise
+    """
+    if isinstance(annotation, type) and not typing.get_args(annotation):
+        return annotation.__name__
+    return str(annotation).replace("typing.", "")
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip())
+
+
+def _join(lines: List[str]) -> Optional[str]:
+    text = " ".join(line.strip() for line in lines if line.strip())
+    return text or None
+
+
+def _is_rule(lines: List[str], index: int) -> bool:
+    """Whether the line at index is a NumPy style section underline."""
+    return index < len(lines) and set(lines[index].strip()) == {"-"}
+
+
+def parse_docstring(
+    docstring: Optional[str],
+) -> Tuple[Optional[str], Dict[str, str], Optional[str]]:
+    """
+    Parse a Google or NumPy style docstring.
+
+    Args:
+        docstring: The cleaned docstring (as returned by inspect.getdoc)
+
+    Returns:
+        A tuple of (summary, parameter descriptions keyed by name, return description)
+    """
+    if not docstring:
+        return None, {}, None
+
+    lines = docstring.expandtabs().splitlines()
+
+    summary_lines: List[str] = []
+    for line in lines:
+        if not line.strip():
+            break
+        summary_lines.append(line)
+    summary = _join(summary_lines)
+
+    params: Dict[str, str] = {}
+    returns: Optional[str] = None
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        header = line.strip().lower()
+        numpy_style = _is_rule(lines, i + 1)
+        google = _GOOGLE_SECTION.match(line.strip())
+
+        if numpy_style:
+            body_start = i + 2
+            section = header
+        elif google:
+            body_start = i + 1
+            section = google.group(1).lower()
+        else:
+            i += 1
+            continue
+
+        base = _indent(line)
+        body: List[str] = []
+        j = body_start
+        while j < len(lines):
+            candidate = lines[j]
+            if candidate.strip():
+                if numpy_style:
+                    if _is_rule(lines, j + 1) and _indent(candidate) <= base:
+                        break
+                elif _indent(candidate) <= base:
+                    break
+            body.append(candidate)
+            j += 1
+
+        if section in _PARAM_SECTIONS:
+            params.update(_parse_params(body, numpy_style))
+        elif section in _RETURN_SECTIONS and returns is None:
+            returns = _parse_returns(body, numpy_style)
+
+        i = j
+
+    return summary, params, returns
+
+
+def _parse_params(body: List[str], numpy_style: bool) -> Dict[str, str]:
+    """Parse the entries of a parameters section."""
+    content = [line for line in body if line.strip()]
+    if not content:
+        return {}
+
+    entry_indent = min(_indent(line) for line in content)
+    params: Dict[str, List[str]] = {}
+    current: Optional[List[str]] = None
+
+    for line in content:
+        if _indent(line) == entry_indent:
+            pattern = _NUMPY_PARAM if numpy_style else _GOOGLE_PARAM
+            match = pattern.match(line.strip())
+            if match is None:
+                current = None
+                continue
+            current = params.setdefault(match.group(1), [])
+            if not numpy_style and match.group(3):
+                current.append(match.group(3))
+        elif current is not None:
+            current.append(line)
+
+    return {name: text for name, parts in params.items() if (text := _join(parts))}
+
+
+def _parse_returns(body: List[str], numpy_style: bool) -> Optional[str]:
+    """Parse the description of a returns section."""
+    content = [line for line in body if line.strip()]
+    if numpy_style and len(content) > 1:
+        # The first line is the return type
+        return _join(content[1:])
+    return _join(content)
+
+
+def _resolve_type_hints(func: Callable[..., Any]) -> Dict[str, Any]:
+    try:
+        return typing.get_type_hints(func)
+    except Exception:
+        # Unresolvable forward references: fall back to the raw annotations
+        return dict(getattr(func, "__annotations__", {}) or {})
+
+
+def build_function_spec(func: Callable[..., Any]) -> FunctionSpec:
+    """
+    Build the spec for a function without consulting the cache.
+
+    Args:
+        func: The plugin function
+
+    Returns:
+        FunctionSpec: The function's metadata
+    """
+    func = getattr(func, "__func__", func)
+    # Wrappers made with wrap=True copy the metadata, but hints resolve in the original's globals
+    target = inspect.unwrap(func)
+    signature = inspect.signature(target)
+    hints = _resolve_type_hints(target)
+    docstring = inspect.getdoc(target)
+    summary, param_docs, return_doc = parse_docstring(docstring)
+
+    params = list(signature.parameters.values())
+    if params and params[0].name in ("self", "cls"):
+        params = params[1:]
+    signature = signature.replace(parameters=params)
+
+    parameters = tuple(
+        ParameterSpec(
+            name=param.name,
+            annotation=hints.get(param.name),
+            default=param.default,
+            kind=param.kind,
+            description=param_docs.get(param.name),
+        )
+        for param in params
+    )
+
+    return FunctionSpec(
+        name=getattr(func, "_name", None) or func.__name__,
+        description=getattr(func, "_description", None) or summary,
+        kind=function_kind(func),
+        parameters=parameters,
+        return_annotation=hints.get("return"),
+        return_description=return_doc,
+        signature=signature,
+        docstring=docstring,
+    )
+
+
+def get_function_spec(func: Callable[..., Any]) -> FunctionSpec:
+    """
+    Get the spec for a plugin function, building it on first use.
+
+    The spec is cached on the function itself, so it is computed once per
+    function no matter how many plugins or hosts ask for it.
+
+    Args:
+        func: The plugin function or a bound method of it
+
+    Returns:
+        FunctionSpec: The function's metadata
+    """
+    func = getattr(func, "__func__", func)
+    spec = getattr(func, "_function_spec", None)
+    if spec is None:
+        spec = build_function_spec(func)
+        try:
+            func._function_spec = spec  # type: ignore
+        except (AttributeError, TypeError):
+            # Callables that do not accept attributes are not cached
+            pass
+    return typing.cast(FunctionSpec, spec)
+
+
+__all__ = [
+    "MISSING",
+    "FunctionSpec",
+    "ParameterSpec",
+    "build_function_spec",
+    "get_function_spec",
+    "parse_docstring",
+    "type_name",
+]
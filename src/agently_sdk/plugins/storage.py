@@ -0,0 +1,175 @@
+"""
+Compact storage for plugin variable values.
+
+Plugins declared with ``compact=True`` keep their variable values in a single
+tuple slot instead of a per-instance ``_values`` dictionary. Each variable is
+assigned a fixed index in the class layout, the class holds one shared tuple
+of default values, and instances that only use defaults point at that shared
+tuple. Reading a variable is a single indexed load.
+
+Example:
+    ```python
+    class RouterPlugin(Plugin, compact=True):
+        name = "router"
+        description = "Routes requests"
+
+        region = PluginVariable(description="Region to route to", default="us")
+    ```
+
+Compact plugins use ``__slots__``, so instances cannot be given arbitrary new
+attributes. Subclasses of a compact plugin are always compact.
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Type
+
+from agently_sdk.plugins.caching import clear_owner_caches, owner_caches
+from agently_sdk.plugins.variables import PluginVariable
+
+if TYPE_CHECKING:
+    from agently_sdk.plugins.schema import PluginSchema
+
+
+class CompactVariable:
+    """
+    Class-level descriptor reading a variable from a compact plugin's value tuple.
+
+    Accessed from the class it returns the wrapped PluginVariable, so reflection
+    and get_plugin_variables() see the same objects as for regular plugins.
+    """
+
+    __slots__ = ("variable", "index")
+
+    def __init__(self, variable: PluginVariable, index: int):
+        self.variable = variable
+        self.index = index
+
+    def __get__(self, obj: Any, objtype: Optional[Type] = None) -> Any:
+        if obj is None:
+            return self.variable
+        try:
+            return obj._store[self.index]
+        except IndexError:
+            # Instance created before the variable was added to the class
+            return self.variable.default_value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        variable = self.variable
+        error = (variable._checker or variable.checker)(value)
+        if error is not None:
+            raise ValueError(error)
+
+        store = obj._store
+        index = self.index
+        if index >= len(store):
+            store = store + type(obj)._default_store[len(store) :]
+        obj._store = store[:index] + (value,) + store[index + 1 :]
+        if id(obj) in owner_caches:
+            clear_owner_caches(obj)
+
+
+class LazyCompactVariable(CompactVariable):
+    """
+    CompactVariable for a variable with a default_factory.
+
+    Installed only for those variables, so reading the others stays a single
+    indexed load.
+    """
+
+    __slots__ = ()
+
+    def __get__(self, obj: Any, objtype: Optional[Type] = None) -> Any:
+        if obj is None:
+            return self.variable
+        value = CompactVariable.__get__(self, obj, objtype)
+        if value is None and self.variable._lazy_default is not None:
+            return self.variable._lazy_default.get(obj)
+        return value
+
+
+def _get_values(self: Any) -> Dict[str, Any]:
+    """Values that differ from the class defaults, keyed by variable name."""
+    cls = type(self)
+    store = self._store
+    defaults = cls._default_store
+    return {
+        key: store[index]
+        for key, index in cls._compact_layout.items()
+        if index < len(store) and store[index] is not defaults[index]
+    }
+
+
+def _set_values(self: Any, values: Dict[str, Any]) -> None:
+    """Replace the value tuple from a mapping of variable name to value."""
+    cls = type(self)
+    if not values:
+        self._store = cls._default_store
+        return
+
+    store = list(cls._default_store)
+    layout = cls._compact_layout
+    for key, value in values.items():
+        store[layout[key]] = value
+    self._store = tuple(store)
+
+
+# Installed as ``_values`` on compact plugins so code written against the
+# dictionary storage keeps working.
+compact_values = property(_get_values, _set_values)
+
+
+def compact_slots(bases: Tuple[type, ...]) -> Tuple[str, ...]:
+    """
+    Work out the slots a new compact plugin class has to declare.
+
+    Args:
+        bases: The bases of the class being created
+
+    Returns:
+        The slot names not already provided by one of the bases
+    """
+    slots = []
+    if not any(hasattr(base, "_store") for base in bases):
+        slots.append("_store")
+    if not any(base.__weakrefoffset__ for base in bases):
+        slots.append("__weakref__")
+    return tuple(slots)
+
+
+def install_compact_layout(cls: type, schema: "PluginSchema") -> None:
+    """
+    Assign tuple indices to the variables of a compact plugin class.
+
+    Indices already assigned to a variable are kept, so instances created before
+    a variable was added to the class stay readable.
+
+    Args:
+        cls: The compact plugin class
+        schema: The class schema
+    """
+    layout: Dict[str, int] = dict(cls.__dict__.get("_compact_layout") or {})
+    variables: Dict[str, PluginVariable] = {}
+
+    for attr, var in schema.variables.items():
+        key = schema.names[attr]
+        if key not in layout:
+            layout[key] = len(layout)
+        variables[key] = var
+        descriptor = CompactVariable if var._lazy_default is None else LazyCompactVariable
+        type.__setattr__(cls, attr, descriptor(var, layout[key]))
+
+    defaults: list = [None] * len(layout)
+    for key, index in layout.items():
+        if key in variables:
+            defaults[index] = variables[key].default_value
+
+    type.__setattr__(cls, "_compact_layout", layout)
+    type.__setattr__(cls, "_default_store", tuple(defaults))
+
+
+__all__ = [
+    "CompactVariable",
+    "LazyCompactVariable",
+    "compact_slots",
+    "compact_values",
+    "install_compact_layout",
+]
@@ -0,0 +1,287 @@
+"""
+Function-calling schemas for Agently plugins.
+
+Converts plugin functions into JSON tool schemas (the OpenAI / Semantic
+Kernel function-calling format) and plugin variables into a JSON Schema
+object, using the cached FunctionSpecs for type hints and docstrings.
+
+The serialized JSON is cached per plugin class and reused until the class
+(or one of its bases) changes, so serving a tool list does not reflect on
+the class again.
+
+Example:
+    ```python
+    HelloPlugin.get_tool_schemas()
+    # [{"type": "function",
+    #   "function": {"name": "hello_plugin-greet",
+    #                "description": "Greet someone with a friendly message.",
+    #                "parameters": {"type": "object",
+    #                               "properties": {"name": {"type": "string", ...}},
+    #                               "required": []}}}]
+
+    HelloPlugin.get_tool_schema_json()  # the same list as UTF-8 JSON bytes
+    ```
+"""
+
+import enum
+import inspect
+import json
+import types
+import typing
+from collections import abc
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+from agently_sdk.plugins.spec import MISSING, FunctionSpec, get_function_spec
+from agently_sdk.plugins.variables import PluginVariable
+
+if TYPE_CHECKING:
+    from agently_sdk.plugins.schema import PluginSchema
+
+# Joins the plugin and function names, as Semantic Kernel does
+NAME_SEPARATOR = "-"
+
+_PRIMITIVES: Dict[Any, str] = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    type(None): "null",
+    bytes: "string",
+}
+
+
+def json_schema(annotation: Any) -> Dict[str, Any]:
+    """
+    Convert a type hint to a JSON Schema.
+
+    Supports primitives, Optional and Union, Literal, Enum subclasses, lists,
+    sets, tuples and dicts (including their typing generics). Anything else,
+    including missing annotations, accepts any value.
+
+    Args:
+        annotation: The type hint, or None if there is none
+
+    Returns:
+        The JSON Schema for values of that type
+    """
+    if annotation is None or annotation is Any:
+        return {}
+    if annotation in _PRIMITIVES:
+        return {"type": _PRIMITIVES[annotation]}
+
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+
+    if origin is typing.Union or origin is types.UnionType:
+        options = [json_schema(arg) for arg in args]
+        if all(set(option) == {"type"} for option in options):
+            return {"type": [option["type"] for option in options]}
+        return {"anyOf": options}
+    if origin is typing.Literal:
+        return {"enum": list(args)}
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        return {"enum": [member.value for member in annotation]}
+
+    if origin in (list, abc.Sequence, abc.MutableSequence, abc.Iterable):
+        schema: Dict[str, Any] = {"type": "array"}
+        if args:
+            schema["items"] = json_schema(args[0])
+        return schema
+    if origin in (set, frozenset, abc.Set, abc.MutableSet):
+        schema = {"type": "array", "uniqueItems": True}
+        if args:
+            schema["items"] = json_schema(args[0])
+        return schema
+    if origin is tuple:
+        if len(args) == 2 and args[1] is Ellipsis:
+            return {"type": "array", "items": json_schema(args[0])}
+        if args:
+            items = [json_schema(arg) for arg in args]
+            return {
+                "type": "array",
+                "prefixItems": items,
+                "minItems": len(items),
+                "maxItems": len(items),
+            }
+        return {"type": "array"}
+    if origin in (dict, abc.Mapping, abc.MutableMapping):
+        schema = {"type": "object"}
+        if len(args) == 2:
+            schema["additionalProperties"] = json_schema(args[1])
+        return schema
+
+    if annotation in (list, tuple, set, frozenset):
+        return {"type": "array"}
+    if annotation is dict:
+        return {"type": "object"}
+    return {}
+
+
+def _json_value(value: Any) -> Any:
+    """Make a default value JSON serializable, or return MISSING if it is not."""
+    if isinstance(value, enum.Enum):
+        value = value.value
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return MISSING
+    return value
+
+
+def function_tool_schema(spec: FunctionSpec, plugin_name: str) -> Dict[str, Any]:
+    """
+    Build the function-calling schema of a plugin function.
+
+    Args:
+        spec: The function's spec
+        plugin_name: The name of the plugin the function belongs to
+
+    Returns:
+        The tool schema, {"type": "function", "function": {...}}
+    """
+    properties: Dict[str, Any] = {}
+    required: List[str] = []
+    for param in spec.parameters:
+        if param.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD):
+            continue
+
+        prop = json_schema(param.annotation)
+        if param.description:
+            prop["description"] = param.description
+        if param.default is not MISSING:
+            default = _json_value(param.default)
+            if default is not MISSING:
+                prop["default"] = default
+        properties[param.name] = prop
+        if param.required:
+            required.append(param.name)
+
+    function: Dict[str, Any] = {"name": f"{plugin_name}{NAME_SEPARATOR}{spec.name}"}
+    if spec.description:
+        function["description"] = spec.description
+    function["parameters"] = {"type": "object", "properties": properties, "required": required}
+    return {"type": "function", "function": function}
+
+
+def variable_json_schema(var: PluginVariable) -> Dict[str, Any]:
+    """
+    Build the JSON Schema of a plugin variable's values.
+
+    Args:
+        var: The plugin variable
+
+    Returns:
+        The schema, including its description, default and validation constraints
+    """
+    schema = json_schema(var.value_type)
+    if var.description:
+        schema["description"] = var.description
+    if var.default_value is not None:
+        default = _json_value(var.default_value)
+        if default is not MISSING:
+            schema["default"] = default
+
+    validation = var.validation
+    options = var.choices if var.choices is not None else getattr(validation, "options", None)
+    if options is not None and _json_value(list(options)) is not MISSING:
+        schema["enum"] = list(options)
+    if validation is not None:
+        if validation.range is not None:
+            low, high = validation.range
+            if low is not None:
+                schema["minimum"] = low
+            if high is not None:
+                schema["maximum"] = high
+        if validation.pattern is not None:
+            pattern = getattr(validation.pattern, "pattern", validation.pattern)
+            schema["pattern"] = str(pattern)
+            max_length = validation.max_length
+            if max_length is None and validation.pattern_mode is not None:
+                from agently_sdk.plugins.patterns import DEFAULT_MAX_LENGTH
+
+                max_length = DEFAULT_MAX_LENGTH
+            if max_length is not None:
+                schema["maxLength"] = max_length
+    if var.sensitive:
+        schema["writeOnly"] = True
+    return schema
+
+
+def build_tool_schemas(plugin_name: str, schema: "PluginSchema") -> List[Dict[str, Any]]:
+    """
+    Build the function-calling schemas of every function in a plugin schema.
+
+    Args:
+        plugin_name: The plugin name
+        schema: The plugin class schema
+
+    Returns:
+        One tool schema per function
+    """
+    return [
+        function_tool_schema(get_function_spec(func), plugin_name)
+        for func in schema.functions.values()
+    ]
+
+
+def build_variables_schema(schema: "PluginSchema") -> Dict[str, Any]:
+    """
+    Build a JSON Schema object describing a plugin's configuration variables.
+
+    Args:
+        schema: The plugin class schema
+
+    Returns:
+        An object schema with one property per public variable
+    """
+    properties = {}
+    required = []
+    for attr, var in schema.public_variables.items():
+        name = schema.names[attr]
+        properties[name] = variable_json_schema(var)
+        if attr in schema.required:
+            required.append(name)
+    return {"type": "object", "properties": properties, "required": required}
+
+
+def _dumps(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def cached_schema_json(cls: type, schema: "PluginSchema") -> Tuple[bytes, bytes]:
+    """
+    Get the serialized tool and variable schemas of a plugin class.
+
+    The bytes are cached on the class together with the PluginSchema they were
+    built from. Any change to the class replaces its PluginSchema, which makes
+    the cached bytes stale without further bookkeeping.
+
+    Args:
+        cls: The plugin class
+        schema: The current schema of the class
+
+    Returns:
+        A tuple of (tool schemas JSON, variables schema JSON)
+    """
+    cached = cls.__dict__.get("_tool_schema_cache")
+    if cached is not None and cached[0] is schema:
+        return cached[1], cached[2]
+
+    name = getattr(cls, "name", None)
+    plugin_name = name if isinstance(name, str) else cls.__name__
+    tools = _dumps(build_tool_schemas(plugin_name, schema))
+    variables = _dumps(build_variables_schema(schema))
+    # Bypass PluginMeta.__setattr__, which would invalidate the schema again
+    type.__setattr__(cls, "_tool_schema_cache", (schema, tools, variables))
+    return tools, variables
+
+
+__all__ = [
+    "NAME_SEPARATOR",
+    "build_tool_schemas",
+    "build_variables_schema",
+    "cached_schema_json",
+    "function_tool_schema",
+    "json_schema",
+    "variable_json_schema",
+]
@@ -0,0 +1,429 @@
+"""
+Tracing for Agently plugin functions.
+
+Trace hooks are notified when a plugin function call starts and ends, with a
+Span describing the plugin, the function, a summary of the arguments, the
+duration and any exception raised. Spans nest: a plugin function called from
+another one becomes its child, across threads started with propagate() or
+run by Plugin.ainvoke() and across asyncio tasks.
+
+Tracing is off until the first hook is added. Calls are sampled when their
+trace starts and nested calls follow the decision of their root. The calls of
+a trace that is not sampled are not timed and no span is created for them, so
+with a sample rate of 0.01 only one trace in a hundred pays for tracing beyond
+the sampling decision itself.
+
+Generator and async generator functions are traced, but their spans are not
+made current, as they run interleaved with their caller: plugin functions
+called while such a function iterates belong to the caller's span (and
+trace), not to the generator's.
+
+Example:
+    ```python
+    from agently_sdk.plugins.tracing import JsonFileSpanExporter, add_trace_hook
+
+    add_trace_hook(JsonFileSpanExporter("spans.jsonl"), sample_rate=0.01)
+    ```
+"""
+
+import contextvars
+import json
+import random
+import threading
+import time
+import warnings
+from dataclasses import dataclass, field
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from agently_sdk.plugins.decorators import FunctionKind
+from agently_sdk.plugins.instrumentation import (
+    CallInfo,
+    CallObserver,
+    add_observer,
+    remove_observer,
+)
+
+T = TypeVar("T")
+
+# Longest argument summary recorded on a span
+MAX_ARGUMENTS_LENGTH = 256
+
+
+@dataclass
+class Span:
+    """
+    One traced plugin function call.
+
+    Attributes:
+        name: The span name, "<plugin>.<function>"
+        plugin: The plugin name
+        function: The function name
+        arguments: A truncated summary of the call arguments
+        trace_id: 32 hex digit id shared by all spans of a trace
+        span_id: 16 hex digit id of this span
+        parent_id: The span_id of the calling span, or None for a root span
+        start_time: Start time in nanoseconds since the epoch
+        end_time: End time in nanoseconds since the epoch, None while running
+        duration: Call duration in seconds, None while running
+        error: The exception raised by the call, if any
+        attributes: Extra attributes hooks may add
+    """
+
+    name: str
+    plugin: str
+    function: str
+    arguments: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str] = None
+    start_time: int = 0
+    end_time: Optional[int] = None
+    duration: Optional[float] = None
+    error: Optional[BaseException] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+class TraceHook:
+    """
+    Base class for objects notified about traced plugin function calls.
+
+    Hooks must not raise; exceptions are turned into warnings so that tracing
+    never changes the outcome of a call.
+    """
+
+    def on_start(self, span: Span) -> None:
+        pass
+
+    def on_end(self, span: Span) -> None:
+        pass
+
+
+_current_span: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar(
+    "agently_current_span", default=None
+)
+
+# Current while a call of a trace that was not sampled runs, so nested calls skip it too
+_UNSAMPLED = Span(name="", plugin="", function="", arguments="", trace_id="", span_id="")
+
+
+def current_span() -> Optional[Span]:
+    """Get the span of the plugin function call currently running, if traced."""
+    span = _current_span.get()
+    return None if span is _UNSAMPLED else span
+
+
+def propagate(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    Bind a callable to the current trace context.
+
+    Use this for callables handed to threads or executors, so that plugin
+    functions they call are recorded as children of the current span.
+    asyncio tasks and Plugin.ainvoke() propagate the context on their own.
+
+    Args:
+        func: The callable to run in another thread
+
+    Returns:
+        A callable running func in a copy of the current context
+    """
+    context = contextvars.copy_context()
+
+    def run(*args: Any, **kwargs: Any) -> T:
+        return context.run(func, *args, **kwargs)
+
+    return run
+
+
+def summarize_arguments(
+    args: Tuple[Any, ...], kwargs: Dict[str, Any], max_length: int = MAX_ARGUMENTS_LENGTH
+) -> str:
+    """
+    Summarize call arguments for a span.
+
+    Args:
+        args: Positional arguments
+        kwargs: Keyword arguments
+        max_length: Length the summary is truncated to
+
+    Returns:
+        The arguments formatted like a call, e.g. "(1, key='v')"
+    """
+    parts = [_safe_repr(value) for value in args]
+    parts.extend(f"{key}={_safe_repr(value)}" for key, value in kwargs.items())
+    summary = f"({', '.join(parts)})"
+    if len(summary) > max_length:
+        summary = summary[: max_length - 3] + "..."
+    return summary
+
+
+def _safe_repr(value: Any) -> str:
+    try:
+        text = repr(value)
+    except Exception:
+        return f"<{type(value).__name__}>"
+    # Keep large values from making every summary expensive
+    return text if len(text) <= MAX_ARGUMENTS_LENGTH else text[:MAX_ARGUMENTS_LENGTH]
+
+
+def _notify(hook: Callable[[Span], None], span: Span) -> None:
+    try:
+        hook(span)
+    except Exception as e:
+        warnings.warn(f"Trace hook {hook!r} failed: {e!r}", RuntimeWarning, stacklevel=2)
+
+
+class TracingObserver(CallObserver):
+    """Call observer turning sampled plugin function calls into spans."""
+
+    # Marks the context of unsampled calls, so the calls nested in them are skipped too
+    skip_context = (_current_span, _UNSAMPLED)
+
+    def __init__(self, hooks: Tuple[TraceHook, ...], sample_rate: float = 1.0):
+        self.hooks = hooks
+        self.sample_rate = sample_rate
+        self._random = random.Random()
+
+    def observes(self) -> bool:
+        parent = _current_span.get()
+        if parent is None:
+            # Sample whole traces: the decision is only made for root spans
+            return self.sample_rate >= 1.0 or self._random.random() < self.sample_rate
+        return parent is not _UNSAMPLED
+
+    def start(self, call: CallInfo) -> Any:
+        parent = _current_span.get()
+        if parent is None:
+            trace_id = f"{self._random.getrandbits(128):032x}"
+            parent_id = None
+        else:
+            trace_id = parent.trace_id
+            parent_id = parent.span_id
+
+        span = Span(
+            name=f"{call.plugin}.{call.function}",
+            plugin=call.plugin,
+            function=call.function,
+            arguments=summarize_arguments(call.args, call.kwargs),
+            trace_id=trace_id,
+            span_id=f"{self._random.getrandbits(64):016x}",
+            parent_id=parent_id,
+            start_time=time.time_ns(),
+        )
+        for hook in self.hooks:
+            _notify(hook.on_start, span)
+        return span, self._make_current(call, span)
+
+    @staticmethod
+    def _make_current(call: CallInfo, span: Span) -> Optional[contextvars.Token]:
+        # Generators run interleaved with their caller, so they cannot be made current;
+        # calls made while they iterate stay in the caller's span
+        if call.kind in (FunctionKind.SYNC, FunctionKind.ASYNC):
+            return _current_span.set(span)
+        return None
+
+    def end(
+        self, call: CallInfo, state: Any, duration: float, error: Optional[BaseException]
+    ) -> None:
+        span, token = state
+        if token is not None:
+            try:
+                _current_span.reset(token)
+            except ValueError:
+                # Ended in a different context than it started in
+                pass
+
+        span.end_time = span.start_time + int(duration * 1e9)
+        span.duration = duration
+        span.error = error
+        for hook in self.hooks:
+            _notify(hook.on_end, span)
+
+
+_lock = threading.Lock()
+_hooks: Tuple[TraceHook, ...] = ()
+_sample_rate = 1.0
+_observer: Optional[TracingObserver] = None
+
+
+def _install() -> None:
+    global _observer
+    if not _hooks:
+        if _observer is not None:
+            remove_observer(_observer)
+            _observer = None
+    elif _observer is None:
+        _observer = TracingObserver(_hooks, _sample_rate)
+        add_observer(_observer)
+    else:
+        _observer.hooks = _hooks
+
+
+def add_trace_hook(hook: TraceHook, sample_rate: Optional[float] = None) -> None:
+    """
+    Register a trace hook, turning tracing on.
+
+    Args:
+        hook: The hook to notify
+        sample_rate: Optionally change the sample rate (see set_sample_rate)
+    """
+    global _hooks
+    with _lock:
+        if sample_rate is not None:
+            _set_sample_rate(sample_rate)
+        if hook not in _hooks:
+            _hooks = _hooks + (hook,)
+        _install()
+
+
+def remove_trace_hook(hook: TraceHook) -> None:
+    """
+    Unregister a trace hook. Removing the last hook turns tracing off.
+
+    Args:
+        hook: The hook to stop notifying
+    """
+    global _hooks
+    with _lock:
+        _hooks = tuple(h for h in _hooks if h is not hook)
+        _install()
+
+
+def set_sample_rate(rate: float) -> None:
+    """
+    Set the fraction of traces that are recorded.
+
+    Args:
+        rate: A value between 0 and 1; 1 records every call
+
+    Raises:
+        ValueError: If rate is outside [0, 1]
+    """
+    with _lock:
+        _set_sample_rate(rate)
+        if _observer is not None:
+            _observer.sample_rate = rate
+
+
+def _set_sample_rate(rate: float) -> None:
+    global _sample_rate
+    if not 0 <= rate <= 1:
+        raise ValueError("sample rate must be between 0 and 1")
+    _sample_rate = rate
+
+
+def get_sample_rate() -> float:
+    """Get the fraction of traces that are recorded."""
+    return _sample_rate
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed: Dict[str, Any] = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+def span_to_otlp(span: Span) -> Dict[str, Any]:
+    """
+    Convert a finished span to the OpenTelemetry (OTLP/JSON) span representation.
+
+    Args:
+        span: The span
+
+    Returns:
+        The span as an OTLP JSON object
+    """
+    attributes = {
+        "agently.plugin": span.plugin,
+        "agently.function": span.function,
+        "agently.arguments": span.arguments,
+    }
+    attributes.update(span.attributes)
+
+    result: Dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": str(span.start_time),
+        "endTimeUnixNano": str(span.end_time if span.end_time is not None else span.start_time),
+        "attributes": [_attribute(key, value) for key, value in attributes.items()],
+        "status": {"code": 1},  # STATUS_CODE_OK
+    }
+    if span.parent_id is not None:
+        result["parentSpanId"] = span.parent_id
+    if span.error is not None:
+        message = str(span.error)
+        result["status"] = {"code": 2, "message": message}  # STATUS_CODE_ERROR
+        result["events"] = [
+            {
+                "name": "exception",
+                "timeUnixNano": result["endTimeUnixNano"],
+                "attributes": [
+                    _attribute("exception.type", type(span.error).__qualname__),
+                    _attribute("exception.message", message),
+                ],
+            }
+        ]
+    return result
+
+
+class JsonFileSpanExporter(TraceHook):
+    """
+    Trace hook writing finished spans to a local file as OpenTelemetry JSON.
+
+    Each line is an OTLP/JSON trace export request holding one span, the
+    format read by the OpenTelemetry Collector's file receiver.
+    """
+
+    def __init__(self, path: str, service_name: str = "agently"):
+        self.path = path
+        self.service_name = service_name
+        self._file: Optional[IO[str]] = None
+        self._lock = threading.Lock()
+
+    def on_end(self, span: Span) -> None:
+        line = json.dumps(self._export_request([span_to_otlp(span)]))
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def _export_request(self, spans: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [_attribute("service.name", self.service_name)]},
+                    "scopeSpans": [{"scope": {"name": "agently_sdk"}, "spans": spans}],
+                }
+            ]
+        }
+
+    def close(self) -> None:
+        """Close the output file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+__all__ = [
+    "JsonFileSpanExporter",
+    "Span",
+    "TraceHook",
+    "TracingObserver",
+    "add_trace_hook",
+    "current_span",
+    "get_sample_rate",
+    "propagate",
+    "remove_trace_hook",
+    "set_sample_rate",
+    "span_to_otlp",
+    "summarize_arguments",
+]
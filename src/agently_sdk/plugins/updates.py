@@ -0,0 +1,190 @@
+"""
+Atomic updates of plugin variable values.
+
+Plugin.update() changes several variables of a live plugin instance at once.
+Only values that differ from the current ones are validated, and the new
+values are published as a fresh snapshot in a single assignment, so readers
+on other threads see the old configuration or the new one, never a mix.
+
+Updates are serialized by a lock so concurrent updates are not lost; readers
+take no lock. Setting a single variable directly (plugin.port = 8080) stays a
+cheap in-place write, so use update() for changes that race with each other.
+
+Example:
+    ```python
+    def reconnect(plugin, changes):
+        if "endpoint" in changes:
+            plugin.connect()
+
+    SearchPlugin.add_update_listener(reconnect)
+
+    for plugin in live_plugins:
+        plugin.update(endpoint="https://search.internal", timeout=5)
+    ```
+"""
+
+import threading
+import warnings
+from typing import TYPE_CHECKING, Any, Callable, Dict, Mapping, Tuple
+
+from agently_sdk.plugins.caching import clear_owner_caches
+from agently_sdk.plugins.frozen import frozen_error
+from agently_sdk.plugins.overrides import OverlayValues
+
+if TYPE_CHECKING:
+    from agently_sdk.plugins.base import Plugin
+    from agently_sdk.plugins.schema import PluginSchema
+
+# Called with the plugin and its changed values, keyed by variable name
+UpdateListener = Callable[["Plugin", Dict[str, Any]], None]
+
+_update_lock = threading.Lock()
+
+
+def _same(current: Any, value: Any) -> bool:
+    """Whether value would leave a variable unchanged."""
+    if current is value:
+        return True
+    if type(current) is not type(value):
+        return False
+    try:
+        return bool(current == value)
+    except Exception:
+        return False
+
+
+def current_values(plugin: Any) -> Mapping[str, Any]:
+    """Get a plugin's current value snapshot, keyed by storage name."""
+    return plugin._values if hasattr(plugin, "_values") else {}
+
+
+def values_snapshot(plugin: Any, schema: "PluginSchema") -> Dict[str, Any]:
+    """
+    Read the value of every variable of a plugin from a single snapshot.
+
+    Args:
+        plugin: The plugin instance
+        schema: The plugin class schema
+
+    Returns:
+        The values keyed by variable name, with defaults for unset variables
+    """
+    values = current_values(plugin)
+    names = schema.names
+    snapshot = {}
+    for attr, var in schema.variables.items():
+        value = values.get(names[attr], var.default_value)
+        if value is None and var._lazy_default is not None:
+            value = var._lazy_default.get(plugin)
+        snapshot[attr] = value
+    return snapshot
+
+
+def apply_update(plugin: Any, schema: "PluginSchema", changes: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate changed values and publish them in a new snapshot.
+
+    Args:
+        plugin: The plugin instance
+        schema: The plugin class schema
+        changes: New values keyed by variable name
+
+    Returns:
+        The values that differed from the current ones, keyed by variable name
+
+    Raises:
+        ValueError: If a variable is unknown or a changed value is invalid; nothing
+            is changed in that case
+        FrozenPluginError: If the plugin is frozen
+    """
+    if type(plugin)._frozen:
+        raise frozen_error(plugin)
+    variables = schema.variables
+    names = schema.names
+    values = current_values(plugin)
+
+    changed: Dict[str, Any] = {}
+    for name, value in changes.items():
+        var = variables.get(name)
+        if var is None:
+            raise ValueError(f"Unknown variable: {name}")
+        if _same(values.get(names[name], var.default_value), value):
+            continue
+        error = (var._checker or var.checker)(value)
+        if error is not None:
+            raise ValueError(error)
+        changed[name] = value
+
+    if changed:
+        stored = {names[name]: value for name, value in changed.items()}
+        with _update_lock:
+            values = current_values(plugin)
+            if isinstance(values, OverlayValues):
+                # Keep sharing the parent's values of a derived plugin
+                plugin._values = values.updated(stored)
+            else:
+                new_values = dict(values)
+                new_values.update(stored)
+                plugin._values = new_values
+        # Cached function results may depend on the old values
+        clear_owner_caches(plugin)
+    return changed
+
+
+def add_update_listener(cls: type, listener: UpdateListener) -> None:
+    """
+    Call a listener after update() changes an instance of a class or its subclasses.
+
+    Args:
+        cls: The plugin class
+        listener: Called with the plugin and its changed values
+    """
+    with _update_lock:
+        listeners = cls.__dict__.get("_update_listeners", ())
+        # Bypass PluginMeta.__setattr__, listeners are not part of the schema
+        type.__setattr__(cls, "_update_listeners", listeners + (listener,))
+
+
+def remove_update_listener(cls: type, listener: UpdateListener) -> None:
+    """
+    Stop calling a listener added with add_update_listener().
+
+    Args:
+        cls: The plugin class the listener was added to
+        listener: The listener to remove
+    """
+    with _update_lock:
+        listeners: Tuple[UpdateListener, ...] = cls.__dict__.get("_update_listeners", ())
+        remaining = tuple(item for item in listeners if item != listener)
+        type.__setattr__(cls, "_update_listeners", remaining)
+
+
+def notify_update_listeners(plugin: Any, changed: Dict[str, Any]) -> None:
+    """
+    Call the update listeners of a plugin's class and its bases.
+
+    Listener errors are reported as RuntimeWarnings; the update itself has
+    already been applied.
+
+    Args:
+        plugin: The updated plugin instance
+        changed: The changed values, keyed by variable name
+    """
+    for klass in type(plugin).__mro__:
+        for listener in klass.__dict__.get("_update_listeners", ()):
+            try:
+                listener(plugin, dict(changed))
+            except Exception as e:
+                warnings.warn(
+                    f"Update listener {listener!r} failed: {e!r}", RuntimeWarning, stacklevel=3
+                )
+
+
+__all__ = [
+    "UpdateListener",
+    "add_update_listener",
+    "apply_update",
+    "notify_update_listeners",
+    "remove_update_listener",
+    "values_snapshot",
+]
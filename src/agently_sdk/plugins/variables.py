@@ -4,9 +4,56 @@ Plugin variable system for Agently plugins.
 
 # mypy: disable-error-code="assignment"
 
-import re
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple, Type, Union
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+    Type,
+    Union,
+)
+
+from agently_sdk.plugins._typecheck import compile_type_check
+from agently_sdk.plugins._validators import (
+    Checker,
+    Rule,
+    ValidationMemo,
+    compile_checker,
+    compile_validation,
+)
+from agently_sdk.plugins.caching import CacheStats, clear_owner_caches, owner_caches
+from agently_sdk.plugins.spec import type_name
+
+if TYPE_CHECKING:
+    from agently_sdk.plugins.defaults import LazyDefault
+
+
+def _is_class(hint: Any) -> bool:
+    """Whether a type argument is a plain class rather than a nested generic."""
+    return isinstance(hint, type) and hint is not Any and not hasattr(hint, "__origin__")
+
+
+# Attributes that feed into a variable's compiled checker
+_CONSTRAINT_ATTRIBUTES = frozenset(
+    {
+        "default_value",
+        "value_type",
+        "choices",
+        "validator",
+        "validation",
+        "memo_size",
+        "memoize_validator",
+        "default_factory",
+    }
+)
+
+# Attributes that configure a variable's lazily computed default
+_FACTORY_ATTRIBUTES = frozenset({"default_factory", "default_scope"})
 
 
 @dataclass
@@ -36,13 +83,85 @@ class VariableValidation:
             options=["red", "green", "blue"],
             error_message="Value must be one of: red, green, blue"
         )
+
+        # Match an untrusted pattern in time linear in the value length
+        validation = VariableValidation(
+            pattern=tenant_config["pattern"],
+            pattern_mode="linear",
+            max_length=256,
+        )
         ```
+
+    Patterns run on Python's backtracking re engine by default. Set
+    pattern_mode to bound their cost (see plugins.patterns): "safe" rejects
+    patterns that can backtrack catastrophically, "linear" matches with a
+    linear-time automaton. Both refuse values longer than max_length, which
+    defaults to DEFAULT_MAX_LENGTH characters in these modes. Patterns are
+    checked when the validation is created.
     """
 
     options: Optional[List[Any]] = None
     range: Optional[Tuple[Optional[Any], Optional[Any]]] = None
     pattern: Optional[Union[str, Pattern[str]]] = None
     error_message: Optional[str] = None
+    pattern_mode: Optional[str] = None
+    max_length: Optional[int] = None
+
+    # Compiled rule, see the rule property
+    _rule: Optional[Rule] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Reject patterns that cannot be matched in the configured pattern mode."""
+        if self.max_length is not None and self.max_length < 0:
+            raise ValueError("max_length must not be negative")
+        if self.pattern_mode is not None:
+            from agently_sdk.plugins.patterns import PATTERN_MODES
+
+            if self.pattern_mode not in PATTERN_MODES:
+                raise ValueError(
+                    f"Unknown pattern mode: {self.pattern_mode!r}, "
+                    f"expected one of {sorted(PATTERN_MODES)}"
+                )
+            if self.pattern is not None:
+                self.recompile()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Drop the compiled rule when one of the rules is reassigned."""
+        object.__setattr__(self, name, value)
+        if name != "_rule":
+            object.__setattr__(self, "_rule", None)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Leave the compiled rule out of pickles and copies; it is rebuilt on use."""
+        state = dict(self.__dict__)
+        state.pop("_rule", None)
+        return state
+
+    @property
+    def rule(self) -> Rule:
+        """
+        The compiled form of these rules.
+
+        Patterns are compiled once, hashable options are indexed in a frozenset
+        and range bounds that are not set are skipped. The rule is built on first
+        use and rebuilt when a rule is reassigned. It checks a copy of the options,
+        so call recompile() after changing the options list in place.
+        """
+        rule = self._rule
+        if rule is None:
+            rule = self.recompile()
+        return rule
+
+    def recompile(self) -> Rule:
+        """
+        Rebuild the compiled rule, e.g. after changing the options list in place.
+
+        Returns:
+            The new compiled rule
+        """
+        rule = compile_validation(self)
+        object.__setattr__(self, "_rule", rule)
+        return rule
 
     def validate(self, value: Any) -> Tuple[bool, Optional[str]]:
         """
@@ -54,35 +173,7 @@ class VariableValidation:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        if self.options is not None and value not in self.options:
-            return False, self.error_message or f"Value must be one of: {self.options}"
-
-        if self.range is not None:
-            min_val, max_val = self.range
-            if min_val is not None and value < min_val:
-                return False, self.error_message or f"Value must be >= {min_val}"
-            if max_val is not None and value > max_val:
-                return False, self.error_message or f"Value must be <= {max_val}"
-
-        if self.pattern is not None:
-            if not isinstance(value, str):
-                return (
-                    False,
-                    self.error_message or "Value must be a string for pattern validation",
-                )
-
-            # Convert string pattern to compiled pattern if needed
-            pattern = self.pattern
-            if isinstance(pattern, str):
-                pattern = re.compile(pattern)
-
-            if not pattern.match(value):
-                return (
-                    False,
-                    self.error_message or f"Value must match pattern: {self.pattern}",
-                )
-
-        return True, None
+        return (self._rule or self.rule)(value)
 
 
 class PluginVariable:
@@ -123,6 +214,22 @@ class PluginVariable:
                 default="blue",
                 validation=VariableValidation(options=["red", "green", "blue"])
             )
+
+            # Remember up to 1024 valid values, e.g. URLs repeated across configs
+            endpoint = PluginVariable(
+                name="endpoint",
+                description="Service URL",
+                default="https://api.example.com",
+                validation=VariableValidation(pattern=r"^https://"),
+                memo_size=1024,
+            )
+
+            # Load the table on first read instead of when the module is imported
+            countries = PluginVariable(
+                name="countries",
+                description="Country names by ISO code",
+                default_factory=load_country_table,
+            )
         ```
     """
 
@@ -135,6 +242,10 @@ class PluginVariable:
         validator: Optional[Callable[[Any], bool]] = None,
         validation: Optional[VariableValidation] = None,
         sensitive: bool = False,
+        memo_size: Optional[int] = None,
+        memoize_validator: bool = False,
+        default_factory: Optional[Callable[[], Any]] = None,
+        default_scope: str = "process",
         # Backward compatibility parameters
         default_value: Optional[Any] = None,
         value_type: Optional[Type] = None,
@@ -151,21 +262,56 @@ class PluginVariable:
             validator: Custom validation function
             validation: Validation rules for the variable
             sensitive: Whether the variable contains sensitive information
+            memo_size: Remember up to this many valid values so they are not checked
+                again; only strings, numbers, bytes and enum members are remembered
+            memoize_validator: Use the memo even though a custom validator is set,
+                i.e. the validator's result depends on the value alone
+            default_factory: Function computing the default on first read instead of
+                default, for defaults that are expensive to build; its result is validated
+                when it is computed
+            default_scope: How widely a default_factory result is shared: "process",
+                "class" (computed once per plugin class) or "instance"
             default_value: (Deprecated) Use default instead
             value_type: (Deprecated) Use type instead
             name: Name of the variable (optional, will be set from class attribute name)
+
+        Raises:
+            ValueError: If memo_size is less than 1, the default value is invalid, both
+                a default and a default_factory are given or default_scope is unknown
+            TypeError: If default_factory is not callable
         """
+        if memo_size is not None and memo_size < 1:
+            raise ValueError("memo_size must be at least 1")
+        if default_factory is not None:
+            from agently_sdk.plugins.defaults import DEFAULT_SCOPES
+
+            if not callable(default_factory):
+                raise TypeError("default_factory must be callable")
+            if default is not None or default_value is not None:
+                raise ValueError("Cannot specify both default and default_factory")
+            if default_scope not in DEFAULT_SCOPES:
+                raise ValueError(
+                    f"Unknown default scope: {default_scope!r}, "
+                    f"expected one of {sorted(DEFAULT_SCOPES)}"
+                )
+        self._checker: Optional[Checker] = None
+        self._memo: Optional[ValidationMemo] = None
+        self._lazy_default: Optional["LazyDefault"] = None
         self.name = name
         self.description = description
 
         # Handle backward compatibility
         self.default_value = default if default is not None else default_value
+        self.default_scope = default_scope
+        self.default_factory = default_factory
         self.value_type = type if type is not None else value_type
 
         self.choices = choices
         self.validator = validator
         self.validation = validation
         self.sensitive = sensitive
+        self.memo_size = memo_size
+        self.memoize_validator = memoize_validator
 
         # If choices are provided but no validation, create a validation object
         if self.choices is not None and self.validation is None:
@@ -175,6 +321,72 @@ class PluginVariable:
         if self.default_value is not None:
             self.validate(self.default_value)
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Drop the compiled checker when a constraint of this variable changes."""
+        object.__setattr__(self, name, value)
+        if name in _CONSTRAINT_ATTRIBUTES:
+            object.__setattr__(self, "_checker", None)
+            object.__setattr__(self, "_memo", None)
+        if name in _FACTORY_ATTRIBUTES:
+            # A new LazyDefault starts over without the computed defaults. Read with
+            # getattr, as self.__dict__ would give up CPython's inline attribute storage
+            factory = getattr(self, "default_factory", None)
+            lazy = None
+            if factory is not None:
+                from agently_sdk.plugins.defaults import LazyDefault
+
+                lazy = LazyDefault(self, factory, getattr(self, "default_scope", "process"))
+            object.__setattr__(self, "_lazy_default", lazy)
+
+    @property
+    def checker(self) -> Checker:
+        """
+        The compiled checker for this variable's constraints.
+
+        The checker takes a value and returns None if it is valid, or an error
+        message if it is not. It is generated on first use and regenerated
+        whenever one of the variable's constraints is reassigned.
+        """
+        checker = self._checker
+        if checker is None:
+            checker = compile_checker(self)
+            if self._memoized:
+                memo = ValidationMemo(checker, self.memo_size)  # type: ignore[arg-type]
+                object.__setattr__(self, "_memo", memo)
+                checker = memo.check
+            object.__setattr__(self, "_checker", checker)
+        return checker
+
+    @property
+    def _memoized(self) -> bool:
+        # Custom validators may depend on more than the value, so they have to opt in
+        return self.memo_size is not None and (self.validator is None or self.memoize_validator)
+
+    def memo_stats(self) -> Optional[CacheStats]:
+        """
+        Get the statistics of this variable's memo of valid values.
+
+        The memo starts over whenever a constraint of the variable is reassigned.
+
+        Returns:
+            The memo's statistics, or None if the variable has no memo
+        """
+        if not self._memoized:
+            return None
+        if self._memo is None:
+            self.checker  # Compiling the checker creates the memo
+        return self._memo.stats()  # type: ignore[union-attr]
+
+    def clear_memo(self) -> None:
+        """Forget the remembered valid values, e.g. after changing validation rules in place."""
+        if self._memo is not None:
+            self._memo.clear()
+
+    def reset_default(self) -> None:
+        """Forget the defaults computed by default_factory, so it runs again on the next reads."""
+        if self._lazy_default is not None:
+            self._lazy_default.reset()
+
     def validate(self, value: Any) -> Tuple[bool, Optional[str]]:
         """
         Validate a value against this variable's constraints.
@@ -185,13 +397,31 @@ class PluginVariable:
         Returns:
             A tuple of (is_valid, error_message)
         """
+        error = (self._checker or self.checker)(value)
+        if error is None:
+            return True, None
+        return False, error
+
+    def _explain(self, value: Any) -> Optional[str]:
+        """
+        Check a value against every constraint in order and describe the first failure.
+
+        This is the reference implementation the compiled checker defers to when
+        a value fails one of its checks.
+
+        Args:
+            value: The value to check
+
+        Returns:
+            The error message for the first failing constraint, or None if the value is valid
+        """
         # Check if value is required
-        if value is None and self.default_value is None:
-            return False, f"Variable '{self.name}' is required but no value was provided"
+        if value is None and self.default_value is None and self.default_factory is None:
+            return f"Variable '{self.name}' is required but no value was provided"
 
         # If value is None and there is a default, it's valid
         if value is None:
-            return True, None
+            return None
 
         # Type validation
         try:
@@ -202,60 +432,69 @@ class PluginVariable:
                     origin = self.value_type.__origin__
                     args = self.value_type.__args__
 
-                    if origin == list:
+                    if origin == list and _is_class(args[0]):
                         if not isinstance(value, list):
-                            return False, f"Variable '{self.name}' must be a list"
+                            return f"Variable '{self.name}' must be a list"
                         # Validate each item in the list
                         for item in value:
                             if not isinstance(item, args[0]):
                                 return (
-                                    False,
-                                    f"List items in '{self.name}' must be of type {args[0].__name__}",
+                                    f"List items in '{self.name}' must be of type "
+                                    f"{args[0].__name__}"
                                 )
 
-                    elif origin == dict:
+                    elif origin == dict and _is_class(args[0]) and _is_class(args[1]):
                         if not isinstance(value, dict):
-                            return False, f"Variable '{self.name}' must be a dictionary"
+                            return f"Variable '{self.name}' must be a dictionary"
                         # Validate dict key and value types
                         for k, v in value.items():
                             if not isinstance(k, args[0]):
                                 return (
-                                    False,
-                                    f"Dictionary keys in '{self.name}' must be of type {args[0].__name__}",
+                                    f"Dictionary keys in '{self.name}' must be of type "
+                                    f"{args[0].__name__}"
                                 )
                             if not isinstance(v, args[1]):
                                 return (
-                                    False,
-                                    f"Dictionary values in '{self.name}' must be of type {args[1].__name__}",
+                                    f"Dictionary values in '{self.name}' must be of type "
+                                    f"{args[1].__name__}"
                                 )
+
+                    else:
+                        # Nested generics, Optional, Union, Tuple, Set, Literal, ...
+                        check_type = compile_type_check(self.value_type)
+                        if check_type is not None and not check_type(value):
+                            return (
+                                f"Variable '{self.name}' must be of type "
+                                f"{type_name(self.value_type)}, got {type(value).__name__}"
+                            )
                 else:
                     if not isinstance(value, self.value_type):
                         return (
-                            False,
-                            f"Variable '{self.name}' must be of type {self.value_type.__name__}, got {type(value).__name__}",
+                            f"Variable '{self.name}' must be of type "
+                            f"{self.value_type.__name__}, got {type(value).__name__}"
                         )
         except Exception as e:
-            return False, f"Type validation error for '{self.name}': {str(e)}"
+            return f"Type validation error for '{self.name}': {str(e)}"
 
         # Check structured validation if specified
         if self.validation is not None:
             is_valid, error_message = self.validation.validate(value)
             if not is_valid:
-                return False, f"Variable '{self.name}' failed validation: {error_message}"
+                return f"Variable '{self.name}' failed validation: {error_message}"
 
         # Check choices constraint if specified (for backward compatibility)
         if self.choices is not None and value not in self.choices:
-            return False, f"Variable '{self.name}' must be one of {self.choices}, got {value}"
+            return f"Variable '{self.name}' must be one of {self.choices}, got {value}"
 
         # Check custom validator if specified
         if self.validator is not None:
             try:
                 if not self.validator(value):
-                    return False, f"Variable '{self.name}' failed custom validation: {value}"
+                    return f"Variable '{self.name}' failed custom validation: {value}"
             except Exception as e:
-                return False, f"Custom validation error for '{self.name}': {str(e)}"
+                return f"Custom validation error for '{self.name}': {str(e)}"
 
-        return True, None
+        return None
 
     def __get__(self, obj: Any, objtype: Optional[Type] = None) -> Any:
         """
@@ -299,13 +538,17 @@ class PluginVariable:
             obj._values = {}
 
         # Validate the value
-        is_valid, error = self.validate(value)
-        if not is_valid:
+        error = (self._checker or self.checker)(value)
+        if error is not None:
             raise ValueError(error)
 
         # Store the value in the _values dictionary
         obj._values[self.name] = value
 
+        # Cached function results may depend on the old value
+        if id(obj) in owner_caches:
+            clear_owner_caches(obj)
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert this variable to a dictionary representation.
@@ -350,6 +593,12 @@ class PluginVariable:
             if self.validation.error_message is not None:
                 validation_info["error_message"] = self.validation.error_message
 
+            if self.validation.pattern_mode is not None:
+                validation_info["pattern_mode"] = self.validation.pattern_mode
+
+            if self.validation.max_length is not None:
+                validation_info["max_length"] = self.validation.max_length
+
             if validation_info:
                 result["validation"] = validation_info  # type: ignore
 
@@ -0,0 +1,273 @@
+"""
+On-disk plugin manifests.
+
+A manifest holds the get_plugin_info() metadata of every plugin class in a
+module, together with a fingerprint of the module source (path, mtime, size
+and SHA-256 hash). load_plugin_info() answers from the manifest while the
+fingerprint matches, without importing the module, and falls back to
+importing and reflecting (refreshing the manifest) when it does not.
+
+Manifests are plain JSON, so values that JSON cannot represent are stored as
+their repr() and tuples come back as lists.
+
+Manifests for a whole package can be built ahead of time, e.g. during a
+container build:
+
+    python -m agently_sdk.utils.manifest build my_plugins --cache-dir /app/manifests
+
+The cache directory defaults to $AGENTLY_MANIFEST_DIR, or agently_sdk/manifests
+under the user cache directory.
+"""
+
+import argparse
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import pkgutil
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from agently_sdk._version import __version__
+from agently_sdk.plugins.base import Plugin
+from agently_sdk.plugins.registry import find_module_source
+from agently_sdk.utils.testing import get_plugin_info
+
+# Bumped whenever the manifest layout changes
+MANIFEST_FORMAT = 1
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+def default_cache_dir() -> Path:
+    """Get the directory manifests are stored in when no other is given."""
+    configured = os.environ.get("AGENTLY_MANIFEST_DIR")
+    if configured:
+        return Path(configured)
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+    return Path(cache_home).expanduser() / "agently_sdk" / "manifests"
+
+
+def _cache_dir(cache_dir: Optional[PathLike]) -> Path:
+    return Path(cache_dir) if cache_dir is not None else default_cache_dir()
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_fingerprint(path: str) -> Dict[str, Any]:
+    """
+    Fingerprint a module source file.
+
+    Args:
+        path: The source file
+
+    Returns:
+        The file's path, mtime in nanoseconds, size and SHA-256 hash
+    """
+    stat = os.stat(path)
+    return {
+        "path": os.path.abspath(path),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": _hash_file(path),
+    }
+
+
+def _fingerprint_matches(recorded: Dict[str, Any], path: str) -> bool:
+    """Check a recorded fingerprint, hashing the file only if mtime or size changed."""
+    if recorded.get("path") != os.path.abspath(path):
+        return False
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    if stat.st_mtime_ns == recorded.get("mtime_ns") and stat.st_size == recorded.get("size"):
+        return True
+    # Copies (e.g. into a container image) change the mtime but not the content
+    return stat.st_size == recorded.get("size") and _hash_file(path) == recorded.get("sha256")
+
+
+def build_module_manifest(module: str) -> Dict[str, Any]:
+    """
+    Import a module and build the manifest of the plugin classes it defines.
+
+    Args:
+        module: The dotted module name
+
+    Returns:
+        The manifest: format, SDK version, source fingerprint and plugin info by class name
+
+    Raises:
+        ValueError: If the module has no Python source file
+    """
+    mod = importlib.import_module(module)
+    path = getattr(mod, "__file__", None)
+    if not path or not path.endswith(".py"):
+        raise ValueError(f"Module has no Python source: {module}")
+
+    plugins = {}
+    for name, obj in inspect.getmembers(mod, inspect.isclass):
+        if issubclass(obj, Plugin) and obj is not Plugin and obj.__module__ == module:
+            plugins[name] = get_plugin_info(obj)
+
+    return {
+        "format": MANIFEST_FORMAT,
+        "sdk_version": __version__,
+        "module": module,
+        "source": source_fingerprint(path),
+        "plugins": plugins,
+    }
+
+
+def write_manifest(module: str, cache_dir: Optional[PathLike] = None) -> Path:
+    """
+    Build and store the manifest of a module.
+
+    Args:
+        module: The dotted module name
+        cache_dir: The manifest directory, defaults to default_cache_dir()
+
+    Returns:
+        The path of the manifest file
+    """
+    manifest = build_module_manifest(module)
+    directory = _cache_dir(cache_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    path = directory / f"{module}.json"
+    temp_path = directory / f"{module}.json.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True, default=repr)
+        f.write("\n")
+    os.replace(temp_path, path)
+    return path
+
+
+def read_manifest(module: str, cache_dir: Optional[PathLike] = None) -> Optional[Dict[str, Any]]:
+    """
+    Read the manifest of a module, if it is still up to date. Nothing is imported.
+
+    Args:
+        module: The dotted module name
+        cache_dir: The manifest directory, defaults to default_cache_dir()
+
+    Returns:
+        The manifest, or None if there is none or the module source has changed
+    """
+    path = _cache_dir(cache_dir) / f"{module}.json"
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get("format") != MANIFEST_FORMAT or manifest.get("sdk_version") != __version__:
+        return None
+    source = find_module_source(module)
+    if source is None or not _fingerprint_matches(manifest.get("source", {}), source):
+        return None
+    return manifest  # type: ignore[no-any-return]
+
+
+def load_plugin_info(target: str, cache_dir: Optional[PathLike] = None) -> Dict[str, Any]:
+    """
+    Get the get_plugin_info() metadata of a plugin class, preferring its manifest.
+
+    Args:
+        target: The plugin class as "module:Class"
+        cache_dir: The manifest directory, defaults to default_cache_dir()
+
+    Returns:
+        Dict[str, Any]: The plugin metadata
+
+    Raises:
+        ValueError: If target is malformed or does not name a plugin class in the module
+    """
+    module, _, attribute = target.partition(":")
+    if not module or not attribute:
+        raise ValueError(f"Plugin target must be 'module:Class', got: {target}")
+
+    manifest = read_manifest(module, cache_dir)
+    if manifest is None or attribute not in manifest["plugins"]:
+        write_manifest(module, cache_dir)
+        manifest = read_manifest(module, cache_dir)
+
+    if manifest is None or attribute not in manifest["plugins"]:
+        raise ValueError(f"No plugin class {attribute} in module {module}")
+    return manifest["plugins"][attribute]  # type: ignore[no-any-return]
+
+
+def build_package_manifests(package: str, cache_dir: Optional[PathLike] = None) -> List[Path]:
+    """
+    Build the manifests of every module in a package that defines plugins.
+
+    Args:
+        package: The dotted package (or module) name
+        cache_dir: The manifest directory, defaults to default_cache_dir()
+
+    Returns:
+        The paths of the manifest files written
+    """
+    root = importlib.import_module(package)
+    modules = [package]
+    search_path = getattr(root, "__path__", None)
+    if search_path is not None:
+        modules.extend(
+            info.name for info in pkgutil.walk_packages(search_path, prefix=f"{package}.")
+        )
+
+    written = []
+    for module in modules:
+        mod = importlib.import_module(module)
+        if not str(getattr(mod, "__file__", "") or "").endswith(".py"):
+            continue
+        defines_plugins = any(
+            issubclass(obj, Plugin) and obj is not Plugin and obj.__module__ == module
+            for _, obj in inspect.getmembers(mod, inspect.isclass)
+        )
+        if defines_plugins:
+            written.append(write_manifest(module, cache_dir))
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point: build manifests ahead of time."""
+    parser = argparse.ArgumentParser(
+        prog="python -m agently_sdk.utils.manifest",
+        description="Prebuild Agently plugin manifests",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="build the manifests of packages")
+    build.add_argument("packages", nargs="+", help="packages to scan for plugins")
+    build.add_argument("--cache-dir", help="manifest directory (default: the user cache)")
+    args = parser.parse_args(argv)
+
+    cache_dir = args.cache_dir or default_cache_dir()
+    for package in args.packages:
+        for path in build_package_manifests(package, cache_dir):
+            print(path)
+    return 0
+
+
+__all__ = [
+    "MANIFEST_FORMAT",
+    "build_module_manifest",
+    "build_package_manifests",
+    "default_cache_dir",
+    "load_plugin_info",
+    "read_manifest",
+    "source_fingerprint",
+    "write_manifest",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,18 +19,21 @@ def get_plugin_info(plugin_class: Type[Plugin]) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: A dictionary containing plugin metadata.
     """
-    variables = plugin_class.get_plugin_variables()
-    variable_info = {name: var.to_dict() for name, var in variables.items()}
+    schema = plugin_class.get_plugin_schema()
+    variable_info = {name: var.to_dict() for name, var in schema.public_variables.items()}
 
-    # Get kernel functions directly from the class
-    functions = plugin_class.get_kernel_functions()
-    function_names = list(functions.keys())
+    # Get kernel functions from the cached class schema
+    function_names = list(schema.functions)
+    function_specs = {
+        name: spec.to_dict() for name, spec in plugin_class.get_function_specs().items()
+    }
 
     return {
         "name": plugin_class.name,
         "description": plugin_class.description,
         "variables": variable_info,
         "functions": function_names,
+        "function_specs": function_specs,
     }
 
 
@@ -0,0 +1,85 @@
+"""
+Tests for bulk plugin instantiation.
+"""
+
+import pytest
+
+from agently_sdk.plugins import Plugin, PluginConfigError, PluginVariable, kernel_function
+
+
+class TenantPlugin(Plugin):
+    """Plugin with required and optional variables."""
+
+    name = "tenant_plugin"
+    description = "A plugin configured per tenant"
+
+    tenant = PluginVariable(description="Tenant identifier", type=str)
+    limit = PluginVariable(description="Request limit", type=int, default=10)
+
+    @kernel_function
+    def describe(self) -> str:
+        """Describe the configuration."""
+        return f"{self.tenant}:{self.limit}"
+
+
+def test_from_configs_creates_instances():
+    """Test that from_configs creates one configured instance per config."""
+    plugins = TenantPlugin.from_configs([{"tenant": "a"}, {"tenant": "b", "limit": 5}])
+
+    assert [p.describe() for p in plugins] == ["a:10", "b:5"]
+    assert all(isinstance(p, TenantPlugin) for p in plugins)
+
+
+def test_from_configs_reports_every_error():
+    """Test that every invalid configuration is reported with its index."""
+    configs = [
+        {"tenant": "ok"},
+        {"limit": 5},
+        {"tenant": 3, "limit": "many"},
+        {"tenant": "x", "unknown": 1},
+    ]
+
+    with pytest.raises(PluginConfigError) as excinfo:
+        TenantPlugin.from_configs(configs, chunk_size=2)
+
+    errors = excinfo.value.errors
+    assert [(e.index, e.variable) for e in errors] == [
+        (1, "tenant"),
+        (2, "limit"),
+        (2, "tenant"),
+        (3, "unknown"),
+    ]
+    assert errors[0].message == "Required variable not provided: tenant"
+    assert "must be of type int" in errors[1].message
+
+
+def test_iter_configs_streams_results():
+    """Test that iter_configs consumes its input lazily and yields per-config results."""
+    consumed = []
+
+    def configs():
+        for i in range(10):
+            consumed.append(i)
+            yield {"tenant": f"t{i}"} if i != 3 else {}
+
+    results = TenantPlugin.iter_configs(configs(), chunk_size=4)
+    first = next(results)
+
+    assert first.ok and first.plugin.tenant == "t0"
+    assert consumed == [0, 1, 2, 3]
+
+    rest = list(results)
+    assert [r.index for r in rest] == list(range(1, 10))
+    assert not rest[2].ok and rest[2].plugin is None
+
+
+def test_iter_configs_uses_custom_init():
+    """Test that subclasses overriding __init__ are constructed through it."""
+
+    class SetupPlugin(TenantPlugin):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.ready = True
+
+    plugins = SetupPlugin.from_configs([{"tenant": "a"}])
+    assert plugins[0].ready is True
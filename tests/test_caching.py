@@ -0,0 +1,155 @@
+"""
+Tests for plugin function result caching.
+"""
+
+import asyncio
+import gc
+
+import pytest
+
+from agently_sdk.plugins import CachePolicy, Plugin, PluginVariable, agently_function
+from agently_sdk.plugins.caching import _MISSING, ResultCache
+
+
+class LookupPlugin(Plugin):
+    """Plugin with cached lookups."""
+
+    name = "lookup_plugin"
+    description = "A plugin with cached functions"
+
+    prefix = PluginVariable(description="Result prefix", default="v")
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = []
+
+    @agently_function(cache=CachePolicy(maxsize=2))
+    def lookup(self, key: str, options: dict = None) -> str:
+        """Cached lookup."""
+        self.calls.append(key)
+        return f"{self.prefix}:{key}"
+
+    @agently_function(cache=CachePolicy())
+    async def fetch(self, key: str) -> str:
+        """Cached async lookup."""
+        self.calls.append(key)
+        await asyncio.sleep(0)
+        return key.upper()
+
+
+def test_cache_hits_per_instance():
+    """Test that results are cached per instance, keyed on normalized arguments."""
+    plugin = LookupPlugin()
+    other = LookupPlugin(prefix="w")
+
+    assert plugin.lookup("a") == "v:a"
+    assert plugin.lookup(key="a") == "v:a"
+    assert plugin.lookup("a", None) == "v:a"
+    assert other.lookup("a") == "w:a"
+    assert plugin.calls == ["a"]
+    assert other.calls == ["a"]
+
+    assert plugin.lookup("b", options={"x": [1, 2]}) == "v:b"
+    assert plugin.lookup("b", options={"x": [1, 2]}) == "v:b"
+    assert plugin.calls == ["a", "b"]
+
+    stats = plugin.get_cache_stats()["lookup"]
+    assert (stats.hits, stats.misses, stats.size) == (3, 2, 2)
+    assert stats.hit_rate == pytest.approx(0.6)
+
+
+def test_cache_keys_are_typed():
+    """Test that equal values of different types, also inside containers, get separate entries."""
+    plugin = LookupPlugin()
+    for options in ({"x": [1]}, {"x": [True]}, {"x": [1.0]}, {1: "a"}, {True: "a"}):
+        plugin.lookup("k", options=options)
+        plugin.lookup("k", options=options)
+
+    stats = plugin.get_cache_stats()["lookup"]
+    assert (stats.hits, stats.misses) == (5, 5)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_config_changes_clear_the_cache(compact):
+    """Test that assigning a variable or update() drops results computed with the old config."""
+
+    class ConfiguredPlugin(LookupPlugin, compact=compact):
+        name = "configured_plugin"
+
+    plugin = ConfiguredPlugin()
+    other = ConfiguredPlugin()
+    assert plugin.lookup("a") == "v:a"
+    assert other.lookup("a") == "v:a"
+
+    plugin.prefix = "w"
+    assert plugin.lookup("a") == "w:a"
+    plugin.update(prefix="x")
+    assert plugin.lookup("a") == "x:a"
+    assert plugin.get_cache_stats()["lookup"].misses == 3
+
+    # Other instances keep their results
+    assert other.lookup("a") == "v:a"
+    assert other.get_cache_stats()["lookup"].hits == 1
+
+
+def test_cache_lru_eviction_and_clear():
+    """Test LRU eviction statistics and clearing."""
+    plugin = LookupPlugin()
+    plugin.lookup("a")
+    plugin.lookup("b")
+    plugin.lookup("a")
+    plugin.lookup("c")  # evicts "b"
+    plugin.lookup("b")
+
+    assert plugin.calls == ["a", "b", "c", "b"]
+    assert plugin.get_cache_stats()["lookup"].evictions == 2
+
+    plugin.clear_caches()
+    plugin.lookup("a")
+    assert plugin.calls[-1] == "a"
+
+
+def test_cache_ttl_expiry():
+    """Test that results expire after their ttl."""
+    now = [0.0]
+    cache = ResultCache(CachePolicy(ttl=10), clock=lambda: now[0])
+
+    cache.put("k", 1)
+    assert cache.get("k") == 1
+    now[0] = 11.0
+    assert cache.get("k") is _MISSING
+    assert cache.stats().expirations == 1
+
+
+def test_async_cache():
+    """Test caching of async functions."""
+    plugin = LookupPlugin()
+
+    async def run():
+        return [await plugin.fetch("a"), await plugin.fetch("a")]
+
+    assert asyncio.run(run()) == ["A", "A"]
+    assert plugin.calls == ["a"]
+    assert plugin.get_cache_stats()["fetch"].hits == 1
+
+
+def test_cache_released_with_instance():
+    """Test that caches do not keep plugin instances or their results alive."""
+    cached = LookupPlugin.lookup._cached_function
+    plugin = LookupPlugin()
+    plugin.lookup("a")
+    assert len(cached._caches) >= 1
+    before = len(cached._caches)
+
+    del plugin
+    gc.collect()
+    assert len(cached._caches) == before - 1
+
+
+def test_cache_rejects_generators():
+    """Test that generator functions cannot be cached."""
+    with pytest.raises(TypeError):
+
+        @agently_function(cache=CachePolicy())
+        def numbers():
+            yield 1
@@ -2,6 +2,8 @@
 Tests for the decorators module.
 """
 
+import inspect
+
 import pytest
 
 from agently_sdk.plugins.decorators import agently_function, kernel_function
@@ -135,3 +137,79 @@ def test_semantic_kernel_integration():
 
     except ImportError:
         pytest.skip("semantic_kernel not available, skipping integration test")
+
+
+def test_agently_function_preserves_function_kind():
+    """Test that coroutine functions and generators stay recognizable after decoration."""
+    import asyncio
+
+    from agently_sdk.plugins.decorators import FunctionKind
+
+    @agently_function
+    async def async_func(x: int) -> int:
+        """Async function."""
+        return x + 1
+
+    @agently_function
+    async def async_gen(n: int):
+        """Async generator."""
+        for i in range(n):
+            yield i
+
+    @agently_function
+    def gen(n: int):
+        """Generator."""
+        yield from range(n)
+
+    @agently_function
+    def sync_func(x: int) -> int:
+        """Sync function."""
+        return x
+
+    assert inspect.iscoroutinefunction(async_func)
+    assert inspect.isasyncgenfunction(async_gen)
+    assert inspect.isgeneratorfunction(gen)
+    assert not inspect.iscoroutinefunction(sync_func)
+
+    assert async_func._function_kind is FunctionKind.ASYNC
+    assert async_gen._function_kind is FunctionKind.ASYNC_GENERATOR
+    assert gen._function_kind is FunctionKind.GENERATOR
+    assert sync_func._function_kind is FunctionKind.SYNC
+
+    async def collect():
+        return [item async for item in async_gen(3)]
+
+    assert asyncio.run(async_func(1)) == 2
+    assert asyncio.run(collect()) == [0, 1, 2]
+    assert list(gen(3)) == [0, 1, 2]
+
+
+def test_agently_function_marks_in_place_by_default():
+    """Test that decoration returns the original function unless wrap=True."""
+
+    def original(x: int) -> int:
+        """Original function."""
+        return x
+
+    assert agently_function(original) is original
+    assert original._is_agently_function is True
+
+    def other(x: int) -> int:
+        """Another function."""
+        return x
+
+    wrapped = agently_function(wrap=True)(other)
+    assert wrapped is not other
+    assert wrapped.__wrapped__ is other
+    assert wrapped._is_agently_function is True
+    assert not hasattr(other, "_is_agently_function")
+    assert wrapped(3) == 3
+
+
+def test_agently_function_wraps_callables_without_attributes():
+    """Test that callables that reject attributes are wrapped instead."""
+    decorated = agently_function(len)
+
+    assert decorated is not len
+    assert decorated._is_agently_function is True
+    assert decorated([1, 2]) == 2
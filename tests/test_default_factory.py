@@ -0,0 +1,173 @@
+"""
+Tests for lazily computed variable defaults.
+"""
+
+import threading
+import time
+
+import pytest
+
+from agently_sdk.plugins import Plugin, PluginVariable
+from agently_sdk.plugins.storage import CompactVariable, LazyCompactVariable
+
+
+class Counter:
+    """Factory counting its calls."""
+
+    def __init__(self, value=None):
+        self.calls = 0
+        self.value = value
+
+    def __call__(self):
+        self.calls += 1
+        return self.value if self.value is not None else {"calls": self.calls}
+
+
+def _plugin(factory, scope="process", **kwargs):
+    class TablePlugin(Plugin, **kwargs):
+        name = "table_plugin"
+        description = "Has an expensive default"
+
+        table = PluginVariable(
+            description="Lookup table", type=dict, default_factory=factory, default_scope=scope
+        )
+
+    return TablePlugin
+
+
+def test_factory_runs_on_first_read():
+    """Test that the factory runs when the default is read, not when the class is created."""
+    factory = Counter()
+    TablePlugin = _plugin(factory)
+    plugin = TablePlugin()
+    assert factory.calls == 0
+
+    assert plugin.table == {"calls": 1}
+    assert plugin.table is plugin.table
+    assert factory.calls == 1
+
+    # Configured values do not need the default
+    assert TablePlugin(table={"a": 1}).table == {"a": 1}
+    assert factory.calls == 1
+    assert "table" not in TablePlugin.get_plugin_schema().required
+
+
+@pytest.mark.parametrize(
+    "scope, calls",
+    [("process", 1), ("class", 2), ("instance", 4)],
+)
+def test_scopes(scope, calls):
+    """Test how widely a computed default is shared in each scope."""
+    factory = Counter()
+    TablePlugin = _plugin(factory, scope)
+
+    class ChildPlugin(TablePlugin):
+        name = "child_plugin"
+
+    plugins = [TablePlugin(), TablePlugin(), ChildPlugin(), ChildPlugin()]
+    for plugin in plugins:
+        assert plugin.table == plugin.table
+
+    assert factory.calls == calls
+    assert len({id(plugin.table) for plugin in plugins}) == calls
+
+
+def test_factory_result_is_validated():
+    """Test that invalid factory results are rejected on read and not kept."""
+    factory = Counter(value=["not", "a", "dict"])
+    plugin = _plugin(factory)()
+
+    with pytest.raises(ValueError, match="must be of type dict"):
+        plugin.table
+    factory.value = {"ok": True}
+    assert plugin.table == {"ok": True}
+    assert factory.calls == 2
+
+    with pytest.raises(ValueError, match="returned None"):
+        _plugin(lambda: None)().table
+
+
+def test_factory_runs_once_across_threads():
+    """Test that concurrent first reads share a single factory call."""
+    calls = []
+
+    def slow_factory():
+        calls.append(1)
+        time.sleep(0.05)
+        return {"loaded": True}
+
+    plugin = _plugin(slow_factory)()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(plugin.table)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_recursive_factory_is_reported():
+    """Test that a factory reading its own default raises instead of deadlocking."""
+    holder = {}
+    TablePlugin = _plugin(lambda: holder["plugin"].table)
+    holder["plugin"] = TablePlugin()
+    with pytest.raises(RuntimeError, match="reads its own default"):
+        holder["plugin"].table
+
+
+def test_reset_default():
+    """Test that reset_default() and reassigning the factory start over."""
+    factory = Counter()
+    TablePlugin = _plugin(factory)
+    plugin = TablePlugin()
+    assert plugin.table == {"calls": 1}
+
+    TablePlugin.table.reset_default()
+    assert plugin.table == {"calls": 2}
+
+    TablePlugin.table.default_factory = lambda: {"new": True}
+    assert plugin.table == {"new": True}
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"compact": True}, {"frozen": True}])
+def test_storage_layouts(kwargs):
+    """Test lazy defaults with regular, compact and frozen storage."""
+    factory = Counter()
+    TablePlugin = _plugin(factory, "instance", **kwargs)
+    plugin = TablePlugin()
+    assert factory.calls == 0
+
+    assert plugin.get_values() == {"table": {"calls": 1}}
+    assert plugin.table == {"calls": 1}
+    assert TablePlugin(table={"a": 1}).table == {"a": 1}
+    assert factory.calls == 1
+    if kwargs.get("frozen"):
+        assert plugin.__dict__ == {"table": {"calls": 1}}
+
+
+def test_only_factory_variables_check_for_lazy_defaults():
+    """Test that other variables of a compact plugin keep the plain descriptor."""
+
+    class MixedPlugin(Plugin, compact=True):
+        name = "mixed_plugin"
+        description = "Has one lazy default"
+
+        table = PluginVariable(description="Lookup table", type=dict, default_factory=dict)
+        region = PluginVariable(description="Region", type=str, default="eu")
+
+    MixedPlugin.get_plugin_schema()
+    assert type(MixedPlugin.__dict__["table"]) is LazyCompactVariable
+    assert type(MixedPlugin.__dict__["region"]) is CompactVariable
+    assert (MixedPlugin().table, MixedPlugin().region) == ({}, "eu")
+
+
+def test_invalid_arguments():
+    """Test that conflicting or unknown factory settings are rejected."""
+    with pytest.raises(ValueError, match="both default and default_factory"):
+        PluginVariable(description="d", default={}, default_factory=dict)
+    with pytest.raises(ValueError, match="Unknown default scope"):
+        PluginVariable(description="d", default_factory=dict, default_scope="thread")
+    with pytest.raises(TypeError, match="callable"):
+        PluginVariable(description="d", default_factory={})
@@ -0,0 +1,131 @@
+"""
+Tests for frozen plugins.
+"""
+
+import copy
+import pickle
+
+import pytest
+
+from agently_sdk.plugins import FrozenPluginError, Plugin, PluginVariable, kernel_function
+from agently_sdk.plugins.process import _build_plugin
+
+
+class FrozenPlugin(Plugin, frozen=True):
+    """Plugin with a frozen configuration."""
+
+    name = "frozen_plugin"
+    description = "A frozen plugin"
+
+    region = PluginVariable(description="Region", type=str, default="us")
+    limit = PluginVariable(description="Limit", type=int, default=10)
+    token = PluginVariable(description="Required token", type=str)
+
+    @kernel_function
+    def describe(self) -> str:
+        """Describe the configuration."""
+        return f"{self.region}:{self.limit}:{self.token}"
+
+
+def test_values_are_plain_instance_attributes():
+    """Test that every value, defaults included, is stored on the instance."""
+    plugin = FrozenPlugin(token="t", limit=3)
+
+    assert plugin.__dict__ == {"region": "us", "limit": 3, "token": "t"}
+    assert plugin.describe() == "us:3:t"
+    assert plugin._values == {"region": "us", "limit": 3, "token": "t"}
+    assert plugin.get_values() == plugin._values
+    assert FrozenPlugin.region is FrozenPlugin.get_plugin_variables()["region"]
+
+
+def test_constructor_still_validates():
+    """Test that values are validated once, when the plugin is created."""
+    with pytest.raises(ValueError, match="must be of type int"):
+        FrozenPlugin(token="t", limit="many")
+    with pytest.raises(ValueError, match="Required variable not provided: token"):
+        FrozenPlugin()
+
+
+def test_writes_raise():
+    """Test that variables cannot be assigned, deleted or updated in place."""
+    plugin = FrozenPlugin(token="t")
+
+    with pytest.raises(FrozenPluginError, match="variable 'limit' of frozen plugin"):
+        plugin.limit = 5
+    with pytest.raises(AttributeError, match="with_overrides"):
+        del plugin.region
+    with pytest.raises(FrozenPluginError):
+        plugin.update(limit=5)
+    assert plugin.limit == 10
+
+    # Attributes that are not variables stay writable
+    plugin.session = "s"
+    assert plugin.session == "s"
+
+
+def test_with_overrides_creates_reconfigured_copies():
+    """Test that with_overrides() is the way to change a frozen configuration."""
+    plugin = FrozenPlugin(token="t")
+    derived = plugin.with_overrides(limit=5)
+
+    assert type(derived) is FrozenPlugin
+    assert (derived.limit, derived.region, derived.token) == (5, "us", "t")
+    assert plugin.limit == 10
+    with pytest.raises(FrozenPluginError):
+        derived.limit = 6
+    with pytest.raises(ValueError, match="must be of type int"):
+        plugin.with_overrides(limit="many")
+
+
+def test_copies_and_pickles_keep_their_values():
+    """Test that copying and pickling do not go through the frozen setattr."""
+    plugin = FrozenPlugin(token="t", region="eu")
+
+    for clone in (copy.copy(plugin), pickle.loads(pickle.dumps(plugin))):
+        assert clone.get_values() == plugin.get_values()
+        with pytest.raises(FrozenPluginError):
+            clone.region = "us"
+
+    rebuilt = _build_plugin(FrozenPlugin, plugin.get_values())
+    assert rebuilt.__dict__ == plugin.__dict__
+
+
+def test_subclasses_stay_frozen():
+    """Test that subclasses are frozen, and may not unfreeze or become compact."""
+
+    class ChildPlugin(FrozenPlugin):
+        name = "child_plugin"
+        retries = PluginVariable(description="Retries", type=int, default=2)
+
+    child = ChildPlugin(token="t")
+    assert child.retries == 2
+    with pytest.raises(FrozenPluginError):
+        child.retries = 3
+
+    with pytest.raises(TypeError, match="cannot unfreeze"):
+
+        class ThawedPlugin(FrozenPlugin, frozen=False):
+            name = "thawed_plugin"
+
+    with pytest.raises(TypeError, match="both frozen and compact"):
+
+        class CompactChildPlugin(FrozenPlugin, compact=True):
+            name = "compact_child_plugin"
+
+
+def test_late_variables():
+    """Test that variables added to the class later are frozen as well."""
+
+    class LatePlugin(Plugin, frozen=True):
+        name = "late_plugin"
+        description = "Gains a variable later"
+
+        region = PluginVariable(description="Region", type=str, default="us")
+
+    early = LatePlugin()
+    LatePlugin.mode = PluginVariable(description="Mode", type=str, default="fast")
+
+    assert early.mode == "fast"
+    assert LatePlugin(mode="slow").mode == "slow"
+    with pytest.raises(FrozenPluginError):
+        early.mode = "slow"
@@ -0,0 +1,68 @@
+"""
+Import-time regression tests for the SDK.
+"""
+
+import os
+import subprocess
+import sys
+
+# Cumulative import time budgets, in milliseconds, excluding interpreter startup
+IMPORT_BUDGETS_MS = {
+    "agently_sdk": 100,
+    "agently_sdk.plugins": 200,
+}
+
+
+def _run(code: str, *args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+def _import_time_ms(module: str) -> float:
+    """Best of three cumulative import times for a module, from -X importtime."""
+    timings = []
+    for _ in range(3):
+        result = _run(f"import {module}", "-X", "importtime")
+        for line in result.stderr.splitlines():
+            parts = [part.strip() for part in line.split("|")]
+            if len(parts) == 3 and parts[2] == module:
+                timings.append(int(parts[1]) / 1000)
+    return min(timings)
+
+
+def test_import_time_budget():
+    """Test that importing the SDK stays within its time budget."""
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        elapsed = _import_time_ms(module)
+        assert elapsed < budget, f"import {module} took {elapsed:.1f}ms (budget {budget}ms)"
+
+
+def test_top_level_import_is_lazy():
+    """Test that importing styles does not load the plugin system or semantic_kernel."""
+    result = _run(
+        "import sys\n"
+        "from agently_sdk import styles\n"
+        "print('agently_sdk.plugins' in sys.modules, 'semantic_kernel' in sys.modules)\n"
+        "from agently_sdk import Plugin\n"
+        "print('agently_sdk.plugins' in sys.modules, 'semantic_kernel' in sys.modules)\n"
+    )
+    assert result.stdout.split() == ["False", "False", "True", "False"]
+
+
+def test_plugin_features_are_imported_lazily():
+    """Test that optional plugin features load on first access only."""
+    result = _run(
+        "import sys\n"
+        "import agently_sdk.plugins as plugins\n"
+        "features = ['metrics', 'process', 'registry', 'tracing']\n"
+        "print(any(f'agently_sdk.plugins.{name}' in sys.modules for name in features))\n"
+        "print('importlib.metadata' in sys.modules)\n"
+        "print(plugins.get_registry is plugins.registry.get_registry)\n"
+    )
+    assert result.stdout.split() == ["False", "False", "True"]
@@ -0,0 +1,125 @@
+"""
+Tests for on-disk plugin manifests.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+from agently_sdk.utils import manifest as manifests
+from agently_sdk.utils.manifest import (
+    build_package_manifests,
+    load_plugin_info,
+    main,
+    read_manifest,
+    write_manifest,
+)
+
+PLUGIN_SOURCE = '''
+from agently_sdk.plugins import Plugin, PluginVariable, agently_function
+
+
+class GreeterPlugin(Plugin):
+    name = "greeter"
+    description = "Greets people"
+
+    greeting = PluginVariable(description="Greeting", default="Hello")
+
+    @agently_function
+    def greet(self, name: str) -> str:
+        """Greet someone."""
+        return f"{self.greeting}, {name}!"
+'''
+
+
+def _forget_modules():
+    for name in list(sys.modules):
+        if name.startswith("manifest_pkg"):
+            del sys.modules[name]
+
+
+@pytest.fixture
+def plugin_package(tmp_path, monkeypatch):
+    """A package with one plugin module and one plain module."""
+    source_root = tmp_path / "src"
+    package = source_root / "manifest_pkg"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "greeter.py").write_text(PLUGIN_SOURCE)
+    (package / "helpers.py").write_text("VALUE = 1\n")
+
+    monkeypatch.syspath_prepend(str(source_root))
+    yield package
+    _forget_modules()
+
+
+def test_manifest_is_used_without_importing(plugin_package, tmp_path, monkeypatch):
+    """Test that an up to date manifest is read instead of importing the module."""
+    cache = tmp_path / "cache"
+    info = load_plugin_info("manifest_pkg.greeter:GreeterPlugin", cache)
+    assert info["name"] == "greeter"
+    assert info["functions"] == ["greet"]
+    assert info["variables"]["greeting"]["default"] == "Hello"
+    assert info["function_specs"]["greet"]["description"] == "Greet someone."
+    assert (cache / "manifest_pkg.greeter.json").exists()
+
+    _forget_modules()
+
+    def fail(module):
+        raise AssertionError(f"imported {module}")
+
+    monkeypatch.setattr(manifests, "build_module_manifest", fail)
+    assert load_plugin_info("manifest_pkg.greeter:GreeterPlugin", cache) == info
+    assert "manifest_pkg.greeter" not in sys.modules
+
+
+def test_manifest_invalidated_by_source_changes(plugin_package, tmp_path):
+    """Test that edits invalidate the manifest but copies with a new mtime do not."""
+    cache = tmp_path / "cache"
+    write_manifest("manifest_pkg.greeter", cache)
+    _forget_modules()
+    source = plugin_package / "greeter.py"
+
+    # Same content, different mtime: the hash still matches
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert read_manifest("manifest_pkg.greeter", cache) is not None
+
+    source.write_text(PLUGIN_SOURCE.replace("Greets people", "Greets everyone"))
+    assert read_manifest("manifest_pkg.greeter", cache) is None
+
+    info = load_plugin_info("manifest_pkg.greeter:GreeterPlugin", cache)
+    assert info["description"] == "Greets everyone"
+
+
+def test_manifest_rejects_other_formats(plugin_package, tmp_path):
+    """Test that manifests from another format or SDK version are ignored."""
+    cache = tmp_path / "cache"
+    path = write_manifest("manifest_pkg.greeter", cache)
+    data = json.loads(path.read_text())
+    data["sdk_version"] = "0.0.0"
+    path.write_text(json.dumps(data))
+    assert read_manifest("manifest_pkg.greeter", cache) is None
+
+    path.write_text("not json")
+    assert read_manifest("manifest_pkg.greeter", cache) is None
+
+
+def test_load_plugin_info_errors(plugin_package, tmp_path):
+    """Test malformed targets and missing classes."""
+    with pytest.raises(ValueError, match="module:Class"):
+        load_plugin_info("manifest_pkg.greeter", tmp_path)
+    with pytest.raises(ValueError, match="No plugin class"):
+        load_plugin_info("manifest_pkg.greeter:MissingPlugin", tmp_path)
+
+
+def test_cli_builds_package_manifests(plugin_package, tmp_path, capsys):
+    """Test prebuilding the manifests of a whole package."""
+    cache = tmp_path / "cache"
+    assert main(["build", "manifest_pkg", "--cache-dir", str(cache)]) == 0
+
+    assert sorted(p.name for p in cache.iterdir()) == ["manifest_pkg.greeter.json"]
+    assert str(cache / "manifest_pkg.greeter.json") in capsys.readouterr().out
+    assert build_package_manifests("manifest_pkg.helpers", cache) == []
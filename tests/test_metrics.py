@@ -0,0 +1,217 @@
+"""
+Tests for plugin function call metrics.
+"""
+
+import asyncio
+import io
+
+import pytest
+
+from agently_sdk.plugins import Plugin, agently_function
+from agently_sdk.plugins.instrumentation import CallObserver, add_observer, remove_observer
+from agently_sdk.plugins.metrics import (
+    BUCKETS,
+    FunctionMetrics,
+    disable_metrics,
+    enable_metrics,
+    format_prometheus,
+    metrics_enabled,
+    reset_metrics,
+    write_prometheus,
+)
+
+
+class MeteredPlugin(Plugin):
+    """Plugin whose calls are measured."""
+
+    name = "metered_plugin"
+    description = "A plugin with measured functions"
+
+    @agently_function
+    def add(self, a: int, b: int) -> int:
+        """Add two numbers."""
+        return a + b
+
+    @agently_function
+    def fail(self) -> None:
+        """Always raise."""
+        raise RuntimeError("boom")
+
+    @agently_function
+    async def fetch(self, key: str) -> str:
+        """Fetch asynchronously."""
+        await asyncio.sleep(0)
+        return key
+
+    @agently_function
+    def count(self, n: int):
+        """Yield numbers."""
+        yield from range(n)
+
+
+@pytest.fixture
+def metrics():
+    reset_metrics()
+    enable_metrics()
+    try:
+        yield
+    finally:
+        disable_metrics()
+        reset_metrics()
+
+
+def test_metrics_disabled_by_default():
+    """Test that functions are left untouched while metrics are off."""
+    assert not metrics_enabled()
+    assert not hasattr(MeteredPlugin.__dict__["add"], "_instrumented_original")
+
+    MeteredPlugin().add(1, 2)
+    assert MeteredPlugin.get_metrics() == {}
+
+
+def test_metrics_record_calls_errors_and_kinds(metrics):
+    """Test that calls of every function kind are counted."""
+    plugin = MeteredPlugin()
+    assert plugin.add(1, 2) == 3
+    assert plugin.add(a=3, b=4) == 7
+    with pytest.raises(RuntimeError):
+        plugin.fail()
+    assert asyncio.run(plugin.fetch("k")) == "k"
+    assert list(plugin.count(3)) == [0, 1, 2]
+
+    result = MeteredPlugin.get_metrics()
+    assert result["add"].calls == 2
+    assert result["add"].errors == 0
+    assert result["fail"].calls == 1
+    assert result["fail"].errors == 1
+    assert result["fetch"].calls == 1
+    assert result["count"].calls == 1
+    assert sum(result["add"].bucket_counts) == 2
+
+
+def test_enable_and_disable_restore_functions(metrics):
+    """Test that disabling metrics restores the original function objects."""
+    # enable_metrics() ran in the fixture, so fetch the original through the wrapper
+    original = MeteredPlugin.__dict__["add"]._instrumented_original
+
+    disable_metrics()
+    assert MeteredPlugin.__dict__["add"] is original
+    assert MeteredPlugin.get_kernel_functions()["add"] is original
+
+    enable_metrics()
+    assert MeteredPlugin.__dict__["add"]._instrumented_original is original
+    assert MeteredPlugin.get_kernel_functions()["add"] is MeteredPlugin.__dict__["add"]
+
+
+def test_classes_created_while_enabled_are_instrumented(metrics):
+    """Test that new subclasses and late assignments are measured."""
+
+    class LatePlugin(Plugin):
+        name = "late_plugin"
+        description = "Created while metrics are enabled"
+
+        @agently_function
+        def ping(self) -> str:
+            return "pong"
+
+    @agently_function
+    def extra(self) -> str:
+        return "extra"
+
+    LatePlugin.extra = extra
+    plugin = LatePlugin()
+    plugin.ping()
+    plugin.extra()
+
+    assert set(LatePlugin.get_metrics()) == {"ping", "extra"}
+
+    disable_metrics()
+    assert LatePlugin.__dict__["extra"] is extra
+
+
+def test_quantiles_interpolate_within_buckets():
+    """Test histogram quantile estimation."""
+    counts = [0] * (len(BUCKETS) + 1)
+    counts[1] = 100
+    metrics = FunctionMetrics("p", "f", calls=100, bucket_counts=tuple(counts))
+
+    assert metrics.p50 == pytest.approx(BUCKETS[0] + (BUCKETS[1] - BUCKETS[0]) * 0.5)
+    assert metrics.p99 == pytest.approx(BUCKETS[0] + (BUCKETS[1] - BUCKETS[0]) * 0.99)
+    assert FunctionMetrics("p", "f").p95 == 0.0
+
+    counts = [0] * (len(BUCKETS) + 1)
+    counts[-1] = 1
+    assert FunctionMetrics("p", "f", calls=1, bucket_counts=tuple(counts)).p50 == BUCKETS[-1]
+
+    with pytest.raises(ValueError):
+        metrics.quantile(1.5)
+
+
+def test_prometheus_export(metrics, tmp_path):
+    """Test the Prometheus text format output."""
+    plugin = MeteredPlugin()
+    plugin.add(1, 2)
+    with pytest.raises(RuntimeError):
+        plugin.fail()
+
+    text = format_prometheus()
+    labels = 'plugin="metered_plugin",function="add"'
+    assert "# TYPE agently_plugin_calls_total counter" in text
+    assert "# TYPE agently_plugin_call_duration_seconds histogram" in text
+    assert f"agently_plugin_calls_total{{{labels}}} 1" in text
+    assert 'agently_plugin_errors_total{plugin="metered_plugin",function="fail"} 1' in text
+    assert f'agently_plugin_call_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+    assert f"agently_plugin_call_duration_seconds_count{{{labels}}} 1" in text
+
+    path = tmp_path / "agently.prom"
+    write_prometheus(path)
+    assert path.read_text() == text
+
+    buffer = io.StringIO()
+    write_prometheus(buffer)
+    assert buffer.getvalue() == text
+
+
+def test_prometheus_escapes_labels():
+    """Test that label values are escaped."""
+    text = format_prometheus({('a"b', "c\\d"): FunctionMetrics('a"b', "c\\d", calls=1)})
+    assert 'plugin="a\\"b",function="c\\\\d"' in text
+
+
+class BrokenObserver(CallObserver):
+    """Observer failing in every hook."""
+
+    def __init__(self, hook):
+        self.hook = hook
+
+    def observes(self):
+        if self.hook == "observes":
+            raise RuntimeError("observer broke")
+        return True
+
+    def start(self, call):
+        if self.hook == "start":
+            raise RuntimeError("observer broke")
+
+    def end(self, call, state, duration, error):
+        if self.hook == "end":
+            raise RuntimeError("observer broke")
+
+
+@pytest.mark.parametrize("hook", ["observes", "start", "end"])
+def test_observer_failures_do_not_break_calls(metrics, caplog, hook):
+    """Test that an observer raising is logged and the call still completes."""
+    observer = BrokenObserver(hook)
+    add_observer(observer)
+    try:
+        plugin = MeteredPlugin()
+        assert plugin.add(1, 2) == 3
+        with pytest.raises(RuntimeError, match="boom"):
+            plugin.fail()
+        assert list(plugin.count(2)) == [0, 1]
+        assert asyncio.run(plugin.fetch("k")) == "k"
+    finally:
+        remove_observer(observer)
+
+    assert f"failed in {hook}()" in caplog.text
+    assert MeteredPlugin.get_metrics()["add"].calls == 1
@@ -0,0 +1,147 @@
+"""
+Tests for derived plugin instances created with with_overrides().
+"""
+
+import pickle
+
+import pytest
+
+from agently_sdk.plugins import Plugin, PluginVariable, kernel_function
+from agently_sdk.plugins.overrides import OverlayValues
+
+validated = []
+
+
+def track(value):
+    validated.append(value)
+    return value > 0
+
+
+class GreeterPlugin(Plugin):
+    """Plugin specialized per request."""
+
+    name = "greeter_plugin"
+    description = "Greets people"
+
+    default_name = PluginVariable(description="Name to greet", default="World")
+    limit = PluginVariable(description="Limit", value_type=int, default=10, validator=track)
+    region = PluginVariable(description="Region", value_type=str, default="eu")
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.greetings = 0
+
+    @kernel_function
+    def greet(self) -> str:
+        """Greet someone."""
+        return f"Hello, {self.default_name}!"
+
+
+class CompactGreeterPlugin(GreeterPlugin, compact=True):
+    """Compact variant."""
+
+    def __init__(self, **kwargs):
+        Plugin.__init__(self, **kwargs)
+
+
+@pytest.mark.parametrize("cls", [GreeterPlugin, CompactGreeterPlugin])
+def test_with_overrides_validates_only_overrides(cls):
+    """Test that a derived plugin reads overrides and inherited values."""
+    base = cls(limit=5, region="us")
+    validated.clear()
+
+    derived = base.with_overrides(default_name="Ada")
+
+    assert validated == []
+    assert derived.greet() == "Hello, Ada!"
+    assert derived.get_values() == {"default_name": "Ada", "limit": 5, "region": "us"}
+    assert base.default_name == "World"
+
+    assert base.with_overrides(limit=7).limit == 7
+    assert validated == [7]
+    with pytest.raises(ValueError):
+        base.with_overrides(limit=-1)
+    with pytest.raises(ValueError, match="Unknown variable"):
+        base.with_overrides(missing=1)
+
+
+def test_derived_values_share_the_parent_values():
+    """Test that deriving stores only the overrides."""
+    base = GreeterPlugin(limit=5, region="us")
+    derived = base.with_overrides(default_name="Ada")
+
+    assert isinstance(derived._values, OverlayValues)
+    assert derived._values.own == {"default_name": "Ada"}
+    assert derived._values.base is base._values.base
+
+    # Overriding a derived plugin shares the same base instead of nesting
+    grandchild = derived.with_overrides(region="ap")
+    assert grandchild._values.base is base._values.base
+    assert grandchild.get_values() == {"default_name": "Ada", "limit": 5, "region": "ap"}
+
+
+def test_writes_to_derived_plugins_stay_local():
+    """Test that setting or updating a derived plugin leaves the parent unchanged."""
+    base = GreeterPlugin(limit=5)
+    copy = base.with_overrides()
+    copy.limit = 6
+    derived = base.with_overrides(region="us")
+    derived.update(limit=8)
+
+    assert base.limit == 5
+    assert copy.limit == 6
+    assert derived.get_values() == {"default_name": "World", "limit": 8, "region": "us"}
+    assert derived._values.base is base._values.base
+
+
+def test_parent_changes_after_deriving_stay_local():
+    """Test that derived plugins keep the parent values they were derived from."""
+    base = GreeterPlugin(limit=5)
+    derived = base.with_overrides(region="us")
+    base.limit = 99
+    base.update(default_name="Ada")
+
+    assert (base.limit, base.default_name) == (99, "Ada")
+    assert derived.get_values() == {"default_name": "World", "limit": 5, "region": "us"}
+    assert base.with_overrides().limit == 99
+
+
+@pytest.mark.parametrize("cls", [GreeterPlugin, CompactGreeterPlugin])
+def test_parent_assignments_do_not_reach_copies(cls):
+    """Test that assigning on a plugin after deriving leaves its copies on the old values."""
+    base = cls(limit=5)
+    derived = base.with_overrides(region="us")
+    nested = derived.with_overrides(default_name="Ada")
+    base.limit = 7
+    derived.limit = 8
+
+    assert (base.limit, derived.limit, nested.limit) == (7, 8, 5)
+    assert nested.get_values() == {"default_name": "Ada", "limit": 5, "region": "us"}
+
+
+def test_overlay_values_are_a_full_mapping():
+    """Test that derived values read the same through every mapping method."""
+    derived = GreeterPlugin(limit=5).with_overrides(region="us")
+    values = derived._values
+
+    assert values["limit"] == 5 and values["region"] == "us"
+    assert "limit" in values and "missing" not in values
+    assert len(values) == 2
+    assert dict(values) == dict(values.items()) == values.flatten() == {"limit": 5, "region": "us"}
+    with pytest.raises(KeyError):
+        values["missing"]
+
+
+def test_instance_attributes_are_copied():
+    """Test that attributes set up in __init__ carry over without rerunning it."""
+    base = GreeterPlugin()
+    base.greetings = 3
+    assert base.with_overrides(default_name="Ada").greetings == 3
+
+
+def test_derived_values_pickle_as_plain_dicts():
+    """Test that derived values pickle with the inherited values included."""
+    derived = GreeterPlugin(limit=5).with_overrides(region="us")
+    restored = pickle.loads(pickle.dumps(derived._values))
+    assert type(restored) is dict
+    assert restored == {"limit": 5, "region": "us"}
@@ -0,0 +1,254 @@
+"""
+Tests for bounded-cost pattern validation.
+"""
+
+import random
+import re
+
+import pytest
+
+from agently_sdk.plugins import Plugin, PluginVariable, VariableValidation
+from agently_sdk.plugins.patterns import (
+    DEFAULT_MAX_LENGTH,
+    MAX_PROGRAM_SIZE,
+    LinearPattern,
+    PatternSafetyError,
+    check_pattern,
+)
+from agently_sdk.plugins.tool_schema import variable_json_schema
+
+VALUES = ["", "a", "aa", "ab", "abc", "a b", "A_1", "b\n", "\n", "1.5", "aaaa!", "é٣", "x-y"]
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        r"^(a+)+$",
+        r"(a|ab)*c",
+        r"^\w+\s?\w*$",
+        r"a{2,4}b?",
+        r"(?i)AB[^x-z\d]?\b.{0,3}$",
+        r"(?m)^b$",
+        r"(?s)a.",
+        r"\bab\B",
+        r"[a\-c]+\Z",
+        r"\Aa|b",
+        r"(?:ab|a)(?:bc|c)$",
+        r"\d+\.\d+",
+        r"(?a)\w+$",
+        r"(a|)+b",
+        r"a??b",
+        r"(a*)*$",
+        r"[^\W\d]+-?",
+    ],
+)
+def test_linear_matching_agrees_with_re(pattern):
+    """Test that linear matching gives the same results as re.match()."""
+    linear = LinearPattern(pattern)
+    compiled = re.compile(pattern)
+    for value in VALUES:
+        assert linear.match(value) == bool(compiled.match(value)), value
+
+
+def test_linear_matching_accepts_compiled_patterns():
+    """Test that compiled patterns keep their flags."""
+    linear = LinearPattern(re.compile("abc", re.IGNORECASE))
+    assert linear.match("ABC")
+    assert not linear.match("ABD")
+
+
+def test_linear_matching_of_adversarial_values():
+    """Test that patterns that backtrack exponentially with re are matched quickly."""
+    assert not LinearPattern(r"^(a+)+$").match("a" * 5000 + "!")
+    assert LinearPattern(r"^(a+)+$").match("a" * 5000)
+    assert not LinearPattern(r"^(\w+\s?)*$").match("word " * 1000 + "!")
+
+
+@pytest.mark.parametrize(
+    "flags, pattern",
+    [("(?i)", "[^x]"), ("(?i)", "[^a-z]"), ("(?i)", "[^K]"), ("", r"\B"), ("", r"a\B")],
+)
+def test_linear_matching_of_folded_negations_and_boundaries(flags, pattern):
+    """Test that case folding, negation and \\B match exactly what re.fullmatch() does."""
+    linear = LinearPattern(r"%s(?:%s)\Z" % (flags, pattern))
+    pattern = flags + pattern
+    for value in ["", "a", "A", "x", "X", "k", "K", "K", "ſ", "1", "é", "É"]:
+        assert linear.match(value) == (re.fullmatch(pattern, value) is not None), value
+
+
+def test_linear_mode_rejects_values_re_rejects():
+    """Test that a folded negated class cannot be used to slip values past validation."""
+    validation = VariableValidation(pattern=r"(?i)^[^x]+$", pattern_mode="linear")
+    assert validation.validate("xxx") == VariableValidation(pattern=r"(?i)^[^x]+$").validate("xxx")
+    assert validation.validate("XaX")[0] is False
+    assert validation.validate("abc") == (True, None)
+
+
+def _random_pattern(rng, depth=0):
+    atoms = [
+        *"aAxXké.",
+        r"\d",
+        r"\w",
+        r"\s",
+        r"\W",
+        "[^x]",
+        "[^a-z]",
+        "[a-z]",
+        "[^K]",
+        r"[^\W]",
+        r"[\s-]",
+    ]
+    parts = []
+    for _ in range(rng.randint(1, 3)):
+        if rng.random() < 0.15:
+            parts.append(rng.choice(["^", "$", r"\b", r"\B", r"\A", r"\Z"]))
+            continue
+        if rng.random() < 0.2 and depth < 2:
+            branches = (_random_pattern(rng, depth + 1) for _ in range(rng.randint(1, 2)))
+            atom = "(?:%s)" % "|".join(branches)
+        else:
+            atom = rng.choice(atoms)
+        parts.append(atom + rng.choice(["", "", "*", "+", "?", "{1,2}"]))
+    return "".join(parts)
+
+
+def test_linear_matching_agrees_with_re_on_generated_patterns():
+    """Test linear matching against re.fullmatch() over seeded random patterns and values."""
+    rng = random.Random(0)
+    for _ in range(500):
+        flags = rng.choice(["", "(?i)", "(?a)", "(?ai)", "(?s)", "(?m)", "(?im)"])
+        pattern = _random_pattern(rng)
+        linear = LinearPattern(r"%s(?:%s)\Z" % (flags, pattern))
+        pattern = flags + pattern
+        for _ in range(6):
+            value = "".join(rng.choice("aAxXkKé É1_-\nſK") for _ in range(rng.randint(0, 4)))
+            expected = re.fullmatch(pattern, value) is not None
+            assert linear.match(value) == expected, (pattern, value)
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [r"(a)\1", r"a(?=b)", r"(?<!a)b", r"(a)?(?(1)b|c)", r"(?>a+)b", r"a++"],
+)
+def test_linear_matching_rejects_unsupported_syntax(pattern):
+    """Test that syntax outside the regular subset is rejected."""
+    with pytest.raises(PatternSafetyError, match="linear matching does not support"):
+        LinearPattern(pattern)
+
+
+def test_linear_matching_rejects_huge_patterns():
+    """Test that counted repeats may not expand beyond the program size limit."""
+    with pytest.raises(PatternSafetyError, match="too large"):
+        LinearPattern(r"(a{1,%d}){2}" % MAX_PROGRAM_SIZE)
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        r"^(a+)+$",
+        r"^(\w+\s?)*$",
+        r"(a*b*)*",
+        r"(.*,)*",
+        r"(x|a+)+$",
+        r"(a|aa)*$",
+        r"((ab)*a?)+",
+        r"(a)\1",
+    ],
+)
+def test_check_pattern_rejects_catastrophic_backtracking(pattern):
+    """Test that patterns that backtrack exponentially are rejected."""
+    with pytest.raises(PatternSafetyError, match="backtrack catastrophically"):
+        check_pattern(pattern)
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        r"^[a-z]+(-[a-z]+)*$",
+        r"^[\w.]+@([\w-]+\.)+\w+$",
+        r"^(\d+\.){3}\d+$",
+        r"^v?\d+(\.\d+)*(-[\w.]+)?$",
+        r"^([01]?\d|2[0-3]):[0-5]\d$",
+        r"^(a|ab)*$",
+        r"^(?>a+)+$",
+        r"^(a++)+$",
+        r"^\w+\s*\w+$",
+    ],
+)
+def test_check_pattern_accepts_common_patterns(pattern):
+    """Test that common patterns without exponential backtracking pass."""
+    check_pattern(pattern)
+
+
+def test_safe_mode_rejects_patterns_when_created():
+    """Test that validations in safe mode reject catastrophic patterns up front."""
+    with pytest.raises(PatternSafetyError):
+        VariableValidation(pattern=r"^(a+)+$", pattern_mode="safe")
+    # PatternSafetyError is a ValueError, like other configuration errors
+    with pytest.raises(ValueError):
+        VariableValidation(pattern=r"(a)\1", pattern_mode="linear")
+    with pytest.raises(ValueError, match="Unknown pattern mode"):
+        VariableValidation(pattern=r"^a$", pattern_mode="fast")
+
+
+@pytest.mark.parametrize("mode", ["safe", "linear"])
+def test_bounded_modes_validate_like_re(mode):
+    """Test that bounded modes give the same results and messages as plain patterns."""
+    plain = VariableValidation(pattern=r"^[a-z]+(-[a-z]+)*$")
+    bounded = VariableValidation(pattern=r"^[a-z]+(-[a-z]+)*$", pattern_mode=mode)
+    for value in ["abc", "a-b-c", "a--b", "", "ABC", 3]:
+        assert bounded.validate(value) == plain.validate(value)
+
+
+@pytest.mark.parametrize("mode", ["safe", "linear", None])
+def test_max_length(mode):
+    """Test that values longer than max_length are refused without matching them."""
+    validation = VariableValidation(pattern=r"^a+$", pattern_mode=mode, max_length=3)
+    assert validation.validate("aaa") == (True, None)
+    assert validation.validate("aaaa") == (
+        False,
+        "Value must be at most 3 characters for pattern validation",
+    )
+
+
+def test_bounded_modes_default_max_length():
+    """Test that bounded modes limit the value length by default, and plain patterns do not."""
+    long_value = "a" * (DEFAULT_MAX_LENGTH + 1)
+    assert VariableValidation(pattern=r"^a+$").validate(long_value) == (True, None)
+    bounded = VariableValidation(pattern=r"^a+$", pattern_mode="linear")
+    assert bounded.validate(long_value)[0] is False
+
+
+def test_linear_mode_on_plugin_variables():
+    """Test linear patterns on plugin variables with untrusted patterns."""
+
+    class TenantPlugin(Plugin):
+        name = "tenant_plugin"
+        description = "Tenant-configured pattern"
+
+        slug = PluginVariable(
+            description="Slug",
+            default="a",
+            validation=VariableValidation(pattern=r"^(a+)+$", pattern_mode="linear"),
+        )
+
+    plugin = TenantPlugin(slug="aaaa")
+    assert plugin.slug == "aaaa"
+    with pytest.raises(ValueError, match="must match pattern"):
+        TenantPlugin(slug="a" * 1000 + "!")
+
+
+def test_bounded_mode_metadata():
+    """Test that pattern modes appear in variable metadata and JSON schemas."""
+    variable = PluginVariable(
+        name="slug",
+        description="Slug",
+        value_type=str,
+        validation=VariableValidation(pattern=r"^[a-z]+$", pattern_mode="safe", max_length=64),
+    )
+    assert variable.to_dict()["validation"] == {
+        "pattern": "^[a-z]+$",
+        "pattern_mode": "safe",
+        "max_length": 64,
+    }
+    assert variable_json_schema(variable)["maxLength"] == 64
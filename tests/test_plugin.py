@@ -2,6 +2,11 @@
 Tests for the Plugin base class.
 """
 
+import abc
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from agently_sdk.plugins import Plugin, PluginVariable, kernel_function
@@ -70,3 +75,151 @@ def test_kernel_function_execution():
 
     result = plugin.use_var()
     assert result == "default"
+
+
+def test_plugin_schema_is_built_once_per_class():
+    """Test that the class schema is computed at class creation and reused."""
+    schema = SamplePlugin.get_plugin_schema()
+
+    assert SamplePlugin.get_plugin_schema() is schema
+    assert set(schema.variables) == {"test_var", "number_var"}
+    assert set(schema.functions) == {"test_function", "use_var"}
+    assert schema.required == ()
+    assert schema.names["number_var"] == "number_var"
+
+    SamplePlugin()
+    assert SamplePlugin.get_plugin_schema() is schema
+
+
+def test_plugin_schema_inheritance():
+    """Test that subclasses get their own schema including inherited members."""
+
+    class ChildPlugin(SamplePlugin):
+        extra_var = PluginVariable(description="A required variable")
+
+        @kernel_function
+        def child_function(self) -> str:
+            """A function only defined on the child."""
+            return self.extra_var
+
+    schema = ChildPlugin.get_plugin_schema()
+    assert schema is not SamplePlugin.get_plugin_schema()
+    assert set(schema.variables) == {"test_var", "number_var", "extra_var"}
+    assert "child_function" in schema.functions
+    assert "test_function" in schema.functions
+    assert schema.required == ("extra_var",)
+    assert ChildPlugin.extra_var.name == "extra_var"
+
+    with pytest.raises(ValueError, match="Required variable not provided: extra_var"):
+        ChildPlugin()
+    assert ChildPlugin(extra_var="x").child_function() == "x"
+
+
+def test_plugin_schema_late_class_mutation():
+    """Test that modifying a class after creation invalidates its schema and its subclasses'."""
+
+    class BasePlugin(Plugin):
+        name = "base"
+        description = "Base plugin"
+
+    class DerivedPlugin(BasePlugin):
+        pass
+
+    base_schema = BasePlugin.get_plugin_schema()
+    derived_schema = DerivedPlugin.get_plugin_schema()
+
+    BasePlugin.late_var = PluginVariable(description="Added later", default=1)
+
+    assert BasePlugin.get_plugin_schema() is not base_schema
+    assert "late_var" in BasePlugin.get_plugin_variables()
+    assert DerivedPlugin.get_plugin_schema() is not derived_schema
+    assert "late_var" in DerivedPlugin.get_plugin_variables()
+    assert DerivedPlugin(late_var=5).late_var == 5
+
+    del BasePlugin.late_var
+    assert "late_var" not in DerivedPlugin.get_plugin_variables()
+    with pytest.raises(ValueError, match="Unknown variable"):
+        DerivedPlugin(late_var=5)
+
+
+def test_plugin_can_be_an_abstract_base_class():
+    """Test that plugins combine with abc.ABC and keep the schema built at class creation."""
+
+    class AbstractPlugin(Plugin, abc.ABC):
+        name = "abstract_plugin"
+        description = "Abstract plugin"
+
+        region = PluginVariable(description="Region", default="us")
+
+        @abc.abstractmethod
+        def route(self) -> str:
+            """Route a request."""
+
+    schema = AbstractPlugin.get_plugin_schema()
+    with pytest.raises(TypeError, match="abstract"):
+        AbstractPlugin()
+
+    class ConcretePlugin(AbstractPlugin):
+        def route(self) -> str:
+            return self.region
+
+    assert AbstractPlugin.get_plugin_schema() is schema
+    assert ConcretePlugin(region="eu").route() == "eu"
+    assert isinstance(ConcretePlugin(), AbstractPlugin)
+
+
+class AsyncPlugin(Plugin):
+    """Plugin mixing async and blocking functions."""
+
+    name = "async_plugin"
+    description = "A plugin with async functions"
+
+    @kernel_function
+    async def fetch(self, key: str) -> str:
+        """Async lookup."""
+        return f"fetched {key}"
+
+    @kernel_function
+    def compute(self, x: int) -> dict:
+        """Blocking computation, reports the thread it ran on."""
+        return {"value": x * 2, "thread": threading.get_ident()}
+
+    @kernel_function
+    def count(self, n: int):
+        """Blocking generator."""
+        yield from range(n)
+
+
+def test_ainvoke_runs_async_and_blocking_functions():
+    """Test that ainvoke awaits async functions and offloads blocking ones."""
+    plugin = AsyncPlugin()
+
+    async def run():
+        loop_thread = threading.get_ident()
+        fetched = await plugin.ainvoke("fetch", key="a")
+        computed = await plugin.ainvoke("compute", x=4)
+        counted = await plugin.ainvoke("count", n=3)
+        return loop_thread, fetched, computed, counted
+
+    loop_thread, fetched, computed, counted = asyncio.run(run())
+    assert fetched == "fetched a"
+    assert computed["value"] == 8
+    assert computed["thread"] != loop_thread
+    assert counted == [0, 1, 2]
+
+    with pytest.raises(ValueError, match="Unknown function"):
+        asyncio.run(plugin.ainvoke("missing"))
+
+
+def test_ainvoke_uses_configured_executor():
+    """Test that blocking functions run on the configured executor."""
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="plugin-pool")
+
+    class PooledPlugin(AsyncPlugin):
+        blocking_executor = executor
+
+    try:
+        result = asyncio.run(PooledPlugin().ainvoke("compute", x=1))
+        assert result["thread"] in {t.ident for t in threading.enumerate() if "plugin-pool" in t.name}
+    finally:
+        executor.shutdown()
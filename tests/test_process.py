@@ -0,0 +1,158 @@
+"""
+Tests for process-pool execution of plugin functions.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from agently_sdk.plugins import Plugin, PluginVariable, agently_function, process
+from agently_sdk.plugins.process import configure_process_pool, shutdown_process_pool
+
+
+class CrunchPlugin(Plugin):
+    """Plugin with process-executed functions."""
+
+    name = "crunch_plugin"
+    description = "Runs functions in worker processes"
+
+    factor = PluginVariable(description="Multiplier", value_type=int, default=2)
+
+    @agently_function(executor="process")
+    def scale(self, values: list) -> dict:
+        """Scale values in a worker."""
+        return {"pid": os.getpid(), "id": id(self), "result": [v * self.factor for v in values]}
+
+    @agently_function(executor="process")
+    def fail(self) -> None:
+        """Raise in a worker."""
+        raise ValueError("worker failed")
+
+
+class CustomInitPlugin(CrunchPlugin):
+    """Plugin whose __init__ is rerun in the worker."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.offset = 1
+
+    @agently_function(executor="process")
+    def shifted(self, value: int) -> int:
+        """Use state set up by __init__."""
+        return value * self.factor + self.offset
+
+
+def _triple(self, value: int) -> int:
+    """Stored on a plugin under another name."""
+    return value * 3
+
+
+class AliasPlugin(CrunchPlugin):
+    """Plugin exposing process functions under other names."""
+
+    triple = agently_function(executor="process")(_triple)
+
+    @agently_function
+    def scale(self, values: list) -> dict:
+        """Override that calls the base implementation."""
+        result = super().scale(values)
+        result["result"].append(-1)
+        return result
+
+
+@agently_function(executor="process")
+def square(x: int) -> int:
+    """A plain function run in a worker."""
+    return x * x
+
+
+@pytest.fixture
+def pool():
+    configure_process_pool(max_workers=1)
+    yield
+    shutdown_process_pool()
+
+
+def test_calls_run_in_worker_with_rebuilt_instance(pool):
+    """Test that calls run in another process on a cached copy of the plugin."""
+    plugin = CrunchPlugin(factor=3)
+    first = plugin.scale([1, 2])
+    second = plugin.scale([3])
+
+    assert first["result"] == [3, 6]
+    assert second["result"] == [9]
+    assert first["pid"] != os.getpid()
+    # The worker rebuilt the plugin once and reused it
+    assert first["id"] == second["id"]
+
+    plugin.factor = 4
+    third = plugin.scale([1])
+    assert third["result"] == [4]
+    assert third["id"] != first["id"]
+
+
+def test_exceptions_and_plain_functions(pool):
+    """Test error propagation, plain functions and custom __init__."""
+    with pytest.raises(ValueError, match="worker failed"):
+        CrunchPlugin().fail()
+    assert square(7) == 49
+    assert CustomInitPlugin(factor=5).shifted(2) == 11
+
+
+def test_functions_are_found_by_attribute(pool):
+    """Test aliased functions and overrides calling the base function."""
+    plugin = AliasPlugin()
+    assert plugin.triple(2) == 6
+    assert plugin.scale([1])["result"] == [2, -1]
+
+
+def test_ainvoke_uses_the_pool(pool):
+    """Test that async hosts can call process functions."""
+    result = asyncio.run(CrunchPlugin().ainvoke("scale", values=[5]))
+    assert result["result"] == [10]
+
+
+def test_workers_are_recycled():
+    """Test that workers are replaced after max_calls_per_worker calls."""
+    configure_process_pool(max_workers=1, max_calls_per_worker=1)
+    try:
+        plugin = CrunchPlugin()
+        pids = {plugin.scale([1])["pid"] for _ in range(3)}
+    finally:
+        shutdown_process_pool()
+    assert len(pids) == 3
+
+
+def test_invalid_options():
+    """Test rejected executor options."""
+    with pytest.raises(ValueError, match="Unknown executor"):
+        agently_function(executor="gpu")(lambda self: None)
+    with pytest.raises(TypeError, match="Only sync functions"):
+
+        @agently_function(executor="process")
+        async def fetch(self) -> None:
+            pass
+
+    with pytest.raises(ValueError):
+        configure_process_pool(max_workers=0)
+
+
+@pytest.mark.parametrize(
+    "options, message",
+    [
+        ({"max_workers": 0}, "max_workers must be a positive integer"),
+        ({"max_workers": 2.5}, "max_workers must be a positive integer"),
+        ({"max_workers": True}, "max_workers must be a positive integer"),
+        ({"max_calls_per_worker": -1}, "max_calls_per_worker must be a positive integer"),
+        ({"max_calls_per_worker": "10"}, "max_calls_per_worker must be a positive integer"),
+        ({"mp_context": "thread"}, "Unknown start method 'thread'"),
+        ({"mp_context": "fork", "max_calls_per_worker": 10}, "cannot be used with the 'fork'"),
+    ],
+)
+def test_contradictory_pool_options_are_rejected(options, message):
+    """Test that pool options are checked when configured rather than on the first call."""
+    previous = dict(process._pool_options)
+    with pytest.raises(ValueError, match=message):
+        configure_process_pool(**options)
+    assert process._pool_options == previous
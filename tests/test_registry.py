@@ -0,0 +1,130 @@
+"""
+Tests for the entry-point plugin registry.
+"""
+
+import sys
+import textwrap
+
+import pytest
+
+from agently_sdk.plugins import Plugin
+from agently_sdk.plugins.registry import PluginRegistry, find_module_source
+
+PLUGIN_SOURCE = '''
+from agently_sdk.plugins import Plugin, agently_function
+from agently_sdk.plugins import decorators
+
+
+class BasePlugin(Plugin):
+    description = "Base description"
+
+    @agently_function
+    def shared(self) -> str:
+        return "shared"
+
+
+class WeatherPlugin(BasePlugin):
+    name = "weather"
+    description = "Weather lookups"
+
+    @agently_function(description="Get the forecast")
+    def forecast(self, city: str) -> str:
+        return city
+
+    @decorators.kernel_function
+    async def alerts(self) -> str:
+        return ""
+
+    def helper(self) -> None:
+        pass
+
+
+NOT_A_PLUGIN = object()
+'''
+
+
+@pytest.fixture
+def plugin_package(tmp_path, monkeypatch):
+    """A package with a plugin module, declared through an entry point."""
+    package = tmp_path / "fake_weather"
+    package.mkdir()
+    (package / "__init__.py").write_text("raise RuntimeError('package imported')\n")
+    (package / "sub").mkdir()
+    (package / "sub" / "__init__.py").write_text("")
+    (package / "sub" / "plugins.py").write_text(PLUGIN_SOURCE)
+
+    dist_info = tmp_path / "fake_weather-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Metadata-Version: 2.1\nName: fake-weather\nVersion: 1.0\n")
+    (dist_info / "entry_points.txt").write_text(
+        textwrap.dedent(
+            """
+            [agently.plugins]
+            weather = fake_weather.sub.plugins:WeatherPlugin
+            broken = fake_weather.sub.plugins:NOT_A_PLUGIN
+            """
+        )
+    )
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield tmp_path
+    for name in list(sys.modules):
+        if name.startswith("fake_weather"):
+            del sys.modules[name]
+
+
+def test_listing_does_not_import(plugin_package):
+    """Test that discovery and listing read sources instead of importing."""
+    registry = PluginRegistry()
+    assert registry.names() == ["broken", "weather"]
+    assert "weather" in registry and len(registry) == 2
+
+    info = registry.info("weather")
+    assert info.target == "fake_weather.sub.plugins:WeatherPlugin"
+    assert info.module == "fake_weather.sub.plugins"
+    assert info.attribute == "WeatherPlugin"
+    assert info.description == "Weather lookups"
+    assert info.functions == ("shared", "forecast", "alerts")
+    assert info.distribution == "fake-weather"
+    assert [i.name for i in registry.list()] == ["broken", "weather"]
+
+    assert not any(name.startswith("fake_weather") for name in sys.modules)
+    assert not registry.is_loaded("weather")
+
+
+def test_get_imports_on_first_request(plugin_package):
+    """Test that get() imports the plugin module once."""
+    # The package __init__ refuses to be imported, so use a registry pointing below it
+    (plugin_package / "fake_weather" / "__init__.py").write_text("")
+    registry = PluginRegistry()
+
+    cls = registry.get("weather")
+    assert issubclass(cls, Plugin)
+    assert cls.name == "weather"
+    assert registry.is_loaded("weather")
+    assert registry.get("weather") is cls
+
+    with pytest.raises(TypeError, match="not a Plugin subclass"):
+        registry.get("broken")
+    with pytest.raises(ValueError, match="Unknown plugin"):
+        registry.get("missing")
+
+
+def test_register_explicitly(plugin_package):
+    """Test registering plugins without entry points."""
+    registry = PluginRegistry(group="agently.tests.none")
+    assert registry.names() == []
+
+    registry.register("mine", "fake_weather.sub.plugins:WeatherPlugin")
+    assert registry.info("mine").functions == ("shared", "forecast", "alerts")
+
+    with pytest.raises(ValueError, match="module:Class"):
+        registry.register("bad", "no_colon")
+
+
+def test_find_module_source(plugin_package):
+    """Test locating module sources without importing packages."""
+    path = find_module_source("fake_weather.sub.plugins")
+    assert path is not None and path.endswith("plugins.py")
+    assert find_module_source("fake_weather.missing") is None
+    assert find_module_source("agently_sdk.plugins.base").endswith("base.py")
@@ -0,0 +1,93 @@
+"""
+Tests for plugin function specs.
+"""
+
+from typing import List, Optional
+
+from agently_sdk.plugins import FunctionKind, Plugin, agently_function, get_function_spec
+from agently_sdk.plugins.spec import MISSING, parse_docstring
+
+
+class SpecPlugin(Plugin):
+    """Plugin with documented functions."""
+
+    name = "spec_plugin"
+    description = "A plugin with documented functions"
+
+    @agently_function
+    def greet(self, name: str, times: int = 1, tags: Optional[List[str]] = None) -> str:
+        """
+        Greet someone.
+
+        Args:
+            name: The name to greet.
+            times (int): How many times to greet. The greeting is
+                repeated on one line.
+            tags: Extra tags.
+
+        Returns:
+            The greeting.
+        """
+        return " ".join([f"Hello, {name}!"] * times)
+
+    @agently_function(description="Custom description", name="lookup", wrap=True)
+    async def find(self, key: "str") -> Optional[str]:
+        """
+        Find a value.
+
+        Parameters
+        ----------
+        key : str
+            The key to look up.
+
+        Returns
+        -------
+        str
+            The value, if found.
+        """
+        return None
+
+
+def test_function_spec_from_google_docstring():
+    """Test that specs capture signatures, hints, defaults and Args descriptions."""
+    spec = SpecPlugin.get_function_specs()["greet"]
+
+    assert spec.name == "greet"
+    assert spec.description == "Greet someone."
+    assert spec.kind is FunctionKind.SYNC
+    assert [p.name for p in spec.parameters] == ["name", "times", "tags"]
+
+    name, times, tags = spec.parameters
+    assert name.annotation is str and name.default is MISSING and name.required
+    assert times.default == 1 and not times.required
+    assert times.description == "How many times to greet. The greeting is repeated on one line."
+    assert tags.annotation == Optional[List[str]]
+    assert spec.return_annotation is str
+    assert spec.return_description == "The greeting."
+
+
+def test_function_spec_from_numpy_docstring_and_decorator_metadata():
+    """Test NumPy style docstrings, decorator metadata and wrapped functions."""
+    spec = SpecPlugin.get_function_specs()["find"]
+
+    assert spec.name == "lookup"
+    assert spec.description == "Custom description"
+    assert spec.kind is FunctionKind.ASYNC
+    assert spec.parameter_map["key"].annotation is str
+    assert spec.parameter_map["key"].description == "The key to look up."
+    assert spec.return_description == "The value, if found."
+
+
+def test_function_spec_is_cached():
+    """Test that specs are built once per function and shared through bound methods."""
+    plugin = SpecPlugin()
+    spec = get_function_spec(SpecPlugin.greet)
+
+    assert get_function_spec(plugin.greet) is spec
+    assert SpecPlugin.get_function_specs()["greet"] is spec
+
+
+def test_parse_docstring_without_sections():
+    """Test that plain docstrings only produce a summary."""
+    assert parse_docstring("Do a thing.\n\nMore detail.") == ("Do a thing.", {}, None)
+    assert parse_docstring(None) == (None, {}, None)
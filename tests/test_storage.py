@@ -0,0 +1,107 @@
+"""
+Tests for compact plugin storage.
+"""
+
+import pickle
+import weakref
+
+import pytest
+
+from agently_sdk.plugins import Plugin, PluginVariable, kernel_function
+
+
+class CompactPlugin(Plugin, compact=True):
+    """Plugin using compact storage."""
+
+    name = "compact_plugin"
+    description = "A compact plugin"
+
+    region = PluginVariable(description="Region", type=str, default="us")
+    limit = PluginVariable(description="Limit", type=int, default=10)
+    token = PluginVariable(description="Required token", type=str)
+
+    @kernel_function
+    def describe(self) -> str:
+        """Describe the configuration."""
+        return f"{self.region}:{self.limit}:{self.token}"
+
+
+def test_compact_plugin_reads_and_writes():
+    """Test that compact plugins behave like regular plugins."""
+    plugin = CompactPlugin(token="t", limit=3)
+
+    assert plugin.describe() == "us:3:t"
+    assert plugin._values == {"limit": 3, "token": "t"}
+
+    plugin.region = "eu"
+    assert plugin.region == "eu"
+    with pytest.raises(ValueError, match="must be of type int"):
+        plugin.limit = "many"
+    assert plugin.limit == 3
+
+    with pytest.raises(ValueError, match="Required variable not provided: token"):
+        CompactPlugin()
+
+
+def test_compact_plugin_has_no_instance_dict():
+    """Test that compact plugins are slot-based and share their default values."""
+    plugin = CompactPlugin(token="t")
+    other = CompactPlugin(token="t")
+
+    assert not hasattr(plugin, "__dict__")
+    assert weakref.ref(plugin)() is plugin
+    assert CompactPlugin.region is CompactPlugin.get_plugin_variables()["region"]
+
+    plugin._values = {}
+    other._values = {}
+    assert plugin._store is other._store is CompactPlugin._default_store
+
+
+def test_compact_plugin_inheritance_and_late_variables():
+    """Test compact subclasses and variables added after class creation."""
+
+    class ChildPlugin(CompactPlugin):
+        extra = PluginVariable(description="Extra", default=1)
+
+    child = ChildPlugin(token="t", extra=2)
+    assert (child.extra, child.region, child.token) == (2, "us", "t")
+
+    old = CompactPlugin(token="t")
+    CompactPlugin.late = PluginVariable(description="Late", default="x")
+    try:
+        assert old.late == "x"
+        assert CompactPlugin(token="t", late="y").late == "y"
+        assert ChildPlugin(token="t", late="z").late == "z"
+        assert old.token == "t"
+    finally:
+        del CompactPlugin.late
+
+    with pytest.raises(TypeError):
+
+        class NotCompact(CompactPlugin, compact=False):
+            pass
+
+
+def test_compact_plugin_pickles():
+    """Test that compact plugin instances survive a pickle round trip."""
+    plugin = CompactPlugin(token="t", region="eu")
+    copy = pickle.loads(pickle.dumps(plugin))
+
+    assert copy.describe() == "eu:10:t"
+
+
+def test_regular_plugins_keep_their_storage():
+    """Test that only compact classes give up the _values storage."""
+    assert Plugin()._values == {}
+
+    class SlottedPlugin(Plugin):
+        __slots__ = ("session",)
+
+        name = "slotted_plugin"
+        description = "Declares its own slots"
+
+        region = PluginVariable(description="Region", type=str, default="us")
+
+    plugin = SlottedPlugin(region="eu")
+    assert plugin.region == "eu"
+    assert plugin.get_values() == {"region": "eu"}
@@ -0,0 +1,197 @@
+"""
+Tests for streaming generator-based plugin functions.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import aclosing
+
+import pytest
+
+from agently_sdk.plugins import Plugin, agently_function
+from agently_sdk.plugins.execution import stream_function
+
+
+class StreamPlugin(Plugin):
+    """Plugin with streaming functions."""
+
+    name = "stream_plugin"
+    description = "Produces results in chunks"
+
+    stream_max_buffered = 2
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.produced = 0
+        self.closed = threading.Event()
+        self.release = threading.Event()
+
+    @agently_function
+    def lines(self, n: int):
+        """Sync generator counting what it produced."""
+        try:
+            for i in range(n):
+                self.produced += 1
+                yield f"line {i}"
+        finally:
+            self.closed.set()
+
+    @agently_function
+    def gated(self):
+        """Sync generator that waits for the consumer after its first chunk."""
+        yield "first"
+        assert self.release.wait(5)
+        yield "second"
+
+    @agently_function
+    async def events(self, n: int):
+        """Async generator counting what it produced."""
+        try:
+            for i in range(n):
+                self.produced += 1
+                yield i
+                await asyncio.sleep(0)
+        finally:
+            self.closed.set()
+
+    @agently_function
+    async def forever(self):
+        """Async generator that never ends by itself."""
+        try:
+            while True:
+                yield "tick"
+                await asyncio.sleep(0.001)
+        finally:
+            self.closed.set()
+
+    @agently_function
+    def broken(self):
+        """Sync generator failing after one chunk."""
+        yield 1
+        raise RuntimeError("disk gone")
+
+    @agently_function
+    async def total(self, n: int) -> int:
+        """Non-streaming function."""
+        return n * 2
+
+
+def collect(plugin, name, **kwargs):
+    async def run():
+        return [chunk async for chunk in plugin.astream(name, **kwargs)]
+
+    return asyncio.run(run())
+
+
+def test_streams_all_chunks():
+    """Test that every chunk arrives in order, for each kind of function."""
+    plugin = StreamPlugin()
+    assert collect(plugin, "lines", n=5) == [f"line {i}" for i in range(5)]
+    assert plugin.closed.is_set()
+    assert collect(StreamPlugin(), "events", n=3) == [0, 1, 2]
+    assert collect(plugin, "total", n=4) == [8]
+
+
+def test_chunks_arrive_before_the_generator_finishes():
+    """Test that chunks are delivered as they are produced."""
+    plugin = StreamPlugin()
+
+    async def run():
+        chunks = []
+        async for chunk in plugin.astream("gated"):
+            chunks.append(chunk)
+            plugin.release.set()
+        return chunks
+
+    assert asyncio.run(run()) == ["first", "second"]
+
+
+@pytest.mark.parametrize("function", ["lines", "events"])
+def test_backpressure_limits_buffered_chunks(function):
+    """Test that a generator runs at most max_buffered chunks ahead of a slow consumer."""
+    plugin = StreamPlugin()
+
+    async def run():
+        ahead = []
+        async with aclosing(plugin.astream(function, n=100)) as stream:
+            async for _ in stream:
+                await asyncio.sleep(0.01)
+                ahead.append(plugin.produced)
+                if len(ahead) == 5:
+                    break
+        return ahead
+
+    ahead = asyncio.run(run())
+    # Chunk k has been consumed; the generator holds at most 2 more
+    assert all(produced <= consumed + 2 for consumed, produced in enumerate(ahead, 1))
+    assert plugin.produced < 100
+    assert plugin.closed.is_set()
+
+
+def test_cancellation_closes_the_generator():
+    """Test that cancelling the consuming task closes the generator."""
+    plugin = StreamPlugin()
+
+    async def consume():
+        async for _ in plugin.astream("forever"):
+            pass
+
+    async def run():
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.02)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert plugin.closed.is_set()
+
+
+def test_errors_propagate_after_earlier_chunks():
+    """Test that an exception raised by the generator reaches the consumer."""
+    plugin = StreamPlugin()
+    chunks = []
+
+    async def run():
+        async for chunk in plugin.astream("broken"):
+            chunks.append(chunk)
+
+    with pytest.raises(RuntimeError, match="disk gone"):
+        asyncio.run(run())
+    assert chunks == [1]
+
+    with pytest.raises(TypeError):
+        collect(plugin, "lines", wrong=1)
+
+
+def test_invalid_calls():
+    """Test unknown functions and buffer sizes."""
+    with pytest.raises(ValueError, match="Unknown function"):
+        StreamPlugin().astream("missing")
+    with pytest.raises(ValueError, match="max_buffered"):
+        stream_function(StreamPlugin().lines, {"n": 1}, max_buffered=0)
+
+
+def test_sync_generator_runs_off_the_event_loop():
+    """Test that a slow sync generator does not block the event loop."""
+    ticks = []
+
+    def slow():
+        for i in range(3):
+            time.sleep(0.02)
+            yield i
+
+    async def ticker():
+        while True:
+            ticks.append(1)
+            await asyncio.sleep(0.005)
+
+    async def run():
+        task = asyncio.create_task(ticker())
+        chunks = [chunk async for chunk in stream_function(slow, {})]
+        task.cancel()
+        return chunks
+
+    assert asyncio.run(run()) == [0, 1, 2]
+    assert len(ticks) > 3
@@ -0,0 +1,149 @@
+"""
+Tests for function-calling schema export.
+"""
+
+import json
+from enum import Enum
+from typing import Dict, List, Literal, Optional, Set, Tuple, Union
+
+from agently_sdk.plugins import Plugin, PluginVariable, VariableValidation, agently_function
+from agently_sdk.plugins.tool_schema import json_schema
+
+
+class Unit(Enum):
+    METRIC = "metric"
+    IMPERIAL = "imperial"
+
+
+class WeatherPlugin(Plugin):
+    """Plugin with documented, typed functions."""
+
+    name = "weather"
+    description = "Weather lookups"
+
+    api_key = PluginVariable(description="API key", value_type=str, sensitive=True)
+    days = PluginVariable(
+        description="Forecast length",
+        value_type=int,
+        default=3,
+        validation=VariableValidation(range=(1, 14)),
+    )
+    unit = PluginVariable(description="Units", choices=["metric", "imperial"], default="metric")
+
+    @agently_function
+    def forecast(self, city: str, days: int = 3, unit: Unit = Unit.METRIC) -> List[float]:
+        """
+        Get the forecast for a city.
+
+        Args:
+            city: The city to look up
+            days: Number of days
+            unit: Measurement system
+
+        Returns:
+            Daily temperatures
+        """
+        return []
+
+    @agently_function(name="alerts", description="Active weather alerts")
+    def get_alerts(self, regions: Optional[List[str]] = None, *args, **kwargs) -> str:
+        return ""
+
+
+def test_tool_schemas_from_hints_and_docstrings():
+    """Test the generated function-calling schemas."""
+    tools = {tool["function"]["name"]: tool for tool in WeatherPlugin.get_tool_schemas()}
+    assert set(tools) == {"weather-forecast", "weather-alerts"}
+
+    forecast = tools["weather-forecast"]
+    assert forecast["type"] == "function"
+    assert forecast["function"]["description"] == "Get the forecast for a city."
+    parameters = forecast["function"]["parameters"]
+    assert parameters["required"] == ["city"]
+    assert parameters["properties"]["city"] == {
+        "type": "string",
+        "description": "The city to look up",
+    }
+    assert parameters["properties"]["days"]["default"] == 3
+    assert parameters["properties"]["unit"]["enum"] == ["metric", "imperial"]
+    assert parameters["properties"]["unit"]["default"] == "metric"
+
+    alerts = tools["weather-alerts"]["function"]
+    assert alerts["description"] == "Active weather alerts"
+    assert list(alerts["parameters"]["properties"]) == ["regions"]
+    assert alerts["parameters"]["properties"]["regions"] == {
+        "anyOf": [{"type": "array", "items": {"type": "string"}}, {"type": "null"}],
+        "default": None,
+    }
+
+
+def test_variables_schema():
+    """Test the JSON Schema of the plugin variables."""
+    schema = WeatherPlugin.get_variables_schema()
+    assert schema["required"] == ["api_key"]
+    assert schema["properties"]["api_key"] == {
+        "type": "string",
+        "description": "API key",
+        "writeOnly": True,
+    }
+    assert schema["properties"]["days"]["minimum"] == 1
+    assert schema["properties"]["days"]["maximum"] == 14
+    assert schema["properties"]["unit"]["enum"] == ["metric", "imperial"]
+
+
+def test_schema_json_is_cached_until_the_class_changes():
+    """Test that the serialized JSON is reused and invalidated with the class."""
+
+    class CachedPlugin(Plugin):
+        name = "cached"
+        description = "Cached schemas"
+
+        @agently_function
+        def one(self) -> str:
+            return ""
+
+    first = CachedPlugin.get_tool_schema_json()
+    assert CachedPlugin.get_tool_schema_json() is first
+    assert [t["function"]["name"] for t in json.loads(first)] == ["cached-one"]
+
+    # Returned dicts are copies
+    CachedPlugin.get_tool_schemas()[0]["function"]["name"] = "changed"
+    assert CachedPlugin.get_tool_schema_json() is first
+
+    @agently_function
+    def two(self) -> str:
+        return ""
+
+    CachedPlugin.two = two
+    second = CachedPlugin.get_tool_schema_json()
+    assert second is not first
+    assert len(json.loads(second)) == 2
+
+    class SubPlugin(CachedPlugin):
+        name = "sub"
+
+    assert json.loads(SubPlugin.get_tool_schema_json())[0]["function"]["name"] == "sub-one"
+    assert CachedPlugin.get_tool_schema_json() is second
+
+
+def test_json_schema_types():
+    """Test the type hint to JSON Schema conversion."""
+    assert json_schema(None) == {}
+    assert json_schema(Optional[int]) == {"type": ["integer", "null"]}
+    assert json_schema(int | str) == {"type": ["integer", "string"]}
+    assert json_schema(Union[int, List[int]]) == {
+        "anyOf": [{"type": "integer"}, {"type": "array", "items": {"type": "integer"}}]
+    }
+    assert json_schema(Literal["a", "b"]) == {"enum": ["a", "b"]}
+    assert json_schema(Dict[str, float]) == {
+        "type": "object",
+        "additionalProperties": {"type": "number"},
+    }
+    assert json_schema(Set[str]) == {
+        "type": "array",
+        "uniqueItems": True,
+        "items": {"type": "string"},
+    }
+    assert json_schema(Tuple[int, ...]) == {"type": "array", "items": {"type": "integer"}}
+    assert json_schema(Tuple[int, str])["prefixItems"] == [{"type": "integer"}, {"type": "string"}]
+    assert json_schema(list) == {"type": "array"}
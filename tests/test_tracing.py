@@ -0,0 +1,237 @@
+"""
+Tests for plugin function tracing.
+"""
+
+import asyncio
+import json
+import threading
+
+import pytest
+
+from agently_sdk.plugins import Plugin, agently_function, instrumentation, tracing
+from agently_sdk.plugins.tracing import (
+    JsonFileSpanExporter,
+    TraceHook,
+    add_trace_hook,
+    current_span,
+    get_sample_rate,
+    propagate,
+    remove_trace_hook,
+    set_sample_rate,
+    summarize_arguments,
+)
+
+
+class RecordingHook(TraceHook):
+    """Hook keeping every span it sees."""
+
+    def __init__(self):
+        self.started = []
+        self.ended = []
+
+    def on_start(self, span):
+        self.started.append(span)
+
+    def on_end(self, span):
+        self.ended.append(span)
+
+
+class TracedPlugin(Plugin):
+    """Plugin whose calls are traced."""
+
+    name = "traced_plugin"
+    description = "A plugin with traced functions"
+
+    @agently_function
+    def outer(self, value: str) -> str:
+        """Call another plugin function."""
+        return self.inner(value).upper()
+
+    @agently_function
+    def inner(self, value: str) -> str:
+        """Return the value."""
+        return value
+
+    @agently_function
+    def fail(self) -> None:
+        """Always raise."""
+        raise KeyError("missing")
+
+    @agently_function
+    def in_thread(self) -> str:
+        """Call inner from another thread."""
+        results = []
+        thread = threading.Thread(target=propagate(lambda: results.append(self.inner("t"))))
+        thread.start()
+        thread.join()
+        return results[0]
+
+    @agently_function
+    def stream(self, value: str):
+        """Yield the result of inner."""
+        yield self.inner(value)
+
+    @agently_function
+    async def gather(self) -> list:
+        """Call async functions concurrently in tasks."""
+        return await asyncio.gather(self.fetch("a"), self.fetch("b"))
+
+    @agently_function
+    async def fetch(self, key: str) -> str:
+        """Fetch asynchronously."""
+        await asyncio.sleep(0)
+        return key
+
+
+@pytest.fixture
+def hook():
+    hook = RecordingHook()
+    add_trace_hook(hook, sample_rate=1.0)
+    try:
+        yield hook
+    finally:
+        remove_trace_hook(hook)
+        set_sample_rate(1.0)
+
+
+def test_spans_nest_and_carry_call_details(hook):
+    """Test that nested calls become child spans of the same trace."""
+    assert TracedPlugin().outer("x") == "X"
+
+    inner, outer = hook.ended
+    assert [span.name for span in hook.started] == ["traced_plugin.outer", "traced_plugin.inner"]
+    assert outer.parent_id is None
+    assert inner.parent_id == outer.span_id
+    assert inner.trace_id == outer.trace_id
+    assert outer.arguments == "('x')"
+    assert outer.duration >= inner.duration >= 0
+    assert outer.end_time >= outer.start_time
+    assert current_span() is None
+
+
+def test_span_records_exception(hook):
+    """Test that the exception raised by a call is recorded."""
+    with pytest.raises(KeyError):
+        TracedPlugin().fail()
+    assert isinstance(hook.ended[0].error, KeyError)
+
+
+def test_context_propagates_to_threads_and_tasks(hook):
+    """Test that parents are found across threads and asyncio tasks."""
+    plugin = TracedPlugin()
+    plugin.in_thread()
+    inner, outer = hook.ended
+    assert inner.parent_id == outer.span_id
+
+    hook.ended.clear()
+    assert asyncio.run(plugin.gather()) == ["a", "b"]
+    root = hook.ended[-1]
+    assert root.function == "gather"
+    assert [span.parent_id for span in hook.ended[:-1]] == [root.span_id, root.span_id]
+
+
+def test_sampling_skips_whole_traces(hook):
+    """Test that unsampled calls create no spans, nested calls included."""
+    set_sample_rate(0.0)
+    TracedPlugin().outer("x")
+    assert hook.started == []
+
+    with pytest.raises(ValueError):
+        set_sample_rate(2)
+    assert get_sample_rate() == 0.0
+
+
+def test_nested_calls_follow_the_root_sampling_decision(hook):
+    """Test that calls under an unsampled root are not sampled on their own."""
+    set_sample_rate(0.5)
+    # The first draw decides the root; later draws would sample the nested calls
+    draws = iter([0.9] + [0.0] * 10)
+    tracing._observer._random.random = lambda: next(draws)
+    plugin = TracedPlugin()
+    assert plugin.outer("x") == "X"
+    assert asyncio.run(plugin.gather()) == ["a", "b"]
+    assert [span.function for span in hook.started] == ["gather", "fetch", "fetch"]
+    assert current_span() is None
+
+
+def test_unsampled_calls_are_decided_before_the_call_is_described(hook, monkeypatch):
+    """Test that no CallInfo is made and no span is started for unsampled traces."""
+    set_sample_rate(0.0)
+
+    def no_call_info(*args):
+        raise AssertionError("CallInfo created for an unsampled call")
+
+    monkeypatch.setattr(instrumentation, "CallInfo", no_call_info)
+    plugin = TracedPlugin()
+    assert plugin.outer("x") == "X"
+    assert asyncio.run(plugin.gather()) == ["a", "b"]
+    assert hook.started == []
+    assert current_span() is None
+
+
+def test_generator_spans_are_not_made_current(hook):
+    """Test that calls made while a generator iterates stay in the caller's trace."""
+    assert list(TracedPlugin().stream("x")) == ["x"]
+    inner, stream = hook.ended
+    assert stream.function == "stream"
+    assert inner.parent_id is None
+    assert inner.trace_id != stream.trace_id
+
+
+def test_failing_hook_does_not_break_calls():
+    """Test that hook exceptions become warnings."""
+
+    class BrokenHook(TraceHook):
+        def on_end(self, span):
+            raise RuntimeError("broken")
+
+    broken = BrokenHook()
+    add_trace_hook(broken)
+    try:
+        with pytest.warns(RuntimeWarning, match="broken"):
+            assert TracedPlugin().inner("ok") == "ok"
+    finally:
+        remove_trace_hook(broken)
+
+
+def test_removing_last_hook_restores_functions(hook):
+    """Test that tracing off leaves plugin functions untouched."""
+    assert hasattr(TracedPlugin.__dict__["inner"], "_instrumented_original")
+    remove_trace_hook(hook)
+    assert not hasattr(TracedPlugin.__dict__["inner"], "_instrumented_original")
+
+
+def test_json_file_exporter_writes_otlp_spans(tmp_path):
+    """Test the OpenTelemetry JSON file exporter."""
+    path = tmp_path / "spans.jsonl"
+    exporter = JsonFileSpanExporter(str(path), service_name="tests")
+    add_trace_hook(exporter)
+    try:
+        TracedPlugin().outer("x")
+        with pytest.raises(KeyError):
+            TracedPlugin().fail()
+    finally:
+        remove_trace_hook(exporter)
+        exporter.close()
+
+    requests = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(requests) == 3
+    resource = requests[0]["resourceSpans"][0]
+    assert resource["resource"]["attributes"][0]["value"] == {"stringValue": "tests"}
+
+    inner, outer, failed = [r["resourceSpans"][0]["scopeSpans"][0]["spans"][0] for r in requests]
+    assert outer["name"] == "traced_plugin.outer"
+    assert len(outer["traceId"]) == 32 and len(outer["spanId"]) == 16
+    assert inner["parentSpanId"] == outer["spanId"]
+    assert "parentSpanId" not in outer
+    assert int(outer["endTimeUnixNano"]) >= int(outer["startTimeUnixNano"])
+    assert outer["status"] == {"code": 1}
+    assert failed["status"]["code"] == 2
+    assert failed["events"][0]["name"] == "exception"
+
+
+def test_summarize_arguments_truncates():
+    """Test the argument summary."""
+    assert summarize_arguments((1,), {"key": "v"}) == "(1, key='v')"
+    summary = summarize_arguments(("x" * 1000,), {}, max_length=20)
+    assert len(summary) == 20 and summary.endswith("...")
@@ -0,0 +1,157 @@
+"""
+Tests for compiled type checks of nested generic variable types.
+"""
+
+import collections
+import gc
+import weakref
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+
+import pytest
+
+from agently_sdk.plugins import PluginVariable
+from agently_sdk.plugins._typecheck import compile_type_check
+from agently_sdk.plugins.spec import type_name
+
+
+@pytest.mark.parametrize(
+    "hint, valid, invalid",
+    [
+        (List[Dict[str, int]], [[{"a": 1}], []], [[{"a": "1"}], [1], {"a": 1}]),
+        (Dict[str, List[int]], [{"a": [1, 2]}, {}], [{"a": [1, "2"]}, {1: [1]}]),
+        (Optional[int], [None, 3], ["3", 3.0]),
+        (Union[int, str, List[int]], [1, "a", [1]], [1.5, ["a"]]),
+        (int | None, [None, 1], ["1"]),
+        (Tuple[int, str], [(1, "a")], [(1, 2), (1,), [1, "a"]]),
+        (Tuple[int, ...], [(), (1, 2, 3)], [(1, "2"), [1]]),
+        (Tuple[()], [()], [(1,)]),
+        (Set[str], [{"a"}, set()], [{"a", 1}, ["a"]]),
+        (FrozenSet[int], [frozenset({1})], [{1}, frozenset({"a"})]),
+        (Literal["a", 1], ["a", 1], ["b", True, 1.0]),
+        (List[Literal["r", "w"]], [["r", "w"]], [["x"]]),
+        (Sequence[int], [[1], (1, 2)], [{1}, ["a"]]),
+        (Mapping[str, Any], [{"a": object()}, collections.OrderedDict()], [[("a", 1)], {1: 1}]),
+        (List[int], [[True, 1]], [[1.0]]),
+        (list[dict[str, int]], [[{"a": 1}]], [[{"a": None}]]),
+        (Type[Exception], [ValueError], [int, ValueError()]),
+    ],
+)
+def test_compiled_type_checks(hint, valid, invalid):
+    """Test nested generics and special forms against valid and invalid values."""
+    check = compile_type_check(hint)
+    for value in valid:
+        assert check(value), (hint, value)
+    for value in invalid:
+        assert not check(value), (hint, value)
+
+
+def test_unchecked_hints_accept_everything():
+    """Test that hints without runtime meaning compile to no check."""
+    assert compile_type_check(Any) is None
+    assert compile_type_check(List[Any])([1, "a", None])
+    assert compile_type_check(Optional[Any]) is None
+
+
+def test_verified_immutable_values_are_not_checked_again():
+    """Test that tuples and frozensets that passed are remembered."""
+    checked = []
+
+    class CountingMeta(type):
+        def __instancecheck__(cls, value):
+            checked.append(value)
+            return isinstance(value, int)
+
+    class Counted(metaclass=CountingMeta):
+        pass
+
+    check = compile_type_check(Tuple[Counted, ...])
+    value = (1, 2, 3)
+    assert check(value)
+    assert check(value)
+    assert checked == [1, 2, 3]
+
+    assert not check(value + ("x",))
+
+    # Mutable containers are checked every time
+    checked.clear()
+    list_check = compile_type_check(List[Counted])
+    items = [1, 2]
+    assert list_check(items)
+    assert list_check(items)
+    assert checked == [1, 2, 1, 2]
+
+
+def test_verified_values_are_released_with_their_checker():
+    """Test that remembered values are held per checker, not by the shared cache."""
+    value = frozenset({1, 2})
+    ref = weakref.ref(value)
+    check = compile_type_check(FrozenSet[int])
+    assert check(value)
+    assert compile_type_check(FrozenSet[int]) is not check
+
+    del value
+    assert ref() is not None
+    del check
+    gc.collect()
+    assert ref() is None
+
+
+def test_tuples_holding_mutable_values_are_checked_every_time():
+    """Test that tuples containing lists are not remembered."""
+    check = compile_type_check(Tuple[List[int], ...])
+    inner = [1]
+    value = (inner,)
+    assert check(value)
+    inner.append("x")
+    assert not check(value)
+
+
+def test_variables_validate_nested_generics():
+    """Test that PluginVariable accepts and rejects nested generic values."""
+    routes = PluginVariable(
+        name="routes", description="Routing table", type=List[Dict[str, int]], default=[]
+    )
+    assert routes.validate([{"a": 1}, {"b": 2}]) == (True, None)
+    is_valid, error = routes.validate([{"a": "x"}])
+    assert not is_valid
+    assert error == "Variable 'routes' must be of type List[Dict[str, int]], got list"
+
+    for hint in [Optional[int], Dict[str, List[int]], Literal["a", "b"], tuple[int, ...]]:
+        variable = PluginVariable(name="v", description="V", type=hint, default=None)
+        # Errors name the type the way schemas and signatures do
+        assert f"must be of type {type_name(hint)}, got" in variable.validate(object())[1]
+
+    limit = PluginVariable(name="limit", description="Limit", type=Optional[int], default=1)
+    assert limit.validate(None) == (True, None)
+    assert not limit.validate("1")[0]
+
+
+def test_compiled_checker_matches_reference_for_generics():
+    """Test that compiled checkers and the reference agree on generic types."""
+    hints = [
+        List[Dict[str, int]],
+        Optional[int],
+        Tuple[int, str],
+        Set[str],
+        Literal["a", "b"],
+        List[Any],
+        Dict[str, List[int]],
+    ]
+    values = [None, 1, "a", (1, "a"), {"a"}, [{"a": 1}], [1], {"a": [1]}, {"a": ["x"]}]
+    for hint in hints:
+        var = PluginVariable(name="v", description="d", type=hint, choices=None)
+        for value in values:
+            assert var.checker(value) == var._explain(value), (hint, value)
@@ -0,0 +1,138 @@
+"""
+Tests for atomic updates of plugin variables.
+"""
+
+import threading
+
+import pytest
+
+from agently_sdk.plugins import Plugin, PluginVariable
+
+validated = []
+
+
+def track(value):
+    validated.append(value)
+    return value > 0
+
+
+class ConfigPlugin(Plugin):
+    """Plugin with a few configuration variables."""
+
+    name = "config_plugin"
+    description = "Configurable plugin"
+
+    host = PluginVariable(description="Host", value_type=str, default="localhost")
+    port = PluginVariable(description="Port", value_type=int, default=80, validator=track)
+    retries = PluginVariable(description="Retries", value_type=int, default=3)
+
+
+class CompactConfigPlugin(ConfigPlugin, compact=True):
+    """Compact variant."""
+
+
+@pytest.mark.parametrize("cls", [ConfigPlugin, CompactConfigPlugin])
+def test_update_changes_and_validates_only_changed_values(cls):
+    """Test that update applies changed values and skips unchanged ones."""
+    plugin = cls(port=8080)
+    validated.clear()
+
+    changed = plugin.update(host="example.com", port=8080, retries=3)
+
+    assert changed == {"host": "example.com"}
+    assert validated == []
+    assert plugin.get_values() == {"host": "example.com", "port": 8080, "retries": 3}
+
+    assert plugin.update(port=9090) == {"port": 9090}
+    assert validated == [9090]
+    assert plugin.port == 9090
+
+
+@pytest.mark.parametrize("cls", [ConfigPlugin, CompactConfigPlugin])
+def test_invalid_update_changes_nothing(cls):
+    """Test that one invalid value rejects the whole update."""
+    plugin = cls()
+    with pytest.raises(ValueError):
+        plugin.update(host="example.com", port=-1)
+    with pytest.raises(ValueError, match="Unknown variable"):
+        plugin.update(host="example.com", missing=1)
+    assert plugin.get_values() == {"host": "localhost", "port": 80, "retries": 3}
+
+
+def test_listeners_are_notified_of_changes():
+    """Test that listeners on a class and its bases receive the changed values."""
+    calls = []
+
+    def on_base(plugin, changes):
+        calls.append(("base", plugin, changes))
+
+    def on_compact(plugin, changes):
+        calls.append(("compact", plugin, changes))
+
+    ConfigPlugin.add_update_listener(on_base)
+    CompactConfigPlugin.add_update_listener(on_compact)
+    try:
+        plugin = CompactConfigPlugin()
+        plugin.update(retries=5)
+        plugin.update(retries=5)
+        ConfigPlugin().update(host="a")
+    finally:
+        ConfigPlugin.remove_update_listener(on_base)
+        CompactConfigPlugin.remove_update_listener(on_compact)
+
+    assert calls[:2] == [("compact", plugin, {"retries": 5}), ("base", plugin, {"retries": 5})]
+    assert [(name, changes) for name, _, changes in calls[2:]] == [("base", {"host": "a"})]
+
+    ConfigPlugin().update(host="b")
+    assert len(calls) == 3
+
+
+def test_failing_listener_warns():
+    """Test that a failing listener does not undo the update."""
+
+    def broken(plugin, changes):
+        raise RuntimeError("listener bug")
+
+    ConfigPlugin.add_update_listener(broken)
+    try:
+        plugin = ConfigPlugin()
+        with pytest.warns(RuntimeWarning, match="listener bug"):
+            plugin.update(retries=1)
+    finally:
+        ConfigPlugin.remove_update_listener(broken)
+    assert plugin.retries == 1
+
+
+def test_update_publishes_a_new_snapshot():
+    """Test that update replaces the value snapshot instead of mutating it."""
+    plugin = ConfigPlugin(host="a")
+    snapshot = plugin._values
+    plugin.update(host="b", retries=7)
+    assert snapshot == {"host": "a"}
+    assert plugin.get_values()["host"] == "b"
+
+
+@pytest.mark.parametrize("cls", [ConfigPlugin, CompactConfigPlugin])
+def test_readers_never_see_a_partial_update(cls):
+    """Test that concurrent readers see complete configurations only."""
+    plugin = cls(host="h0", port=1, retries=1)
+    stop = threading.Event()
+    torn = []
+
+    def read():
+        while not stop.is_set():
+            values = plugin.get_values()
+            if values["host"] != f"h{values['port'] - 1}" or values["port"] != values["retries"]:
+                torn.append(values)
+
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    for thread in readers:
+        thread.start()
+    for i in range(2000):
+        n = i % 5
+        plugin.update(host=f"h{n}", port=n + 1, retries=n + 1)
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    assert torn == []
@@ -58,3 +58,14 @@ def test_validate_plugin():
     assert any("missing a name" in issue for issue in issues)
     assert any("mismatched name" in issue for issue in issues)
     assert any("no kernel functions" in issue for issue in issues)
+
+
+def test_get_plugin_info_includes_function_specs():
+    """Test that get_plugin_info exposes function specs."""
+    info = get_plugin_info(ValidPlugin)
+
+    spec = info["function_specs"]["test_function"]
+    assert spec["name"] == "test_function"
+    assert spec["description"] == "A test function."
+    assert spec["parameters"] == []
+    assert spec["returns"] == "str"
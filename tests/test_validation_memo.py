@@ -0,0 +1,152 @@
+"""
+Tests for memoized validation of repeated values.
+"""
+
+import enum
+
+import pytest
+
+from agently_sdk.plugins import Plugin, PluginVariable, VariableValidation
+
+
+class Color(enum.Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+def _variable(**kwargs):
+    kwargs.setdefault("memo_size", 8)
+    return PluginVariable(name="v", description="d", **kwargs)
+
+
+def test_valid_values_are_remembered():
+    """Test that a repeated valid value is answered from the memo."""
+    var = _variable(value_type=str, validation=VariableValidation(pattern=r"^https://"))
+    for _ in range(3):
+        assert var.validate("https://api.example.com") == (True, None)
+
+    stats = var.memo_stats()
+    assert (stats.hits, stats.misses, stats.size) == (2, 1, 1)
+    assert stats.hit_rate == pytest.approx(2 / 3)
+
+
+def test_invalid_values_are_not_remembered():
+    """Test that invalid values are checked every time and keep their error."""
+    var = _variable(value_type=int, validation=VariableValidation(range=(0, 10)))
+    for _ in range(2):
+        assert var.validate(11) == (False, "Variable 'v' failed validation: Value must be <= 10")
+
+    stats = var.memo_stats()
+    assert (stats.hits, stats.misses, stats.size, stats.evictions) == (0, 2, 0, 0)
+
+
+def test_equal_values_of_other_types_are_checked():
+    """Test that 1.0 does not pass as the remembered 1."""
+    var = _variable(value_type=int)
+    assert var.validate(1) == (True, None)
+    assert var.validate(1.0)[0] is False
+    assert var.validate(True) == (True, None)
+    assert var.memo_stats().hits == 0
+
+
+def test_enum_members_are_remembered():
+    """Test that enum members are memoized like scalar values."""
+    var = _variable(value_type=Color)
+    var.validate(Color.RED)
+    var.validate(Color.RED)
+    assert var.memo_stats().hits == 1
+    assert var.validate("red")[0] is False
+
+
+def test_other_values_bypass_the_memo():
+    """Test that containers are always checked and do not count as lookups."""
+    var = _variable(value_type=list)
+    assert var.validate([1]) == (True, None)
+    assert var.validate([1]) == (True, None)
+    assert var.memo_stats().misses == 0
+
+
+def test_memo_is_bounded():
+    """Test that the least recently used values are evicted."""
+    var = _variable(value_type=str, memo_size=2)
+    for value in ["a", "b", "a", "c", "a", "b"]:
+        var.validate(value)
+
+    stats = var.memo_stats()
+    assert (stats.hits, stats.misses, stats.size, stats.evictions) == (2, 4, 2, 2)
+
+
+def test_custom_validators_opt_in():
+    """Test that the memo skips custom validators only when asked to."""
+    calls = []
+
+    def validator(value):
+        calls.append(value)
+        return value.startswith("x")
+
+    var = _variable(validator=validator)
+    var.validate("xa")
+    var.validate("xa")
+    assert len(calls) == 2
+    assert var.memo_stats() is None
+
+    var = _variable(validator=validator, memoize_validator=True)
+    calls.clear()
+    var.validate("xa")
+    var.validate("xa")
+    assert len(calls) == 1
+    assert var.memo_stats().hits == 1
+
+
+def test_memo_starts_over_when_constraints_change():
+    """Test that reassigning a constraint forgets the remembered values."""
+    var = _variable(value_type=str, validation=VariableValidation(options=["a", "b"]))
+    assert var.validate("b") == (True, None)
+    var.validation = VariableValidation(options=["a"])
+    assert var.validate("b")[0] is False
+    assert var.memo_stats().size == 0
+
+
+def test_clear_memo():
+    """Test that clear_memo() forgets values after rules change in place."""
+    validation = VariableValidation(pattern=r"^a")
+    var = _variable(value_type=str, validation=validation)
+    assert var.validate("ab") == (True, None)
+
+    validation.pattern = r"^b"
+    assert var.validate("ab") == (True, None)
+    var.clear_memo()
+    assert var.validate("ab")[0] is False
+    assert var.memo_stats().hits == 0
+
+
+def test_plugin_init_uses_the_memo():
+    """Test that plugin construction and assignment go through the memo."""
+
+    class EndpointPlugin(Plugin):
+        name = "endpoint_plugin"
+        description = "Memoized endpoint"
+
+        endpoint = PluginVariable(
+            description="Service URL",
+            default="https://api.example.com",
+            validation=VariableValidation(pattern=r"^https://"),
+            memo_size=16,
+        )
+
+    for _ in range(5):
+        EndpointPlugin(endpoint="https://tenant.example.com")
+    plugin = EndpointPlugin()
+    plugin.endpoint = "https://tenant.example.com"
+    with pytest.raises(ValueError):
+        plugin.endpoint = "http://insecure.example.com"
+
+    # The default was remembered when the variable was created
+    stats = EndpointPlugin.endpoint.memo_stats()
+    assert (stats.hits, stats.misses, stats.size) == (5, 3, 2)
+
+
+def test_memo_size_must_be_positive():
+    """Test that an empty memo is rejected."""
+    with pytest.raises(ValueError, match="memo_size"):
+        _variable(memo_size=0)
@@ -2,6 +2,7 @@
 Tests for the VariableValidation class.
 """
 
+import pickle
 import re
 
 from agently_sdk.plugins.variables import PluginVariable, VariableValidation
@@ -192,3 +193,72 @@ def test_to_dict_with_validation():
     assert "validation" in result
     assert "range" in result["validation"]
     assert result["validation"]["range"] == (1, 10)
+
+
+def test_large_option_sets():
+    """Test indexed options, including unhashable ones."""
+    options = [f"model-{i}" for i in range(5000)] + [["nested"], {"a": 1}]
+    validation = VariableValidation(options=options)
+
+    assert validation.validate("model-4999") == (True, None)
+    assert validation.validate(["nested"]) == (True, None)
+    assert validation.validate({"a": 1}) == (True, None)
+    assert validation.validate("model-5000")[0] is False
+    assert validation.validate(["other"])[0] is False
+    # Equality semantics match a list scan
+    assert VariableValidation(options=[1, 2]).validate(1.0) == (True, None)
+
+
+def test_rules_recompile_when_changed():
+    """Test that reassigned rules and recompiled options take effect."""
+    validation = VariableValidation(options=["a"])
+    assert validation.validate("b")[0] is False
+
+    # The rule keeps checking the options it was compiled with
+    validation.options.append("b")
+    assert validation.validate("b")[0] is False
+    validation.recompile()
+    assert validation.validate("b") == (True, None)
+
+    validation.options = ["c"]
+    assert validation.validate("b")[0] is False
+
+    validation.options[0] = "d"
+    assert validation.validate("c") == (True, None)
+    validation.recompile()
+    assert validation.validate("d") == (True, None)
+    assert validation.validate("c") == (False, "Value must be one of: ['d']")
+
+    validation.range = (0, 5)
+    validation.options = None
+    assert validation.validate(6) == (False, "Value must be <= 5")
+
+
+def test_pattern_compiled_once(monkeypatch):
+    """Test that a string pattern is compiled once, not on every validation."""
+    compiled = []
+    original = re.compile
+
+    def counting_compile(*args, **kwargs):
+        compiled.append(args[0])
+        return original(*args, **kwargs)
+
+    validation = VariableValidation(pattern=r"^[a-z]+$")
+    monkeypatch.setattr(re, "compile", counting_compile)
+    for _ in range(10):
+        assert validation.validate("abc") == (True, None)
+    assert validation.validate("ABC") == (False, "Value must match pattern: ^[a-z]+$")
+    assert compiled == [r"^[a-z]+$"]
+
+
+def test_compiled_rules_are_not_pickled():
+    """Test that validations pickle and compare by their rules only."""
+    validation = VariableValidation(options=["a"], range=None, pattern=r"^a$")
+    validation.validate("a")
+    restored = pickle.loads(pickle.dumps(validation))
+    assert restored == validation
+    assert restored.validate("b")[0] is False
+    assert repr(restored) == (
+        "VariableValidation(options=['a'], range=None, pattern='^a$', error_message=None, "
+        "pattern_mode=None, max_length=None)"
+    )
@@ -2,6 +2,8 @@
 Tests for the PluginVariable class.
 """
 
+from typing import Dict, List
+
 import pytest
 
 from agently_sdk.plugins.variables import PluginVariable
@@ -198,3 +200,58 @@ def test_plugin_variable_with_type():
     is_valid, error = var.validate("not an int")  # Should fail
     assert not is_valid
     assert "must be of type" in error
+
+
+def test_compiled_checker_matches_reference():
+    """Test that the compiled checker agrees with the ordered reference validation."""
+    variables = [
+        PluginVariable(name="plain", description="No constraints", default="x"),
+        PluginVariable(name="required", description="Required string", type=str),
+        PluginVariable(name="items", description="List of ints", type=List[int], default=[1]),
+        PluginVariable(name="mapping", description="Dict", type=Dict[str, int], default={"a": 1}),
+        PluginVariable(
+            name="color",
+            description="Color choice",
+            type=str,
+            choices=["red", "green"],
+            default="red",
+        ),
+        PluginVariable(
+            name="even",
+            description="Even number",
+            type=int,
+            validator=lambda x: x % 2 == 0,
+            default=2,
+        ),
+    ]
+    values = [None, "red", "blue", 3, 4, [1, 2], [1, "a"], {"a": 1}, {"a": "b"}, {1: 1}]
+
+    for var in variables:
+        for value in values:
+            assert var.checker(value) == var._explain(value), (var.name, value)
+
+
+def test_compiled_checker_recompiles_on_constraint_change():
+    """Test that reassigning a constraint regenerates the checker."""
+    var = PluginVariable(name="count", description="A count", type=int, default=1)
+    assert var.validate(5) == (True, None)
+
+    var.validator = lambda x: x < 3
+    is_valid, error = var.validate(5)
+    assert not is_valid
+    assert "failed custom validation" in error
+
+
+def test_custom_validator_called_once():
+    """Test that the custom validator runs once per validation, after the other checks."""
+    calls = []
+
+    def validator(value):
+        calls.append(value)
+        return value > 0
+
+    var = PluginVariable(name="positive", description="Positive", type=int, validator=validator)
+    assert var.validate(1) == (True, None)
+    assert var.validate(-1)[0] is False
+    assert var.validate("a")[0] is False
+    assert calls == [1, -1]